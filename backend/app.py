@@ -10,10 +10,26 @@ from routes.books import books_bp
 from routes.music import music_bp
 from services.config import Config
 from services.database import connect_db
+from services import (
+    cache,
+    counters,
+    feed,
+    indexes,
+    media_logs,
+    migrations,
+    prompt_cache,
+    resolution_index,
+    review_summaries,
+    trending,
+    user_stats,
+)
 from routes.lists import lists_bp
 from routes.discover import discover_bp
 from routes.reviews import reviews_bp
 from routes.collage import collage_bp
+from routes.admin import admin_bp
+from routes.health import health_bp
+from routes.feed import feed_bp
 
 app = Flask(__name__)
 # ✅ Load configuration from config.py
@@ -35,16 +51,44 @@ if db is not None:
         "data": db.get_collection("data"),
         "users": db.get_collection("users"),
         "reviews": db.get_collection("reviews"),
+        "comments": db.get_collection("comments"),
         "movieLogs": db.get_collection("movieLogs"),
         "bookLogs": db["bookLogs"],
         "musicLogs": db.get_collection("musicLogs"),
         "tvLogs": db.get_collection("tvLogs"),
+        "logEntries": db.get_collection("logEntries"),
+        "userStats": db.get_collection("userStats"),
+        "reviewSummaries": db.get_collection("reviewSummaries"),
+        "activities": db.get_collection("activities"),
+        "timelines": db.get_collection("timelines"),
         "lists": db.get_collection("lists"),
-        "collages": db.get_collection("collages") 
+        "collages": db.get_collection("collages"),
+        "responseCache": db.get_collection("responseCache"),
+        "resolutionIndex": db.get_collection("resolutionIndex"),
+        "promptCache": db.get_collection("promptCache"),
     }
 else:
     app.config["collections"] = {}
 
+# ✅ Make sure every collection has the indexes its queries rely on
+indexes.provision(app)
+
+# ✅ Bring data written before the current layout up to date (log entries
+# still in the per-user log documents, reviews without reaction counters or
+# with numeric media ids)
+if app.config["collections"]:
+    migrations.run_startup(app.config["collections"])
+
+# ✅ Configure the upstream response cache
+cache.init_app(app)
+resolution_index.init_app(app)
+prompt_cache.init_app(app)
+media_logs.init_app(app)
+user_stats.init_app(app)
+counters.init_app(app)
+review_summaries.init_app(app)
+feed.init_app(app)
+
 
 # ✅ Register Blueprints
 app.register_blueprint(data_bp)
@@ -59,6 +103,13 @@ app.register_blueprint(lists_bp)
 app.register_blueprint(reviews_bp)
 app.register_blueprint(discover_bp)
 app.register_blueprint(collage_bp)
+app.register_blueprint(admin_bp)
+app.register_blueprint(health_bp)
+app.register_blueprint(feed_bp)
+
+# ✅ Keep trending lists warm in the background
+trending.start()
+counters.start()
 
 @app.route("/api/test")
 def test():
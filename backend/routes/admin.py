@@ -0,0 +1,50 @@
+from flask import Blueprint, current_app, jsonify, request
+from services import counters, migrations
+from services.config import Config
+
+admin_bp = Blueprint("admin", __name__)
+
+
+def is_admin(data):
+    # Simple security check - in production use proper admin authentication
+    return bool(Config.ADMIN_KEY) and data.get("admin_key") == Config.ADMIN_KEY
+
+
+@admin_bp.route("/api/admin/migrate/<name>", methods=["POST"])
+def run_migration(name):
+    """Admin endpoint to run a registered data migration"""
+    data = request.get_json(silent=True) or {}
+    if not is_admin(data):
+        return jsonify({"error": "Unauthorized"}), 401
+
+    if name not in migrations.MIGRATIONS:
+        return jsonify({"error": f"Unknown migration '{name}'"}), 404
+
+    collections = current_app.config["collections"]
+    if not collections:
+        return jsonify({"error": "Database not connected"}), 500
+
+    try:
+        report = migrations.run(name, collections)
+        return jsonify({"message": "Migration complete", "report": report}), 200
+    except Exception as e:
+        print(f"❌ Error running migration {name}: {e}\n")
+        return jsonify({"error": str(e)}), 500
+
+
+@admin_bp.route("/api/admin/reconcile-counters", methods=["POST"])
+def reconcile_counters():
+    """Admin endpoint to recount users' lists/reviews/media totals"""
+    data = request.get_json(silent=True) or {}
+    if not is_admin(data):
+        return jsonify({"error": "Unauthorized"}), 401
+
+    if not current_app.config["collections"]:
+        return jsonify({"error": "Database not connected"}), 500
+
+    try:
+        report = counters.reconcile(data.get("username"))
+        return jsonify({"message": "Counters reconciled", "report": report}), 200
+    except Exception as e:
+        print(f"❌ Error reconciling counters: {e}\n")
+        return jsonify({"error": str(e)}), 500
@@ -1,8 +1,8 @@
 from flask import Blueprint, current_app, jsonify, request
 from flask_cors import cross_origin
-from bson.objectid import ObjectId
-from schemas.book_logs_schema import BookLogsSchema  # Import the new schema
 import requests
+from services import media_logs, trending, upstream
+from services.cache import MemoryCache, cached
 from datetime import datetime
 from controllers.updateUserStat import update_user_section
 
@@ -101,7 +101,6 @@ genres_and_subjects = [
 ]
 
 
-book_logs_schema = BookLogsSchema()  # Initialize schema
 
 books_bp = Blueprint("books", __name__)
 
@@ -109,6 +108,10 @@ OPEN_LIBRARY_SEARCH_URL = "https://openlibrary.org/search.json"
 OPEN_LIBRARY_DETAILS_URL = "https://openlibrary.org/works"
 TRENDING_BOOKS_URL = "https://openlibrary.org/trending/weekly.json"
 
+# Author names by Open Library author key ("/authors/OL...A"), shared across requests
+author_names_cache = MemoryCache(max_entries=10000)
+AUTHOR_NAME_TTL = 7 * 24 * 60 * 60
+
 
 @books_bp.route("/api/book/search", methods=["GET"])
 def search_books():
@@ -127,7 +130,7 @@ def search_books():
 
     try:
         # Perform the search request to Open Library
-        response = requests.get(
+        response = upstream.get(
             OPEN_LIBRARY_SEARCH_URL, params={"q": full_query, "limit": 10}
         )
         response.raise_for_status()  # Raise error for bad responses
@@ -166,72 +169,90 @@ def search_books():
         return jsonify({"error": str(e)}), 500
 
 
-def search_book(title):
-    if not title:
-        return jsonify({"error": 'Query parameter "title" is required'}), 400
+def lookup_book(title):
+    """
+    Search Open Library for the best match for a title.
 
-    # Construct the full query to include subjects if they are provided
-    full_query = title
+    Returns:
+        list: Zero or one book summaries.
 
-    try:
-        # Perform the search request to Open Library
-        response = requests.get(
-            OPEN_LIBRARY_SEARCH_URL, params={"q": full_query, "limit": 1}
+    Raises:
+        requests.RequestException: If the Open Library request fails.
+    """
+    # Perform the search request to Open Library
+    response = upstream.get(
+        OPEN_LIBRARY_SEARCH_URL, params={"q": title, "limit": 1}
+    )
+    response.raise_for_status()  # Raise error for bad responses
+    data = response.json()
+
+    books = []
+    for book in data.get("docs", []):
+        # Add book data to the list
+        books.append(
+            {
+                "id": book.get("key", "").replace(
+                    "/works/", ""
+                ),  # Extracting book ID
+                "title": book.get("title", "Unknown Title"),
+                "author": book.get("author_name", ["Unknown Author"])[
+                    0
+                ],  # Take first author
+                "cover_url": f"https://covers.openlibrary.org/b/id/{book.get('cover_i', '10909258')}-M.jpg",  # Default cover if missing
+            }
         )
-        response.raise_for_status()  # Raise error for bad responses
-        data = response.json()
+    return books
 
-        books = []
-        for book in data.get("docs", []):
-            # Add book data to the list
-            books.append(
-                {
-                    "id": book.get("key", "").replace(
-                        "/works/", ""
-                    ),  # Extracting book ID
-                    "title": book.get("title", "Unknown Title"),
-                    "author": book.get("author_name", ["Unknown Author"])[
-                        0
-                    ],  # Take first author
-                    "cover_url": f"https://covers.openlibrary.org/b/id/{book.get('cover_i', '10909258')}-M.jpg",  # Default cover if missing
-                }
-            )
 
-        return jsonify({"books": books})
+def search_book(title):
+    if not title:
+        return jsonify({"error": 'Query parameter "title" is required'}), 400
+
+    try:
+        return jsonify({"books": lookup_book(title)})
 
     except requests.exceptions.RequestException as e:
         return jsonify({"error": str(e)}), 500
 
 
+def resolve_author_names(author_keys):
+    """Resolve Open Library author keys to names, fetching unknown keys concurrently"""
+    names = {key: author_names_cache.get(key) for key in author_keys}
+    missing = [key for key, name in names.items() if name is None]
+
+    responses = upstream.gather(
+        [lambda key=key: upstream.get(f"https://openlibrary.org{key}.json") for key in missing]
+    )
+    for key, response in zip(missing, responses):
+        if isinstance(response, Exception) or response.status_code != 200:
+            continue
+        names[key] = response.json().get("name", "Unknown Author")
+        author_names_cache.set(key, names[key], AUTHOR_NAME_TTL)
+
+    return [names[key] for key in author_keys if names[key] is not None]
+
+
 @books_bp.route("/api/book/<book_id>", methods=["GET"])
+@cached("book_details", ttl=7 * 24 * 60 * 60)
 def get_book_details(book_id):
     OPEN_LIBRARY_DETAILS_URL = f"https://openlibrary.org/works/{book_id}.json"
 
     try:
-        response = requests.get(OPEN_LIBRARY_DETAILS_URL)
+        response = upstream.get(OPEN_LIBRARY_DETAILS_URL)
         response.raise_for_status()
         data = response.json()
 
         # Extract author details
-        author_names = []
-        if "authors" in data:
-            for author in data["authors"]:
-                author_key = author.get("author", {}).get("key")
-                if author_key:
-                    author_response = requests.get(
-                        f"https://openlibrary.org{author_key}.json"
-                    )
-                    if author_response.status_code == 200:
-                        author_data = author_response.json()
-                        author_names.append(author_data.get("name", "Unknown Author"))
-
-        # Fetch Edition Data (to get publish date & language)
-        edition_response = requests.get(
-            f"https://openlibrary.org{data.get('key')}.json"
-        )
-        edition_data = (
-            edition_response.json() if edition_response.status_code == 200 else {}
-        )
+        author_keys = [
+            author.get("author", {}).get("key")
+            for author in data.get("authors", [])
+            if author.get("author", {}).get("key")
+        ]
+        author_names = resolve_author_names(author_keys)
+
+        # The "edition" used for publish date & language is the work record
+        # itself (same URL), so reuse it instead of fetching it again
+        edition_data = data
 
         # Extract first 3 genres
         subjects = data.get("subjects", [])
@@ -299,7 +320,7 @@ def get_recommendations(book_id):
         # response = requests.get(
         #     OPEN_LIBRARY_SEARCH_URL, params={"q": query, "limit": 10}
         # )
-        response = requests.get("https://openlibrary.org/search.json", params=params)
+        response = upstream.get("https://openlibrary.org/search.json", params=params)
         response.raise_for_status()
         data = response.json()
         # print(data)
@@ -335,7 +356,7 @@ def book_suggestions():
     OPEN_LIBRARY_SEARCH_URL = "https://openlibrary.org/search.json"
 
     try:
-        response = requests.get(
+        response = upstream.get(
             OPEN_LIBRARY_SEARCH_URL, params={"q": query, "limit": 5}
         )  # Get top 5 suggestions
         response.raise_for_status()
@@ -376,46 +397,21 @@ def handle_read_later(book_id):
     if users_col is None:
         return jsonify({"error": "Database not connected"}), 500
 
-    user = users_col.find_one({"username": username})
+    user = users_col.find_one({"username": username}, {"_id": 1})
     if user is None:
         return jsonify({"error": "User not logged in!"}), 500
 
-    book_logs_col = current_app.config["collections"].get("bookLogs")
-    user_book_log = book_logs_col.find_one({"username": username})
-
-    # If the user doesn't have a book log, create one
-    if user_book_log is None:
-        info = {
-            "username": username,
-            "bookLog": [],
-            "readLater": [],
-        }
-        insert = book_logs_schema.load(info)
-        book_logs_col.insert_one(insert)
-        user_book_log = book_logs_col.find_one({"username": username})
-
     # Check if the book already exists in `readLater`
-    for book in user_book_log.get("readLater", []):
-        if book["bookId"] == book_id:
-            return jsonify({"error": "Book is already in Read Later list."}), 400
+    if media_logs.has_entry(username, "book", "readLater", book_id):
+        return jsonify({"error": "Book is already in Read Later list."}), 400
 
-    # If not, add the book to Read Later
     new_entry = {
-        "_id": str(ObjectId()),  # Convert ObjectId to string
         "bookId": book_id,
         "title": title,
         "cover": cover,
     }
 
-    result = book_logs_col.update_one(
-        {"username": username},  # Find the document by username
-        {"$push": {"readLater": new_entry}},  # Append to readLater list
-    )
-
-    if result.matched_count > 0:
-        return jsonify(new_entry), 200
-    else:
-        return jsonify({"error": "User not found or could not be updated."}), 400
+    return jsonify(media_logs.add_entry(username, "book", "readLater", new_entry)), 200
 
 
 @books_bp.route("/api/book/read_later", methods=["GET"])
@@ -423,46 +419,19 @@ def handle_read_later(book_id):
 def get_read_later():
     username = request.args.get("username")
 
-    # Ensure collections exist
-    collections = current_app.config.get("collections", {})
-    users_col = collections.get("users")
-    book_logs_col = collections.get("bookLogs")
-
-    if users_col is None or book_logs_col is None:
+    users_col = current_app.config["collections"].get("users")
+    if users_col is None:
         return jsonify({"error": "Database not connected"}), 500
 
-    user = users_col.find_one({"username": username})
+    user = users_col.find_one({"username": username}, {"_id": 1})
     if user is None:
         return jsonify({"error": "User not logged in!"}), 500
 
-    user_book_log_item = book_logs_col.find_one({"username": username})
+    return media_logs.section_response(username, "book", "readLater", request.args)
 
-    # If no book log found, initialize a new one
-    if user_book_log_item is None:
-        info = {
-            "username": username,
-            "bookLog": [],
-            "readLater": [],
-        }
-        book_logs_col.insert_one(info)
-        return jsonify([])  # Return empty list since no books exist yet
-
-    # Ensure "readLater" key exists
-    read_later_log = user_book_log_item.get("readLater", [])
-    if read_later_log is None:
-        read_later_log = []
-
-    # Convert ObjectId fields to string
-    for entry in read_later_log:
-        if "_id" in entry:
-            entry["_id"] = str(entry["_id"])
 
-    return jsonify(read_later_log)
-
-
-@books_bp.route("/api/book/remove_read_later", methods=["POST"])
-def remove_book():
-    data = request.get_json()
+def remove_book_entry(data):
+    """Remove one entry from a user's book log or read-later list"""
     username = data.get("username")
     entry = data.get("entry")  # This is the _id of the book to remove
     section = data.get("section")
@@ -471,35 +440,26 @@ def remove_book():
     if users_col is None:
         return jsonify({"error": "Database not connected"}), 500
 
-    user = users_col.find_one({"username": username})
+    user = users_col.find_one({"username": username}, {"_id": 1})
     if user is None:
         return jsonify({"error": "User not logged in!"}), 500
 
-    book_logs_col = current_app.config["collections"].get("bookLogs")
-    user_book_log_item = book_logs_col.find_one({"username": username})
+    if not media_logs.is_valid_section("book", section):
+        return jsonify({"error": f"Unknown section '{section}'"}), 400
 
-    if user_book_log_item is None:
-        return jsonify({"error": "User book log not found!"}), 404
-
-    print(
-        f"Attempting to remove from section: {section}, entry: {entry}, for user: {username}"
-    )
-    print(f"User book log found: {user_book_log_item}")
-
-    # ✅ Convert `entry` to a string before removing
-    result = book_logs_col.update_one(
-        {"username": username},
-        {
-            "$pull": {section: {"_id": str(entry)}}
-        },  # Ensure `_id` is treated as a string
-    )
-
-    if result.modified_count == 0:
+    if not media_logs.remove_entry(username, "book", section, entry):
         return jsonify({"error": "Book not found in log or removal failed"}), 404
 
+    if media_logs.is_log_section("book", section):
+        update_user_section(username, "decrement", "media")
     return jsonify({"success": True, "message": f"Book removed from {section}."}), 200
 
 
+@books_bp.route("/api/book/remove_read_later", methods=["POST"])
+def remove_book():
+    return remove_book_entry(request.get_json())
+
+
 @books_bp.route("/api/book/log/<book_id>", methods=["POST"])
 def handle_log_book(book_id):
     data = request.get_json()
@@ -514,24 +474,10 @@ def handle_log_book(book_id):
     if users_col is None:
         return jsonify({"error": "Database not connected"}), 500
 
-    user = users_col.find_one({"username": username})
+    user = users_col.find_one({"username": username}, {"achievements": 1})
     if user is None:
         return jsonify({"error": "User not logged in!"}), 500
 
-    book_logs_col = current_app.config["collections"].get("bookLogs")
-    user_book_log = book_logs_col.find_one({"username": username})
-
-    # If the user doesn't have a book log, create one
-    if user_book_log is None:
-        info = {
-            "username": username,
-            "bookLog": [],
-            "readLater": [],
-        }
-        insert = book_logs_schema.load(info)
-        book_logs_col.insert_one(insert)
-        user_book_log = book_logs_col.find_one({"username": username})
-
     # Validate date format
     if read_date:
         try:
@@ -540,65 +486,55 @@ def handle_log_book(book_id):
             return jsonify({"error": "Invalid date format. Use YYYY-MM-DD."}), 400
 
     # Reject duplicates
-    for book in user_book_log.get("bookLog", []):
-        if book["bookId"] == book_id:
-            return jsonify({"error": "Book is already in Book Log list."}), 400
+    if media_logs.has_entry(username, "book", "bookLog", book_id):
+        return jsonify({"error": "Book is already in Book Log list."}), 400
 
     new_entry = {
-        "_id": str(ObjectId()),
         "bookId": book_id,
         "title": title,
         "cover": cover,
         "readDate": read_date,
         "rating": rating,
         "author": author,
+        "genres": media_logs.parse_list(data.get("genres")),
     }
 
-    result = book_logs_col.update_one(
-        {"username": username},
-        {"$push": {"bookLog": new_entry}},
-    )
-
-    if result.matched_count > 0:
-        # Re-fetch updated book log
-        updated_log = book_logs_col.find_one({"username": username})
-        total_books = len(updated_log.get("bookLog", []))
+    new_entry = media_logs.add_entry(username, "book", "bookLog", new_entry)
+    total_books = media_logs.count_entries(username, "book", "bookLog")
 
-        # Get the user's current achievements
-        achievements = user.get("achievements", [])
-        achievement_unlocked = False
+    # Get the user's current achievements
+    achievements = user.get("achievements", [])
+    achievement_unlocked = False
 
-        # Unlock at 5, 6, 7, and 8 books
-        if total_books == 5 and "5_books" not in achievements:
-            users_col.update_one(
-                {"username": username}, {"$push": {"achievements": "5_books"}}
-            )
-            achievement_unlocked = "5_books"
-        elif total_books == 6 and "6_books" not in achievements:
-            users_col.update_one(
-                {"username": username}, {"$push": {"achievements": "6_books"}}
-            )
-            achievement_unlocked = "6_books"
-        elif total_books == 7 and "7_books" not in achievements:
-            users_col.update_one(
-                {"username": username}, {"$push": {"achievements": "7_books"}}
-            )
-            achievement_unlocked = "7_books"
-        elif total_books == 8 and "8_books" not in achievements:
-            users_col.update_one(
-                {"username": username}, {"$push": {"achievements": "8_books"}}
-            )
-            achievement_unlocked = "8_books"
+    # Unlock at 5, 6, 7, and 8 books
+    if total_books == 5 and "5_books" not in achievements:
+        users_col.update_one(
+            {"username": username}, {"$push": {"achievements": "5_books"}}
+        )
+        achievement_unlocked = "5_books"
+    elif total_books == 6 and "6_books" not in achievements:
+        users_col.update_one(
+            {"username": username}, {"$push": {"achievements": "6_books"}}
+        )
+        achievement_unlocked = "6_books"
+    elif total_books == 7 and "7_books" not in achievements:
+        users_col.update_one(
+            {"username": username}, {"$push": {"achievements": "7_books"}}
+        )
+        achievement_unlocked = "7_books"
+    elif total_books == 8 and "8_books" not in achievements:
+        users_col.update_one(
+            {"username": username}, {"$push": {"achievements": "8_books"}}
+        )
+        achievement_unlocked = "8_books"
 
-        update_user_section(username, "increment", "media")
-        return jsonify(
-            {"book": new_entry, "achievementUnlocked": achievement_unlocked}
-        ), 200
-    else:
-        return jsonify({"error": "User not found or could not be updated."}), 400
+    update_user_section(username, "increment", "media")
+    return jsonify(
+        {"book": new_entry, "achievementUnlocked": achievement_unlocked}
+    ), 200
 
 
-# Route to get all logged books
+# Route to get logged books
 @books_bp.route("/api/book/log", methods=["GET"])
 def get_logged_books():
     username = request.args.get("username")  # Get username from query parameters
@@ -606,95 +542,52 @@ def get_logged_books():
     if users_col is None:
         return jsonify({"error": "Database not connected"}), 500
 
-    user = users_col.find_one({"username": username})
+    user = users_col.find_one({"username": username}, {"_id": 1})
     if user is None:
         return jsonify({"error": "User not logged in!"}), 500
 
-    book_logs_col = current_app.config["collections"].get("bookLogs")
-    user_book_log_item = book_logs_col.find_one({"username": username})
-
-    if user_book_log_item is None:
-        info = {
-            "username": username,
-            "bookLog": [],
-            "readLater": [],
-        }
-        insert = book_logs_schema.load(info)
-        book_logs_col.insert_one(insert)
-
-    book_log = user_book_log_item["bookLog"]
-    for entry in book_log:
-        entry["_id"] = str(entry["_id"])  # Serialize ObjectId to string
-
-    return jsonify(book_log)
+    return media_logs.section_response(username, "book", "bookLog", request.args)
 
 
 @books_bp.route("/api/book/remove_log", methods=["POST"])
 def remove_book_log():
-    data = request.get_json()
-    username = data.get("username")
-    entry = data.get("entry")  # This is the _id of the book to remove
-    section = data.get("section")
-
-    users_col = current_app.config["collections"].get("users")
-    if users_col is None:
-        return jsonify({"error": "Database not connected"}), 500
-
-    user = users_col.find_one({"username": username})
-    if user is None:
-        return jsonify({"error": "User not logged in!"}), 500
-
-    book_logs_col = current_app.config["collections"].get("bookLogs")
-    user_book_log_item = book_logs_col.find_one({"username": username})
+    return remove_book_entry(request.get_json())
 
-    if user_book_log_item is None:
-        return jsonify({"error": "User book log not found!"}), 404
 
-    print(
-        f"Attempting to remove from section: {section}, entry: {entry}, for user: {username}"
-    )
-    print(f"User book log found: {user_book_log_item}")
-
-    # ✅ Convert `entry` to a string before removing
-    result = book_logs_col.update_one(
-        {"username": username},
-        {
-            "$pull": {section: {"_id": str(entry)}}
-        },  # Ensure `_id` is treated as a string
+def fetch_trending_books():
+    """Fetch this week's trending books from Open Library"""
+    book = []
+    response = upstream.get(
+        TRENDING_BOOKS_URL, params={"sort": "readinglog", "limit": 20}
     )
+    response.raise_for_status()
+    data = response.json()
+
+    for item in data.get("works", []):
+        book.append(
+            {
+                "title": item.get("title", "Unknown Title"),
+                "id": item.get("key", "").replace(
+                    "/works/", ""
+                ),  # Extract book ID for linking
+                "author": item.get("author_name", ["Unknown Author"])[0],
+                "release_date": item.get("first_publish_year"),
+                "cover_url": f"https://covers.openlibrary.org/b/id/{item.get('cover_i')}-L.jpg"
+                if "cover_i" in item
+                else None,
+            }
+        )
+    return book
 
-    if result.modified_count == 0:
-        return jsonify({"error": "Book not found in log or removal failed"}), 404
-    update_user_section(username, "decrement", "media")
-    return jsonify({"success": True, "message": f"Book removed from {section}."}), 200
+
+trending.register("books", fetch_trending_books)
 
 
 @books_bp.route("/api/trendingbooks", methods=["GET"])
 @cross_origin(origin="http://localhost:3000", headers=["Content-Type"])
 def trending_books():
     try:
-        book = []
-        response = requests.get(
-            TRENDING_BOOKS_URL, params={"sort": "readinglog", "limit": 20}
-        )
-        response.raise_for_status()
-        data = response.json()
-
-        for item in data.get("works", []):
-            book.append(
-                {
-                    "title": item.get("title", "Unknown Title"),
-                    "id": item.get("key", "").replace(
-                        "/works/", ""
-                    ),  # Extract book ID for linking
-                    "author": item.get("author_name", ["Unknown Author"])[0],
-                    "release_date": item.get("first_publish_year"),
-                    "cover_url": f"https://covers.openlibrary.org/b/id/{item.get('cover_i')}-L.jpg"
-                    if "cover_i" in item
-                    else None,
-                }
-            )
-        return jsonify({"book": book})
+        return jsonify({"book": trending.get("books")})
 
     except requests.exceptions.RequestException as e:
         return jsonify({"error": str(e)}), 500
@@ -712,7 +605,7 @@ def search_author():
     
     try:
         # Perform the search request to Open Library
-        response = requests.get(OPEN_LIBRARY_SEARCH_URL, params={"author": full_query, "sort": "new"})
+        response = upstream.get(OPEN_LIBRARY_SEARCH_URL, params={"author": full_query, "sort": "new"})
         response.raise_for_status()  # Raise error for bad responses
         data = response.json()
 
@@ -734,6 +627,7 @@ def search_author():
     
 @books_bp.route('/api/authors/<author_id>', methods=['GET'])
 @cross_origin(origin="http://localhost:3000", headers=["Content-Type"])
+@cached("author_details", ttl=7 * 24 * 60 * 60)
 def person_details(author_id):
     try:
         # Fetch movie details from TMDB API
@@ -741,12 +635,12 @@ def person_details(author_id):
         credits_url = f"https://openlibrary.org/search.json?author={author_id}"
 
         # Movie details
-        response = requests.get(url)
+        response = upstream.get(url)
         response.raise_for_status()
         item = response.json()
 
         # Movie credits
-        books_response = requests.get(credits_url)
+        books_response = upstream.get(credits_url)
         books_response.raise_for_status()
         books = books_response.json()
 
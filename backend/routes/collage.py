@@ -4,7 +4,7 @@ from flask import Blueprint, Response, current_app, jsonify, make_response, requ
 from flask_cors import cross_origin
 from flask_jwt_extended import get_jwt_identity, jwt_required, verify_jwt_in_request
 from io import BytesIO
-import requests
+from services import upstream
 
 collage_bp = Blueprint("collage", __name__)
 
@@ -141,19 +141,20 @@ def proxy_image():
         return {"error": "Missing image URL"}, 400
     
     try:
-        # Fetch the image from the original source
-        response = requests.get(image_url, stream=True)
-        if response.status_code != 200:
-            return {"error": f"Failed to fetch image: {response.status_code}"}, response.status_code
-        
-        # Return the image with proper headers
-        return Response(
-            response.content,
-            content_type=response.headers.get('Content-Type', 'image/jpeg'),
-            headers={
-                'Access-Control-Allow-Origin': '*',
-                'Cache-Control': 'public, max-age=86400'
-            }
-        )
+        # Fetch the image from the original source. Hosts outside the upstream
+        # APIs share one session, and closing the response frees its connection
+        with upstream.get(image_url, stream=True) as response:
+            if response.status_code != 200:
+                return {"error": f"Failed to fetch image: {response.status_code}"}, response.status_code
+            
+            # Return the image with proper headers
+            return Response(
+                response.content,
+                content_type=response.headers.get('Content-Type', 'image/jpeg'),
+                headers={
+                    'Access-Control-Allow-Origin': '*',
+                    'Cache-Control': 'public, max-age=86400'
+                }
+            )
     except Exception as e:
         return {"error": str(e)}, 500
\ No newline at end of file
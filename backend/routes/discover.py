@@ -1,6 +1,6 @@
 import os
 import cloudinary.uploader
-from flask import Blueprint, current_app, jsonify, make_response, request
+from flask import Blueprint, Response, current_app, jsonify, make_response, request
 from flask_cors import cross_origin
 from flask_jwt_extended import create_access_token, jwt_required
 from pymongo.errors import DuplicateKeyError
@@ -9,12 +9,19 @@ from werkzeug.security import check_password_hash, generate_password_hash
 from werkzeug.utils import secure_filename
 from services.config import Config
 from bson import ObjectId
-from .movie import get_poster
-from .tv import search_single_tv
-from .books import search_book
+from services import prompt_cache, resolution_index, upstream
+from services.json_stream import JsonItemStream
+from .movie import lookup_movie
+from .tv import lookup_single_tv
+from .books import lookup_book
 from google import genai
 from google.genai import types
 import json
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+import requests
 
 cloudinary.config(
     cloud_name=os.getenv("CLOUDINARY_CLOUD_NAME"),
@@ -24,6 +31,20 @@ cloudinary.config(
 
 discover_bp = Blueprint("discover", __name__)
 
+GEMINI_MODEL = "gemini-2.0-flash"
+_genai_client = None
+_genai_client_lock = threading.Lock()
+
+
+def get_genai_client():
+    """Create the Gemini client once per process and reuse it"""
+    global _genai_client
+    if _genai_client is None:
+        with _genai_client_lock:
+            if _genai_client is None:
+                _genai_client = genai.Client(api_key=os.environ.get("GEMINI_API_KEY"))
+    return _genai_client
+
 
 @discover_bp.route("/api/discover/users", methods=["GET"])
 def discover_users():
@@ -58,57 +79,144 @@ def discover_users():
 
 
 
+def _title_and_year(item):
+    """Split a Gemini suggestion into (title, year); bare strings have no year"""
+    if isinstance(item, dict):
+        return item.get("title", "Unknown"), item.get("year")
+    return item, None
+
+
+def _resolve_movie(title, year):
+    try:
+        movie = resolution_index.resolve("movie", title, year, lookup_movie)
+    except requests.RequestException:
+        return {"title": title, "year": year, "error": "Failed to fetch movie details"}
+    return movie or {"title": title, "year": year, "error": "Movie not found"}
+
+
+def _resolve_show(title, year):
+    try:
+        show = resolution_index.resolve("tv", title, year, lookup_single_tv)
+    except requests.RequestException:
+        return {"title": title, "year": year, "error": "Failed to fetch TV show details"}
+    return show or {"title": title, "year": year, "error": "TV show not found"}
+
+
+def _resolve_book(title, year):
+    try:
+        return resolution_index.resolve("book", title, None, lambda t, y: lookup_book(t))
+    except requests.RequestException:
+        return [{"title": title, "error": "Failed to fetch book details"}]
+
+
+def resolve_suggestions(jobs):
+    """
+    Look up suggested titles concurrently.
+
+    Args:
+        jobs (list): (resolver, suggestion) pairs.
+
+    Returns:
+        list: One result per job, in order. Each item keeps its own error
+        entry if its lookup fails or does not finish within
+        DISCOVER_RESOLVE_TIMEOUT.
+    """
+    suggestions = [(resolver, *_title_and_year(item)) for resolver, item in jobs]
+    results = upstream.gather(
+        [lambda r=resolver, t=title, y=year: r(t, y) for resolver, title, year in suggestions],
+        timeout=Config.DISCOVER_RESOLVE_TIMEOUT,
+    )
+
+    resolved = []
+    for (resolver, title, year), result in zip(suggestions, results):
+        if isinstance(result, Exception):
+            print(f"Error fetching details for '{title} ({year})': {result!r}")
+            result = {"title": title, "year": year, "error": "Error fetching details"}
+            if resolver is _resolve_book:
+                result = [{"title": title, "error": "Error fetching details"}]
+        resolved.append(result)
+    return resolved
+
+
+@discover_bp.route("/api/discover/resolution-stats", methods=["GET"])
+def resolution_stats():
+    """Hit/miss counters of the title resolution index for this worker"""
+    return jsonify(resolution_index.stats()), 200
+
+
+def stream_similar_movie_titles(plot_description):
+    """
+    Stream the raw Gemini text listing the 10 movies most similar to the given plot description.
+    """
+    client = get_genai_client()
+
+    contents = [
+        types.Content(
+            role="user",
+            parts=[types.Part.from_text(text=plot_description)],
+        ),
+    ]
+
+    generate_content_config = types.GenerateContentConfig(
+        response_mime_type="text/plain",
+        system_instruction=[
+            types.Part.from_text(
+                text="""When given the plot description of a movie, return the 10 most similar movies as a JSON array.
+                
+                Each movie must be formatted as:
+                {"title": "Movie Title", "year": 2005}
+
+                Ensure the response is strictly a valid JSON array containing up to 10 movie objects. 
+                Example response:
+                [{"title": "Inception", "year": 2010}, {"title": "Interstellar", "year": 2014}]
+
+                Do NOT include any extra text, explanations, or formatting. If no matches exist, return an empty JSON array: []
+                """
+            ),
+        ],
+    )
+
+    for chunk in client.models.generate_content_stream(
+        model=GEMINI_MODEL,
+        contents=contents,
+        config=generate_content_config,
+    ):
+        yield chunk.text or ""
+
+
+def parse_similar_movie_titles(response_text):
+    """Parse Gemini's JSON array of {"title", "year"} objects, or [] if malformed"""
+    # Convert response text to JSON
+    movie_data = json.loads(response_text.strip())  # Ensure valid JSON parsing
+    return (
+        movie_data
+        if isinstance(movie_data, list) and all(isinstance(m, dict) and "title" in m and "year" in m for m in movie_data)
+        else []
+    )
+
+
+def similar_movies_cache_key(plot_description):
+    return prompt_cache.make_key(GEMINI_MODEL, "similar_movies", plot_description)
+
+
 def get_similar_movie_titles(plot_description):
     """
     Fetch the titles and release years of the 10 most similar movies based on the given plot description.
     """
     try:
-        client = genai.Client(api_key=os.environ.get("GEMINI_API_KEY"))
-        model = "gemini-2.0-flash"
-
-        contents = [
-            types.Content(
-                role="user",
-                parts=[types.Part.from_text(text=plot_description)],
-            ),
-        ]
-
-        generate_content_config = types.GenerateContentConfig(
-            response_mime_type="text/plain",
-            system_instruction=[
-                types.Part.from_text(
-                    text="""When given the plot description of a movie, return the 10 most similar movies as a JSON array.
-                    
-                    Each movie must be formatted as:
-                    {"title": "Movie Title", "year": 2005}
-
-                    Ensure the response is strictly a valid JSON array containing up to 10 movie objects. 
-                    Example response:
-                    [{"title": "Inception", "year": 2010}, {"title": "Interstellar", "year": 2014}]
-
-                    Do NOT include any extra text, explanations, or formatting. If no matches exist, return an empty JSON array: []
-                    """
-                ),
-            ],
-        )
+        cache_key = similar_movies_cache_key(plot_description)
+        cached = prompt_cache.get(cache_key)
+        if cached is not None:
+            return cached
 
         # Stream and parse the response
-        response_text = ""
-        for chunk in client.models.generate_content_stream(
-            model=model,
-            contents=contents,
-            config=generate_content_config,
-        ):
-            response_text += chunk.text
+        response_text = "".join(stream_similar_movie_titles(plot_description))
 
         print(response_text)
-        # Convert response text to JSON
-        movie_data = json.loads(response_text.strip())  # Ensure valid JSON parsing
-        return (
-            movie_data
-            if isinstance(movie_data, list) and all(isinstance(m, dict) and "title" in m and "year" in m for m in movie_data)
-            else []
-        )
+        movie_data = parse_similar_movie_titles(response_text)
+        if movie_data:
+            prompt_cache.set(cache_key, movie_data)
+        return movie_data
     except Exception as e:
         print(f"Error generating movie titles: {e}")
         return []
@@ -130,33 +238,9 @@ def discover_plot():
         print(similar_movies)  # Debugging output
 
         # Fetch movie details using the titles and years
-        movie_details_list = []
-        for movie in similar_movies:
-            try:
-                # Ensure movie entry is structured correctly
-                if isinstance(movie, dict) and "title" in movie and "year" in movie:
-                    title = movie["title"]
-                    year = movie["year"]
-
-                    # Call get_poster with title and year
-                    poster_response = get_poster(title, year)
-                else:
-                    title = movie  # Fallback if only title is returned
-                    poster_response = get_poster(title)
-
-                # Ensure response is valid and contains a movie
-                if poster_response and poster_response.status_code == 200:
-                    poster_data = poster_response.get_json()
-                    if "movie" in poster_data:
-                        movie_details_list.append(poster_data["movie"])
-                    else:
-                        movie_details_list.append({"title": title, "year": year, "error": "Movie not found"})
-                else:
-                    movie_details_list.append({"title": title, "year": year, "error": "Failed to fetch movie details"})
-            
-            except Exception as fetch_error:
-                print(f"Error fetching details for movie '{title} ({year})': {fetch_error}")
-                movie_details_list.append({"title": title, "year": year, "error": "Error fetching details"})
+        movie_details_list = resolve_suggestions(
+            [(_resolve_movie, movie) for movie in similar_movies]
+        )
 
         # Respond with movie details list
         return jsonify({"movies": movie_details_list}), 200
@@ -167,84 +251,104 @@ def discover_plot():
 
 
 
-def get_recommended(interests, previous_movies, previous_tv, previous_books):
+def stream_recommended(interests, previous_movies, previous_tv, previous_books):
+    """
+    Stream the raw Gemini text recommending 5 movies, 5 TV shows and 5 books.
+    """
+    client = get_genai_client()
+
+    # Prepare the previous movies list for prompt inclusion
+    previous_movies_str = ", ".join([f'"{title}"' for title in previous_movies])
+    previous_tv_str = ", ".join([f'"{title}"' for title in previous_tv])
+    previous_books_str = ", ".join([f'"{title}"' for title in previous_books])
+
+    contents = [
+        types.Content(
+            role="user",
+            parts=[types.Part.from_text(text=interests)],
+        ),
+    ]
+
+    # Update the prompt to ask the AI to avoid previously recommended movies
+    generate_content_config = types.GenerateContentConfig(
+        response_mime_type="text/plain",
+        system_instruction=[types.Part.from_text(
+            text=f"""
+                When given a user's interests, return **exactly** 5 random movies, 5 random TV shows, and 5 random books as a structured JSON object.
+                IMPORTANT: If no interests are provided, still return ANY 5 random movies, 5 random TV shows, and 5 random books from ANY genre. Try to provide a mix of genres.
+                
+                Return the movies, then the shows, then the books.
+                
+                ### **Response Format:**
+                The response **must be a JSON object** with three keys: `"movies"`, `"shows"`, and `"books"`.  
+                Each key maps to an **array** of up to 5 items.
+
+                - **Movies Format:**  
+                "movies": [  
+                    {{ "title": "Movie Title", "year": 2005 }},  
+                    {{ "title": "Inception", "year": 2010 }}  
+                ]  
+
+                - **TV Shows Format:**  
+                "shows": [  
+                    {{ "title": "Show Title", "year": 2005 }},  
+                    {{ "title": "Breaking Bad", "year": 2008 }}  
+                ]  
+
+                - **Books Format:**  
+                "books": [  
+                    {{ "title": "Book Title" }},  
+                    {{ "title": "Dune" }}  
+                ]  
+
+                IMPORTANT: Do not recommend movies that have already been suggested. The following movies have already been recommended and should be excluded from the new list: {previous_movies_str}
+                IMPORTANT: Do not recommend tv shows that have already been suggested. The following tv shows have already been recommended and should be excluded from the new list: {previous_tv_str}
+                IMPORTANT: Do not recommend books that have already been suggested. The following books have already been recommended and should be excluded from the new list: {previous_books_str}
+
+            """
+        )],
+    )
+
+    for chunk in client.models.generate_content_stream(
+        model=GEMINI_MODEL,
+        contents=contents,
+        config=generate_content_config,
+    ):
+        yield chunk.text or ""
+
+
+def _previous_titles(arg_name):
+    """Parse a JSON list of already-recommended titles from the query string"""
     try:
-        client = genai.Client(api_key=os.environ.get("GEMINI_API_KEY"))
-        model = "gemini-2.0-flash"
-
-        # Prepare the previous movies list for prompt inclusion
-        previous_movies_str = ", ".join([f'"{title}"' for title in previous_movies])
-        previous_tv_str = ", ".join([f'"{title}"' for title in previous_tv])
-        previous_books_str = ", ".join([f'"{title}"' for title in previous_books])
-
-        contents = [
-            types.Content(
-                role="user",
-                parts=[types.Part.from_text(text=interests)],
-            ),
-        ]
-
-        # Update the prompt to ask the AI to avoid previously recommended movies
-        generate_content_config = types.GenerateContentConfig(
-            response_mime_type="text/plain",
-            system_instruction=[types.Part.from_text(
-                text=f"""
-                    When given a user's interests, return **exactly** 5 random movies, 5 random TV shows, and 5 random books as a structured JSON object.
-                    IMPORTANT: If no interests are provided, still return ANY 5 random movies, 5 random TV shows, and 5 random books from ANY genre. Try to provide a mix of genres.
-                    
-                    Return the movies, then the shows, then the books.
-                    
-                    ### **Response Format:**
-                    The response **must be a JSON object** with three keys: `"movies"`, `"shows"`, and `"books"`.  
-                    Each key maps to an **array** of up to 5 items.
-
-                    - **Movies Format:**  
-                    "movies": [  
-                        {{ "title": "Movie Title", "year": 2005 }},  
-                        {{ "title": "Inception", "year": 2010 }}  
-                    ]  
-
-                    - **TV Shows Format:**  
-                    "shows": [  
-                        {{ "title": "Show Title", "year": 2005 }},  
-                        {{ "title": "Breaking Bad", "year": 2008 }}  
-                    ]  
-
-                    - **Books Format:**  
-                    "books": [  
-                        {{ "title": "Book Title" }},  
-                        {{ "title": "Dune" }}  
-                    ]  
-
-                    IMPORTANT: Do not recommend movies that have already been suggested. The following movies have already been recommended and should be excluded from the new list: {previous_movies_str}
-                    IMPORTANT: Do not recommend tv shows that have already been suggested. The following tv shows have already been recommended and should be excluded from the new list: {previous_tv_str}
-                    IMPORTANT: Do not recommend books that have already been suggested. The following books have already been recommended and should be excluded from the new list: {previous_books_str}
+        return json.loads(request.args.get(arg_name, "[]"))  # Convert from JSON string to list
+    except json.JSONDecodeError:
+        return []
+
+
+def parse_recommended(response_text):
+    """Parse Gemini's {"movies", "shows", "books"} object, dropping malformed sections"""
+    # Clean up response text to remove unwanted characters
+    response_text = response_text.strip().replace("\n", "").replace("```json", "").replace("```", "").strip()
+
+    # Convert response text to JSON
+    movie_data = json.loads(response_text)
+
+    # Return the movies
+    return {
+        "movies": movie_data.get("movies", []) if isinstance(movie_data.get("movies"), list) else [],
+        "shows": movie_data.get("shows", []) if isinstance(movie_data.get("shows"), list) else [],
+        "books": movie_data.get("books", []) if isinstance(movie_data.get("books"), list) else [],
+    }
 
-                """
-            )],
-        )
 
+def get_recommended(interests, previous_movies, previous_tv, previous_books):
+    # Not cached: the prompt asks for a random pick, which should differ per call
+    try:
         # Stream and parse the response
-        response_text = ""
-        for chunk in client.models.generate_content_stream(
-            model=model,
-            contents=contents,
-            config=generate_content_config,
-        ):
-            response_text += chunk.text
-
-        # Clean up response text to remove unwanted characters
-        response_text = response_text.strip().replace("\n", "").replace("```json", "").replace("```", "").strip()
-
-        # Convert response text to JSON
-        movie_data = json.loads(response_text)
-
-        # Return the movies
-        return {
-            "movies": movie_data.get("movies", []) if isinstance(movie_data.get("movies"), list) else [],
-            "shows": movie_data.get("shows", []) if isinstance(movie_data.get("shows"), list) else [],
-            "books": movie_data.get("books", []) if isinstance(movie_data.get("books"), list) else [],
-        }
+        response_text = "".join(
+            stream_recommended(interests, previous_movies, previous_tv, previous_books)
+        )
+        return parse_recommended(response_text)
 
     except Exception as e:
         print(f"Error generating movie titles: {e}")
@@ -255,26 +359,10 @@ def recommended_media():
     try:
         # Extract plot description from query parameters
         interests = request.args.get("query", "")
-        previous_movies = request.args.get("previousMovies", "[]")
-        previous_tv = request.args.get("previousTv", "[]")
-        previous_books = request.args.get("previousBooks", "[]")
+        previous_movies = _previous_titles("previousMovies")
+        previous_tv = _previous_titles("previousTv")
+        previous_books = _previous_titles("previousBooks")
         print(request.args)
-        
-        try:
-            previous_movies = json.loads(previous_movies)  # Convert from JSON string to list
-        except json.JSONDecodeError:
-            previous_movies = []
-            
-        try:
-            previous_tv = json.loads(previous_tv)  # Convert from JSON string to list
-        except json.JSONDecodeError:
-            previous_tv = []
-            
-        try:
-            previous_books = json.loads(previous_books)  # Convert from JSON string to list
-        except json.JSONDecodeError:
-            previous_books = []
-            
         print(previous_tv)
                         
         # Get movie titles from Gemini instead of IDs
@@ -293,75 +381,17 @@ def recommended_media():
         recommended_books = recommended_media.get("books", [])
         # print(recommended_books)
         
-        # Fetch movie details using the titles and years
-        movie_details_list = []
-        for movie in recommended_movies:
-            try:
-                # Ensure movie entry is structured correctly
-                if isinstance(movie, dict) and "title" in movie and "year" in movie:
-                    title = movie["title"]
-                    year = movie["year"]
-
-                    # Call get_poster with title and year
-                    poster_response = get_poster(title, year)
-                else:
-                    title = movie  # Fallback if only title is returned
-                    poster_response = get_poster(title)
-
-                # Ensure response is valid and contains a movie
-                if poster_response and poster_response.status_code == 200:
-                    poster_data = poster_response.get_json()
-                    if "movie" in poster_data:
-                        movie_details_list.append(poster_data["movie"])
-                    else:
-                        movie_details_list.append({"title": title, "year": year, "error": "Movie not found"})
-                else:
-                    movie_details_list.append({"title": title, "year": year, "error": "Failed to fetch movie details"})
-            
-            except Exception as fetch_error:
-                print(f"Error fetching details for movie '{title} ({year})': {fetch_error}")
-                movie_details_list.append({"title": title, "year": year, "error": "Error fetching details"})
-                
-        show_details_list = []
-        for show in recommended_shows:
-            try:
-                if isinstance(show, dict) and "title" in show and "year" in show:
-                    title, year = show["title"], show["year"]
-                    show_response = search_single_tv(title, year)
-                else:
-                    title = show
-                    show_response = search_single_tv(title, None)
-
-                if show_response and show_response.status_code == 200:
-                    show_data = show_response.get_json()
-                    show_details_list.append(show_data.get("tv_show", {"title": title, "year": year, "error": "TV show not found"}))
-                else:
-                    show_details_list.append({"title": title, "year": year, "error": "Failed to fetch TV show details"})
-            except Exception as e:
-                print(f"Error fetching TV show details: {e}")
-                show_details_list.append({"title": show.get("title", "Unknown"), "year": show.get("year", "Unknown"), "error": "Error fetching details"})
-                
-        # Fetch book details using search_book function for each recommended book title
+        # Fetch movie, show and book details for every title at once
+        resolved = resolve_suggestions(
+            [(_resolve_movie, movie) for movie in recommended_movies]
+            + [(_resolve_show, show) for show in recommended_shows]
+            + [(_resolve_book, book) for book in recommended_books]
+        )
+        movie_details_list = resolved[:len(recommended_movies)]
+        show_details_list = resolved[len(recommended_movies):len(recommended_movies) + len(recommended_shows)]
         book_details_list = []
-        for book in recommended_books:
-            try:
-                title = book["title"]
-                
-                # Call search_book function to fetch book details (title, author, cover)
-                book_response = search_book(title)  # You can adapt this to fetch details for each book
-                
-                # Ensure response is valid and contains books
-                if book_response and book_response.status_code == 200:
-                    book_data = book_response.get_json()
-                    if "books" in book_data:
-                        book_details_list.extend(book_data["books"])  # Append all books found
-                    else:
-                        book_details_list.append({"title": title, "error": "Book not found"})
-                else:
-                    book_details_list.append({"title": title, "error": "Failed to fetch book details"})
-            except Exception as fetch_error:
-                print(f"Error fetching details for book '{title}': {fetch_error}")
-                book_details_list.append({"title": title, "error": "Error fetching details"})
+        for books in resolved[len(recommended_movies) + len(recommended_shows):]:
+            book_details_list.extend(books)  # Append all books found
 
         return jsonify({
             "movies": movie_details_list,
@@ -371,4 +401,131 @@ def recommended_media():
 
     except Exception as e:
         print(f"Unexpected error in discover_plot: {e}")
-        return jsonify({"movies": [], "error": "An unexpected error occurred"}), 500
\ No newline at end of file
+        return jsonify({"movies": [], "error": "An unexpected error occurred"}), 500
+
+
+def stream_resolved(chunks, resolvers):
+    """
+    Resolve suggestions while Gemini is still generating them.
+
+    A producer thread parses each suggestion out of the text stream as soon
+    as its closing brace arrives and hands it to a bounded lookup pool.
+    Lookups push their results onto a queue that this generator drains, so
+    every resolved item is emitted the moment it is ready.
+
+    Args:
+        chunks (iterable): Text chunks of the Gemini response.
+        resolvers (dict): Section key ("movies", "shows", "books") -> resolver.
+
+    Yields:
+        dict: {"section": ..., "item": ...} per resolved entry, then {"done": True}.
+    """
+    results = queue.Queue()
+    pool = ThreadPoolExecutor(max_workers=Config.UPSTREAM_MAX_WORKERS)
+
+    def resolve(section, suggestion):
+        title, year = _title_and_year(suggestion)
+        try:
+            result = resolvers[section](title, year)
+        except Exception as e:
+            print(f"Error fetching details for '{title} ({year})': {e!r}")
+            result = {"title": title, "year": year, "error": "Error fetching details"}
+        for item in result if isinstance(result, list) else [result]:
+            results.put({"section": section, "item": item})
+
+    def produce():
+        pending = []
+        try:
+            parser = JsonItemStream()
+            for text in chunks:
+                for section, suggestion in parser.feed(text):
+                    section = section or "movies"
+                    if section in resolvers:
+                        pending.append(pool.submit(resolve, section, suggestion))
+        except Exception as e:
+            print(f"Error streaming from Gemini: {e}")
+            results.put({"error": "No valid response from Gemini"})
+        finally:
+            wait(pending)
+            pool.shutdown(wait=False)
+            results.put(None)
+
+    threading.Thread(target=produce, daemon=True).start()
+
+    deadline = time.monotonic() + Config.DISCOVER_STREAM_TIMEOUT
+    while True:
+        try:
+            message = results.get(timeout=max(0, deadline - time.monotonic()))
+        except queue.Empty:
+            yield {"done": True, "error": "Timed out resolving recommendations"}
+            return
+        if message is None:
+            yield {"done": True}
+            return
+        yield message
+
+
+def cached_stream(cache_key, chunks, parse):
+    """
+    Replay a cached Gemini result as a single chunk, or pass the live chunks
+    through and cache the parsed result once the stream completes.
+    """
+    cached = prompt_cache.get(cache_key)
+    if cached is not None:
+        yield json.dumps(cached)
+        return
+
+    response_text = ""
+    for chunk in chunks:
+        response_text += chunk
+        yield chunk
+
+    try:
+        result = parse(response_text)
+    except ValueError:
+        return
+    if result and (not isinstance(result, dict) or any(result.values())):
+        prompt_cache.set(cache_key, result)
+
+
+def _ndjson(messages):
+    return Response(
+        (json.dumps(message) + "\n" for message in messages),
+        mimetype="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@discover_bp.route("/api/discover/plot/stream", methods=["GET"])
+def discover_plot_stream():
+    """Streaming variant of /api/discover/plot, one NDJSON line per resolved movie"""
+    plot_description = request.args.get("query", "")
+    if not plot_description:
+        return jsonify({"error": "Plot description is required"}), 400
+
+    return _ndjson(
+        stream_resolved(
+            cached_stream(
+                similar_movies_cache_key(plot_description),
+                stream_similar_movie_titles(plot_description),
+                parse_similar_movie_titles,
+            ),
+            {"movies": _resolve_movie},
+        )
+    )
+
+
+@discover_bp.route("/api/discover/recommended/stream", methods=["GET"])
+def recommended_media_stream():
+    """Streaming variant of /api/discover/recommended, one NDJSON line per resolved item"""
+    interests = request.args.get("query", "")
+    previous_movies = _previous_titles("previousMovies")
+    previous_tv = _previous_titles("previousTv")
+    previous_books = _previous_titles("previousBooks")
+
+    return _ndjson(
+        stream_resolved(
+            stream_recommended(interests, previous_movies, previous_tv, previous_books),
+            {"movies": _resolve_movie, "shows": _resolve_show, "books": _resolve_book},
+        )
+    )
@@ -0,0 +1,32 @@
+from flask import Blueprint, jsonify, request
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+from services import feed
+
+feed_bp = Blueprint("feed", __name__)
+
+
+@feed_bp.route("/api/feed", methods=["GET"])
+def get_feed():
+    """
+    The current user's feed: reviews, log entries and list changes of the
+    users they follow, newest first. Pass `next_cursor` back as `cursor` for
+    the next page.
+    """
+    print("\n📤 GET /api/feed requested")
+    verify_jwt_in_request()
+    current_user = get_jwt_identity()
+
+    try:
+        activities, next_cursor = feed.get_page(
+            current_user,
+            cursor=request.args.get("cursor"),
+            limit=request.args.get("limit", type=int),
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        print(f"❌ Error getting feed for {current_user}: {e}\n")
+        return jsonify({"error": str(e)}), 500
+
+    print(f"✅ Retrieved {len(activities)} feed activities for {current_user}.\n")
+    return jsonify({"activities": activities, "next_cursor": next_cursor}), 200
@@ -0,0 +1,19 @@
+from flask import Blueprint, jsonify, request
+from routes.admin import is_admin
+from services import database
+
+health_bp = Blueprint("health", __name__)
+
+
+@health_bp.route("/api/health/db", methods=["GET"])
+def db_health():
+    """
+    Report MongoDB connectivity. With the admin key in an X-Admin-Key header
+    the report also has the settings, connection pool use and command
+    latencies; without it, only `ok` and `ping_ms`.
+    """
+    report = database.health()
+    status = 200 if report["ok"] else 503
+    if not is_admin({"admin_key": request.headers.get("X-Admin-Key")}):
+        report = {"ok": report["ok"], "ping_ms": report.get("ping_ms")}
+    return jsonify(report), status
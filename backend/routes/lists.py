@@ -5,10 +5,24 @@ from pymongo import errors
 import datetime
 from flask_jwt_extended import jwt_required, get_jwt_identity, verify_jwt_in_request
 from controllers.updateUserStat import update_user_section
+from services import feed, references
 
 # Define Blueprint
 lists_bp = Blueprint("lists", __name__)
 
+# Fields the followed lists page and its list popup use
+FOLLOWED_LIST_FIELDS = {
+    "name": 1,
+    "description": 1,
+    "items": 1,
+    "user_id": 1,
+    "created_at": 1,
+    "isPublic": 1,
+    "isCollaborative": 1,
+    "collaborators": 1,
+    "follower_count": 1,
+}
+
 
 # def init_db(client, lists_collection, users_collection):
 #     """Initialize database connections globally within this module."""
@@ -111,7 +125,8 @@ def create_list():
         new_list["_id"] = str(result.inserted_id)
         print(f"✅ Successfully created list: {new_list['name']} with ID {result.inserted_id}\n")
         update_user_section(current_user, "increment", "lists")
-
+        if new_list["isPublic"]:
+            feed.record_list(new_list, "list_created")
 
         response = make_response(jsonify(new_list), 201)
         return response
@@ -178,6 +193,12 @@ def update_list(id):
         updated_list = lists_col.find_one({"_id": ObjectId(id)})
         updated_list["_id"] = str(updated_list["_id"])
 
+        # Only public lists show up in followers' feeds
+        if updated_list.get("isPublic"):
+            feed.record_list(updated_list, "list_updated")
+        else:
+            feed.retract(id)
+
         print(f"✅ Successfully updated list with ID {id}\n")
 
         response = make_response(jsonify(updated_list), 200)
@@ -207,6 +228,7 @@ def delete_list(id):
             return response
 
         print(f"✅ Successfully deleted list with ID {id}\n")
+        feed.retract(id)
 
         update_user_section(current_user, "decrement", "lists")
         response = make_response(jsonify({"message": "List deleted successfully"}), 200)
@@ -365,27 +387,38 @@ def get_followed_lists():
     users_col = current_app.config["collections"].get("users")
     lists_col = current_app.config["collections"].get("lists")
     
+    cursor = request.args.get("cursor")
+    limit = request.args.get("limit", type=int)
+
     try:
-        user = users_col.find_one({"username": current_user})
+        user = users_col.find_one({"username": current_user}, {"followed_lists": 1})
         if not user:
             print(f"❌ User {current_user} not found.\n")
             return jsonify({"error": "User not found"}), 404
             
         followed_list_ids = user.get("followed_lists", [])
-        
-        followed_lists = []
-        for list_id in followed_list_ids:
-            try:
-                list_item = lists_col.find_one({"_id": ObjectId(list_id)})
-                if list_item:
-                    list_item["_id"] = str(list_item["_id"])
-                    followed_lists.append(list_item)
-            except Exception as e:
-                print(f"Error retrieving list {list_id}: {e}")
+        # $in queries for the page, in the order the lists were followed
+        followed_lists, missing, next_cursor = references.fetch_page(
+            lists_col, followed_list_ids, cursor, limit, projection=FOLLOWED_LIST_FIELDS
+        )
+        references.prune(users_col, current_user, "followed_lists", missing)
+
+        for list_item in followed_lists:
+            list_item["_id"] = str(list_item["_id"])
                 
         print(f"✅ Successfully retrieved {len(followed_lists)} followed lists for user {current_user}\n")
-        return jsonify(followed_lists), 200
+        if limit is None and cursor is None:
+            return jsonify(followed_lists), 200
+        return jsonify(
+            {
+                "lists": followed_lists,
+                "next_cursor": next_cursor,
+                "total": references.count_existing(lists_col, followed_list_ids),
+            }
+        ), 200
         
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         print(f"❌ Error getting followed lists: {e}\n")
         return jsonify({"error": str(e)}), 500
\ No newline at end of file
@@ -1,13 +1,13 @@
 from flask import Blueprint, current_app, jsonify, make_response, request
 from flask_cors import cross_origin
-from bson.objectid import ObjectId
 from pymongo import errors
 from dotenv import load_dotenv
 from urllib.parse import quote
 import requests
+from services import media_logs, trending, upstream
+from services.cache import cached
 import os
 from datetime import datetime
-from schemas.movie_logs_schema import MovieLogsSchema
 from controllers.updateUserStat import update_user_section
 
 # Load environment variables
@@ -15,7 +15,6 @@ load_dotenv()
 TMDB_API_KEY = os.getenv("TMDB_API_KEY")
 TMDB_BASE_URL = "https://api.themoviedb.org/3"
 TMDB_IMAGE_BASE_URL = "https://image.tmdb.org/t/p/w500"
-movie_logs_schema = MovieLogsSchema()
 
 # Define the genre ID to name mapping
 genre_id_to_name = {
@@ -74,7 +73,7 @@ def get_posters():
         # Search movies by query (title)
         url = f"{TMDB_BASE_URL}/search/movie"
         headers = {"Authorization": f"Bearer {TMDB_API_KEY}"}
-        response = requests.get(url, headers=headers, params=params)
+        response = upstream.get(url, headers=headers, params=params)
         response.raise_for_status()
         data = response.json()
 
@@ -149,10 +148,16 @@ def get_posters():
         return jsonify({"error": str(e)}), 500
     
     
-def get_poster(title, year):
-    if not title:
-        return jsonify({'error': 'Query parameter "title" is required'}), 400
+def lookup_movie(title, year=None):
+    """
+    Find the first TMDB movie matching a title (and optionally a release year).
 
+    Returns:
+        dict: The movie summary, or None if nothing matched.
+
+    Raises:
+        requests.RequestException: If the TMDB request fails.
+    """
     # Set up the TMDB API parameters for search
     params = {
         "query": title,
@@ -165,29 +170,38 @@ def get_poster(title, year):
     if year:
         params["primary_release_year"] = year
 
-    try:
-        # Search movies by query (title) and optionally by year
-        url = f"{TMDB_BASE_URL}/search/movie"
-        headers = {"Authorization": f"Bearer {TMDB_API_KEY}"}
-        response = requests.get(url, headers=headers, params=params)
-        response.raise_for_status()
-        data = response.json()
+    # Search movies by query (title) and optionally by year
+    url = f"{TMDB_BASE_URL}/search/movie"
+    headers = {"Authorization": f"Bearer {TMDB_API_KEY}"}
+    response = upstream.get(url, headers=headers, params=params)
+    response.raise_for_status()
+    data = response.json()
+
+    # Get the first movie result (if available)
+    first_movie = (data.get("results") or [None])[0]
+    if not first_movie:
+        return None
+
+    # Extract relevant movie data
+    return {
+        "id": first_movie["id"],
+        "title": first_movie["title"],
+        "release_date": first_movie.get("release_date"),
+        "vote_average": first_movie.get("vote_average"),
+        "poster_path": f"{TMDB_IMAGE_BASE_URL}{first_movie['poster_path']}" if first_movie.get("poster_path") else None,
+        "genre_ids": first_movie.get("genre_ids", []),
+        "genres": [genre_id_to_name.get(genre_id, "Unknown") for genre_id in first_movie.get("genre_ids", [])],
+    }
 
-        # Get the first movie result (if available)
-        first_movie = data.get("results", [None])[0]
-        if not first_movie:
-            return jsonify({"error": "No movies found"}), 404
 
-        # Extract relevant movie data
-        movie_details = {
-            "id": first_movie["id"],
-            "title": first_movie["title"],
-            "release_date": first_movie.get("release_date"),
-            "vote_average": first_movie.get("vote_average"),
-            "poster_path": f"{TMDB_IMAGE_BASE_URL}{first_movie['poster_path']}" if first_movie.get("poster_path") else None,
-            "genre_ids": first_movie.get("genre_ids", []),
-            "genres": [genre_id_to_name.get(genre_id, "Unknown") for genre_id in first_movie.get("genre_ids", [])],
-        }
+def get_poster(title, year=None):
+    if not title:
+        return jsonify({'error': 'Query parameter "title" is required'}), 400
+
+    try:
+        movie_details = lookup_movie(title, year)
+        if not movie_details:
+            return jsonify({"error": "No movies found"}), 404
 
         # Return only the first movie's details
         return jsonify({"movie": movie_details})
@@ -198,28 +212,20 @@ def get_poster(title, year):
 
 
 @movie_bp.route("/api/movie/<int:movie_id>", methods=["GET"])
+@cached("movie_details", ttl=24 * 60 * 60)
 def get_movie_details(movie_id):
     try:
-        # Fetch movie details from TMDB API
+        # Fetch movie details, credits and trailers from TMDB in a single call
         url = f"{TMDB_BASE_URL}/movie/{movie_id}"
-        credits_url = f"{TMDB_BASE_URL}/movie/{movie_id}/credits"
-        trailers_url = f"{TMDB_BASE_URL}/movie/{movie_id}/videos"
         headers = {"Authorization": f"Bearer {TMDB_API_KEY}"}
+        params = {"append_to_response": "credits,videos"}
 
-        # Movie details
-        response = requests.get(url, headers=headers)
+        response = upstream.get(url, headers=headers, params=params)
         response.raise_for_status()
         movie = response.json()
 
-        # Movie credits
-        credits_response = requests.get(credits_url, headers=headers)
-        credits_response.raise_for_status()
-        credits = credits_response.json()
-
-        # Movie trailers
-        trailers_response = requests.get(trailers_url, headers=headers)
-        trailers_response.raise_for_status()
-        trailers = trailers_response.json()
+        credits = movie.get("credits", {})
+        trailers = movie.get("videos", {})
 
         # Extract trailer information (looking for official trailer in English if available)
         trailer_key = None
@@ -273,7 +279,7 @@ def get_recommendations(movie_id):
         headers = {"Authorization": f"Bearer {TMDB_API_KEY}"}
         
         # Movie details
-        response = requests.get(url, headers=headers)
+        response = upstream.get(url, headers=headers)
         response.raise_for_status()
         data = response.json()
         
@@ -311,22 +317,10 @@ def log_movie(movie_id):
     if users_col is None:
         return jsonify({"error": "Database not connected"}), 500
 
-    user = users_col.find_one({"username": username})
+    user = users_col.find_one({"username": username}, {"_id": 1})
     if user is None:
         return jsonify({"error": "User not logged in!"}), 500
 
-    movie_logs_col = current_app.config["collections"].get("movieLogs")
-    user_movie_log_item = movie_logs_col.find_one({"username": username})
-
-    if user_movie_log_item is None:
-        info = {
-            "username": username,
-            "movieLog": [],
-            "watchLater": [],
-        }
-        insert = movie_logs_schema.load(info)
-        movie_logs_col.insert_one(insert)
-
     # Validate date format
     if watched_date:
         try:
@@ -334,10 +328,7 @@ def log_movie(movie_id):
         except ValueError:
             return jsonify({"error": "Invalid date format. Use YYYY-MM-DD."}), 400
 
-    user_movie_log_item = movie_logs_col.find_one({"username": username})
-
     new_movie_log = {
-        "_id": ObjectId(),
         "movieId": movie_id,
         "watchDate": watched_date,
         "rating": rating,
@@ -345,22 +336,12 @@ def log_movie(movie_id):
         "title": title,
         "poster": poster,  # Add poster path to the movie log
         "runtime": runtime,
+        "genres": media_logs.parse_list(data.get("genres")),
     }
 
-    result = movie_logs_col.update_one(
-        {"username": username},  # Find the document by username
-        {
-            "$push": {
-                "movieLog": new_movie_log
-            },  # Use $push to append to the logs array
-        },
-    )
-
-    if result.matched_count > 0:
-        update_user_section(username, "increment", "media")
-        return {"message": "Movie successfully added to your log."}, 200
-    else:
-        return {"error": "User not found or could not be updated."}, 400
+    media_logs.add_entry(username, "movie", "movieLog", new_movie_log)
+    update_user_section(username, "increment", "media")
+    return {"message": "Movie successfully added to your log."}, 200
 
 
 # Route to save a movie to the watch-later list
@@ -375,45 +356,20 @@ def save_for_later(movie_id):
     if users_col is None:
         return jsonify({"error": "Database not connected"}), 500
 
-    user = users_col.find_one({"username": username})
+    user = users_col.find_one({"username": username}, {"_id": 1})
     if user is None:
         return jsonify({"error": "User not logged in!"}), 500
 
-    movie_logs_col = current_app.config["collections"].get("movieLogs")
-    user_movie_log_item = movie_logs_col.find_one({"username": username})
-
-    if user_movie_log_item is None:
-        info = {
-            "username": username,
-            "movieLog": [],
-            "watchLater": [],
-        }
-        insert = movie_logs_schema.load(info)
-        movie_logs_col.insert_one(insert)
-
     new_entry = {
-        "_id": ObjectId(),
         "movieId": movie_id,
         "title": title,
         "poster": poster,  # Add poster path to the movie log
     }
 
-    result = movie_logs_col.update_one(
-        {"username": username},  # Find the document by username
-        {
-            "$push": {"watchLater": new_entry},  # Use $push to append to the logs array
-        },
-    )
+    return media_logs.add_entry(username, "movie", "watchLater", new_entry)
 
-    if result.matched_count > 0:
-        new_entry["_id"] = str(new_entry["_id"])
-        return new_entry
-        return {"message": "Movie successfully added to your log."}, 200
-    else:
-        return {"error": "User not found or could not be updated."}, 400
 
-
-# Route to get all logged movies
+# Route to get logged movies
 @movie_bp.route("/api/movie/log", methods=["GET"])
 def get_logged_movies():
     username = request.args.get("username")  # Get username from query parameters
@@ -421,32 +377,14 @@ def get_logged_movies():
     if users_col is None:
         return jsonify({"error": "Database not connected"}), 500
 
-    user = users_col.find_one({"username": username})
+    user = users_col.find_one({"username": username}, {"_id": 1})
     if user is None:
         return jsonify({"error": "User not logged in!"}), 500
 
-    movie_logs_col = current_app.config["collections"].get("movieLogs")
-    user_movie_log_item = movie_logs_col.find_one({"username": username})
-
-    if user_movie_log_item is None:
-        info = {
-            "username": username,
-            "movieLog": [],
-            "watchLater": [],
-        }
-        insert = movie_logs_schema.load(info)
-        movie_logs_col.insert_one(insert)
-
-    movie_log = user_movie_log_item["movieLog"]
-    for entry in movie_log:
-        entry["_id"] = str(entry["_id"])  # Serialize ObjectId to string
+    return media_logs.section_response(username, "movie", "movieLog", request.args)
 
-    return jsonify(movie_log)
 
-    # return jsonify(user_movie_log_item["movieLog"])
-
-
-# Route to get all movies in the watch-later list
+# Route to get movies in the watch-later list
 @movie_bp.route("/api/movie/watch_later", methods=["GET"])
 @cross_origin(origin="http://localhost:3000", headers=["Content-Type"])
 def get_watch_later():
@@ -455,29 +393,11 @@ def get_watch_later():
     if users_col is None:
         return jsonify({"error": "Database not connected"}), 500
 
-    user = users_col.find_one({"username": username})
+    user = users_col.find_one({"username": username}, {"_id": 1})
     if user is None:
         return jsonify({"error": "User not logged in!"}), 500
 
-    movie_logs_col = current_app.config["collections"].get("movieLogs")
-    user_movie_log_item = movie_logs_col.find_one({"username": username})
-
-    if user_movie_log_item is None:
-        info = {
-            "username": username,
-            "movieLog": [],
-            "watchLater": [],
-        }
-        insert = movie_logs_schema.load(info)
-        movie_logs_col.insert_one(insert)
-        
-        user_movie_log_item = movie_logs_col.find_one({"username": username})
-
-    watch_log = user_movie_log_item["watchLater"]
-    for entry in watch_log:
-        entry["_id"] = str(entry["_id"])  # Serialize ObjectId to string
-
-    return jsonify(watch_log)
+    return media_logs.section_response(username, "movie", "watchLater", request.args)
 
 
 # Route to remove from log/watch later
@@ -487,30 +407,23 @@ def remove_movie():
     username = data.get("username")  # Get username from query parameters
     entry = data.get("entry")
     section = data.get("section")
-    print(entry)
 
     users_col = current_app.config["collections"].get("users")
     if users_col is None:
         return jsonify({"error": "Database not connected"}), 500
 
-    user = users_col.find_one({"username": username})
+    user = users_col.find_one({"username": username}, {"_id": 1})
     if user is None:
         return jsonify({"error": "User not logged in!"}), 500
 
-    movie_logs_col = current_app.config["collections"].get("movieLogs")
-    user_movie_log_item = movie_logs_col.find_one({"username": username})
+    if not media_logs.is_valid_section("movie", section):
+        return jsonify({"error": f"Unknown section '{section}'"}), 400
 
-    result = movie_logs_col.update_one(
-        {"username": username},
-        {
-            "$pull": {section: {"_id": ObjectId(entry)}}
-        },  # Pull entry with matching movieId
-    )
-
-    if result.modified_count == 0:
+    if not media_logs.remove_entry(username, "movie", section, entry):
         return jsonify({"error": "Movie not found in log or removal failed"}), 404
-    
-    update_user_section(username, "decrement", "media")
+
+    if media_logs.is_log_section("movie", section):
+        update_user_section(username, "decrement", "media")
     return jsonify({"success": True, "message": f"Movie removed from {section}."}), 200
 
 
@@ -523,7 +436,7 @@ def get_random_movie():
     # Step 1: Get the latest movie to determine the maximum movie id
     latest_url = f"{TMDB_BASE_URL}/movie/latest"
     try:
-        latest_response = requests.get(latest_url, headers=headers)
+        latest_response = upstream.get(latest_url, headers=headers)
         latest_response.raise_for_status()
         latest_data = latest_response.json()
         max_movie_id = latest_data.get("id")
@@ -538,7 +451,7 @@ def get_random_movie():
         random_id = random.randint(1, max_movie_id)
         random_url = f"{TMDB_BASE_URL}/movie/{random_id}"
         try:
-            random_response = requests.get(random_url, headers=headers)
+            random_response = upstream.get(random_url, headers=headers)
             # If the movie is not found (e.g., deleted), re-roll
             if random_response.status_code == 404:
                 continue
@@ -569,7 +482,7 @@ def movie_suggestions():
     try:
         url = f"{TMDB_BASE_URL}/search/movie"
         headers = {"Authorization": f"Bearer {TMDB_API_KEY}"}
-        response = requests.get(url, headers=headers, params=params)
+        response = upstream.get(url, headers=headers, params=params)
         response.raise_for_status()
         data = response.json()
 
@@ -592,32 +505,40 @@ def movie_suggestions():
 
     
 
+def fetch_trending_movies():
+    """Fetch this week's trending movies from TMDB"""
+    movie = []
+    headers = {"Authorization": f"Bearer {TMDB_API_KEY}"}
+    params = {
+        "include_adult": False,
+        "language": "en-US",
+        "page": 1
+    }
+    response = upstream.get("https://api.themoviedb.org/3/trending/movie/week", headers=headers, params=params)
+    response.raise_for_status() 
+    data = response.json()
+    
+    for item in data.get("results", []):
+        movie.append({
+            "id": item.get("id"),  
+            "title": item.get("title"),
+            "overview": item.get("overview"),
+            "release_date": item.get("release_date"),
+            "vote_average": item.get("vote_average"),
+            "poster_path": f"https://image.tmdb.org/t/p/w500{item.get('poster_path')}",
+            "popularity": item.get("popularity"),
+        })
+    return movie
+
+
+trending.register("movies", fetch_trending_movies)
+
+
 @movie_bp.route('/api/trendingmovies', methods=['GET'])
 @cross_origin(origin="http://localhost:3000", headers=["Content-Type"])
 def trending_movies():
     try:
-        movie = []
-        headers = {"Authorization": f"Bearer {TMDB_API_KEY}"}
-        params = {
-            "include_adult": False,
-            "language": "en-US",
-            "page": 1
-        }
-        response = requests.get("https://api.themoviedb.org/3/trending/movie/week", headers=headers, params=params)
-        response.raise_for_status() 
-        data = response.json()
-        
-        for item in data.get("results", []):
-            movie.append({
-                "id": item.get("id"),  
-                "title": item.get("title"),
-                "overview": item.get("overview"),
-                "release_date": item.get("release_date"),
-                "vote_average": item.get("vote_average"),
-                "poster_path": f"https://image.tmdb.org/t/p/w500{item.get('poster_path')}",
-                "popularity": item.get("popularity"),
-            })
-        return jsonify({"movie": movie})
+        return jsonify({"movie": trending.get("movies")})
 
     except requests.exceptions.RequestException as e:
         return jsonify({"error": str(e)}), 500
@@ -1,12 +1,10 @@
 from flask import Blueprint, current_app, jsonify, request
 from flask_cors import cross_origin
-from bson.objectid import ObjectId
-from schemas.music_logs_schema import MusicLogsSchema 
-import requests
+from services import media_logs, upstream
+from services.cache import cached
 from datetime import datetime
 from controllers.updateUserStat import update_user_section
 
-music_logs_schema = MusicLogsSchema()  # Initialize schema
 music_bp = Blueprint("music", __name__)
 
 @music_bp.route("/api/music/search", methods=["GET"])
@@ -17,7 +15,7 @@ def search_music():
         return jsonify({"error": "Missing query parameter"}), 400
 
     deezer_url = f"https://api.deezer.com/search?q={query}"
-    response = requests.get(deezer_url)
+    response = upstream.get(deezer_url)
 
     if response.status_code != 200:
         return jsonify({"error": "Failed to fetch from Deezer"}), 500
@@ -27,14 +25,31 @@ def search_music():
 
 @music_bp.route("/api/music/track/<track_id>", methods=["GET"])
 @cross_origin()
+@cached("track_details", ttl=7 * 24 * 60 * 60)
 def get_track_by_id(track_id):
     deezer_url = f"https://api.deezer.com/track/{track_id}"
-    response = requests.get(deezer_url)
+    response = upstream.get(deezer_url)
 
     if response.status_code != 200:
         return jsonify({"error": "Failed to fetch track data"}), 500
 
-    return jsonify(response.json())
+    track = response.json()
+    if "album" in track:
+        # Deezer tracks carry no genres; their album does. The client sends
+        # them back when logging the track.
+        track["genres"] = album_genres(track["album"].get("id"))
+    return jsonify(track)
+
+
+def album_genres(album_id):
+    """Genre names of a Deezer album, or [] if they can't be fetched"""
+    try:
+        response = upstream.get(f"https://api.deezer.com/album/{album_id}")
+        response.raise_for_status()
+        return [genre["name"] for genre in response.json().get("genres", {}).get("data", [])]
+    except Exception as e:
+        print(f"❌ Could not fetch genres of album {album_id}: {e}")
+        return []
 
 @music_bp.route("/api/music/log/<track_id>", methods=["POST"])
 @cross_origin()
@@ -48,56 +63,35 @@ def handle_log_music(track_id):
     artist = data.get("artist")
 
     users_col = current_app.config["collections"].get("users")
-    music_logs_col = current_app.config["collections"].get("musicLogs")
-
-    if users_col is None or music_logs_col is None:
+    if users_col is None:
         return jsonify({"error": "Database not connected"}), 500
 
-    user = users_col.find_one({"username": username})
+    user = users_col.find_one({"username": username}, {"_id": 1})
     if user is None:
         return jsonify({"error": "User not logged in!"}), 500
 
-    user_music_log = music_logs_col.find_one({"username": username})
-
-    if user_music_log is None:
-        info = {
-            "username": username,
-            "musicLog": [],
-            "listenLater": [],
-        }
-        music_logs_col.insert_one(info)
-        user_music_log = music_logs_col.find_one({"username": username})
-
     if listen_date:
         try:
             datetime.strptime(listen_date, "%Y-%m-%d")
         except ValueError:
             return jsonify({"error": "Invalid date format. Use YYYY-MM-DD."}), 400
 
-    for track in user_music_log.get("musicLog", []):
-        if track["trackId"] == track_id:
-            return jsonify({"error": "Track is already in Music Log."}), 400
+    if media_logs.has_entry(username, "music", "musicLog", track_id):
+        return jsonify({"error": "Track is already in Music Log."}), 400
 
     new_entry = {
-        "_id": str(ObjectId()),
         "trackId": track_id,
         "title": title,
         "artist": artist,
         "cover": cover,
         "listenDate": listen_date,
         "rating": rating,
+        "genres": media_logs.parse_list(data.get("genres")),
     }
 
-    result = music_logs_col.update_one(
-        {"username": username},
-        {"$push": {"musicLog": new_entry}},
-    )
-
-    if result.matched_count > 0:
-        update_user_section(username, "increment", "media")
-        return jsonify(new_entry), 200
-    else:
-        return jsonify({"error": "User not found or could not be updated."}), 400
+    new_entry = media_logs.add_entry(username, "music", "musicLog", new_entry)
+    update_user_section(username, "increment", "media")
+    return jsonify(new_entry), 200
 
 
 @music_bp.route("/api/music/log", methods=["GET"])
@@ -105,31 +99,14 @@ def handle_log_music(track_id):
 def get_logged_music():
     username = request.args.get("username")
     users_col = current_app.config["collections"].get("users")
-    music_logs_col = current_app.config["collections"].get("musicLogs")
-
-    if users_col is None or music_logs_col is None:
+    if users_col is None:
         return jsonify({"error": "Database not connected"}), 500
 
-    user = users_col.find_one({"username": username})
+    user = users_col.find_one({"username": username}, {"_id": 1})
     if user is None:
         return jsonify({"error": "User not logged in!"}), 500
 
-    user_music_log_item = music_logs_col.find_one({"username": username})
-
-    if user_music_log_item is None:
-        info = {
-            "username": username,
-            "musicLog": [],
-            "listenLater": [],
-        }
-        music_logs_col.insert_one(info)
-        return jsonify([])
-
-    music_log = user_music_log_item["musicLog"]
-    for entry in music_log:
-        entry["_id"] = str(entry["_id"])
-
-    return jsonify(music_log)
+    return media_logs.section_response(username, "music", "musicLog", request.args)
 
 @music_bp.route("/api/music/remove", methods=["POST"])
 @cross_origin()
@@ -140,28 +117,21 @@ def remove_music_log():
     section = data.get("section")  # e.g., "musicLog" or "listenLater"
 
     users_col = current_app.config["collections"].get("users")
-    music_logs_col = current_app.config["collections"].get("musicLogs")
-
-    if users_col is None or music_logs_col is None:
+    if users_col is None:
         return jsonify({"error": "Database not connected"}), 500
 
-    user = users_col.find_one({"username": username})
+    user = users_col.find_one({"username": username}, {"_id": 1})
     if user is None:
         return jsonify({"error": "User not found"}), 404
 
-    user_music_log = music_logs_col.find_one({"username": username})
-    if user_music_log is None:
-        return jsonify({"error": "Music log not found"}), 404
-
-    result = music_logs_col.update_one(
-        {"username": username},
-        {"$pull": {section: {"_id": str(entry)}}}
-    )
+    if not media_logs.is_valid_section("music", section):
+        return jsonify({"error": f"Unknown section '{section}'"}), 400
 
-    if result.modified_count == 0:
+    if not media_logs.remove_entry(username, "music", section, entry):
         return jsonify({"error": "Track not found or removal failed"}), 404
 
-    update_user_section(username, "decrement", "media")
+    if media_logs.is_log_section("music", section):
+        update_user_section(username, "decrement", "media")
     return jsonify({"success": True, "message": f"Track removed from {section}."}), 200
 
 @music_bp.route("/api/music/listen_later", methods=["GET"])
@@ -169,31 +139,14 @@ def remove_music_log():
 def get_listen_later():
     username = request.args.get("username")
     users_col = current_app.config["collections"].get("users")
-    music_logs_col = current_app.config["collections"].get("musicLogs")
-
-    if users_col is None or music_logs_col is None:
+    if users_col is None:
         return jsonify({"error": "Database not connected"}), 500
 
-    user = users_col.find_one({"username": username})
+    user = users_col.find_one({"username": username}, {"_id": 1})
     if user is None:
         return jsonify({"error": "User not logged in!"}), 500
 
-    user_music_log = music_logs_col.find_one({"username": username})
-
-    if user_music_log is None:
-        info = {
-            "username": username,
-            "musicLog": [],
-            "listenLater": [],
-        }
-        music_logs_col.insert_one(info)
-        return jsonify([])
-
-    listen_later = user_music_log.get("listenLater", [])
-    for entry in listen_later:
-        entry["_id"] = str(entry["_id"])
-
-    return jsonify(listen_later)
+    return media_logs.section_response(username, "music", "listenLater", request.args)
 
 @music_bp.route("/api/music/listen_later/<track_id>", methods=["POST"])
 @cross_origin()
@@ -205,49 +158,25 @@ def handle_listen_later(track_id):
     cover = data.get("cover")
 
     users_col = current_app.config["collections"].get("users")
-    music_logs_col = current_app.config["collections"].get("musicLogs")
-
-    if users_col is None or music_logs_col is None:
+    if users_col is None:
         return jsonify({"error": "Database not connected"}), 500
 
-    user = users_col.find_one({"username": username})
+    user = users_col.find_one({"username": username}, {"_id": 1})
     if user is None:
         return jsonify({"error": "User not logged in!"}), 500
 
-    user_music_log = music_logs_col.find_one({"username": username})
-
-    # Create new log doc if it doesn't exist
-    if user_music_log is None:
-        info = {
-            "username": username,
-            "musicLog": [],
-            "listenLater": [],
-        }
-        music_logs_col.insert_one(info)
-        user_music_log = music_logs_col.find_one({"username": username})
-
     # Prevent duplicates
-    for track in user_music_log.get("listenLater", []):
-        if track["trackId"] == track_id:
-            return jsonify({"error": "Track is already in Listen Later."}), 400
+    if media_logs.has_entry(username, "music", "listenLater", track_id):
+        return jsonify({"error": "Track is already in Listen Later."}), 400
 
     new_entry = {
-        "_id": str(ObjectId()),
         "trackId": track_id,
         "title": title,
         "artist": artist,
         "cover": cover,
     }
 
-    result = music_logs_col.update_one(
-        {"username": username},
-        {"$push": {"listenLater": new_entry}},
-    )
-
-    if result.matched_count > 0:
-        return jsonify(new_entry), 200
-    else:
-        return jsonify({"error": "User not found or could not be updated."}), 400
+    return jsonify(media_logs.add_entry(username, "music", "listenLater", new_entry)), 200
 
 @music_bp.route("/api/music/remove_listen_later", methods=["POST"])
 @cross_origin()
@@ -256,18 +185,10 @@ def remove_listen_later():
     username = data.get("username")
     entry_id = data.get("entry")  # _id of the track to remove
 
-    users_col = current_app.config["collections"].get("users")
-    music_logs_col = current_app.config["collections"].get("musicLogs")
-
-    if users_col is None or music_logs_col is None:
+    if current_app.config["collections"].get("logEntries") is None:
         return jsonify({"error": "Database not connected"}), 500
 
-    result = music_logs_col.update_one(
-        {"username": username},
-        {"$pull": {"listenLater": {"_id": str(entry_id)}}}
-    )
-
-    if result.modified_count == 0:
+    if not media_logs.remove_entry(username, "music", "listenLater", entry_id):
         return jsonify({"error": "Track not found or removal failed."}), 404
 
     return jsonify({"success": True, "message": "Track removed from Listen Later."}), 200
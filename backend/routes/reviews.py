@@ -1,13 +1,294 @@
 from flask import Blueprint, jsonify, make_response, request, current_app
 from flask_cors import cross_origin
 from bson.objectid import ObjectId
+from bson.errors import InvalidId
+from pymongo import ReturnDocument
+import base64
 import datetime
+import json
 from flask_jwt_extended import jwt_required, get_jwt_identity, verify_jwt_in_request
 from controllers.updateUserStat import update_user_section
+from services import feed, paged_search, references, review_summaries
+from services.cache import MemoryCache
+from services.config import Config
 
 # Define Blueprint
 reviews_bp = Blueprint("reviews", __name__)
 
+
+# Newest page of /api/reviews/recent by page size, cleared when a review is
+# created or deleted in this process
+recent_reviews_cache = MemoryCache(max_entries=16)
+
+
+def reaction_fields(current_user):
+    """
+    Aggregation expressions replacing a document's reaction arrays by their
+    counts and the current user's flags.
+    """
+    fields = {array: review_summaries.reaction_count(array) for array in ("likes", "dislikes")}
+    if current_user:
+        for flag, array in (("liked", "likes"), ("disliked", "dislikes")):
+            fields[flag] = {"$in": [current_user, {"$ifNull": [f"${array}", []]}]}
+    return fields
+
+
+def listing_stages():
+    """
+    Stages shaping reviews for listings: reaction arrays replaced by their
+    counts, and comments by comment_count (comments and replies).
+    """
+    # Reviews the review-comments migration has not reached still embed them
+    embedded = {"$ifNull": ["$comments", []]}
+    replies = {"$map": {"input": embedded, "in": {"$size": {"$ifNull": ["$$this.replies", []]}}}}
+    legacy_count = {"$add": [{"$size": embedded}, {"$sum": replies}]}
+    comment_count = {"$ifNull": ["$comment_count", legacy_count]}
+    return [
+        {"$addFields": dict(reaction_fields(None), comment_count=comment_count)},
+        {"$project": {"likes_count": 0, "dislikes_count": 0, "comments": 0}},
+    ]
+
+
+def first_page(field, limit):
+    """
+    Stage trimming an array looked up with `limit + 1` entries to `limit`,
+    recording the `<field>_next_cursor` to page on from (None on the last page).
+    """
+    return {
+        "$addFields": {
+            f"{field}_next_cursor": {
+                "$cond": [
+                    {"$gt": [{"$size": f"${field}"}, limit]},
+                    {"$arrayElemAt": [f"${field}._id", limit - 1]},
+                    None,
+                ]
+            },
+            field: {"$slice": [f"${field}", limit]},
+        }
+    }
+
+
+def comment_stages(current_user, replies=False, replies_limit=None):
+    """
+    Stages shaping matched, sorted comments for responses: string ids,
+    counts and flags, and (with `replies`) their replies, all of them or the
+    first `replies_limit` with a `replies_next_cursor`.
+    """
+    stages = []
+    if replies:
+        page = [{"$limit": replies_limit + 1}] if replies_limit else []
+        stages.append(
+            {
+                "$lookup": {
+                    "from": "comments",
+                    "localField": "_id",
+                    "foreignField": "parent_id",
+                    "pipeline": [{"$sort": {"_id": 1}}, *page] + comment_stages(current_user),
+                    "as": "replies",
+                }
+            }
+        )
+        if replies_limit:
+            stages.append(first_page("replies", replies_limit))
+    stages += [
+        {
+            "$addFields": dict(
+                reaction_fields(current_user),
+                _id={"$toString": "$_id"},
+                review_id={"$toString": "$review_id"},
+                parent_comment_id={"$toString": "$parent_id"},
+            )
+        },
+        {"$project": {"likes_count": 0, "dislikes_count": 0, "parent_id": 0}},
+    ]
+    return stages
+
+
+def review_pipeline(query, sort_order, current_user, skip=0, limit=None):
+    """
+    Reviews with counts, flags and their comments. Pages of reviews (with
+    `limit`) carry the first page of comments and replies with next cursors;
+    the legacy unpaged listing carries all of them.
+    """
+    page = [{"$skip": skip}] if skip else []
+    comments_page = []
+    if limit is not None:
+        page.append({"$limit": limit})
+        comments_page.append({"$limit": Config.COMMENTS_PAGE_SIZE + 1})
+    replies_limit = Config.REPLIES_PAGE_SIZE if limit is not None else None
+
+    stages = [
+        {"$match": query},
+        {"$sort": dict(sort_order)},
+        *page,
+        {
+            "$lookup": {
+                "from": "comments",
+                "localField": "_id",
+                "foreignField": "review_id",
+                "pipeline": [
+                    {"$match": {"parent_id": None}},
+                    {"$sort": {"_id": 1}},
+                    *comments_page,
+                ]
+                + comment_stages(current_user, replies=True, replies_limit=replies_limit),
+                "as": "comments",
+            }
+        },
+    ]
+    if limit is not None:
+        stages.append(first_page("comments", Config.COMMENTS_PAGE_SIZE))
+    return stages + [
+        {"$addFields": reaction_fields(current_user)},
+        {"$project": {"likes_count": 0, "dislikes_count": 0}},
+    ]
+
+
+def comment_page(comments_col, query, cursor, limit, current_user, replies=False,
+                 replies_limit=None):
+    """
+    One page of comments (oldest first) matching `query`.
+
+    Returns:
+        tuple: (comments, next_cursor); next_cursor is None on the last page.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    if cursor:
+        if not ObjectId.is_valid(cursor):
+            raise ValueError("Invalid cursor")
+        query = dict(query, _id={"$gt": ObjectId(cursor)})
+
+    stages = [{"$match": query}, {"$sort": {"_id": 1}}, {"$limit": limit + 1}]
+    stages += comment_stages(current_user, replies, replies_limit)
+    comments = list(comments_col.aggregate(stages))
+    next_cursor = comments[limit - 1]["_id"] if len(comments) > limit else None
+    return comments[:limit], next_cursor
+
+
+def encode_review_cursor(review):
+    payload = json.dumps([review["created_at"].isoformat(), str(review["_id"])])
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_review_cursor(cursor):
+    try:
+        created_at, review_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.datetime.fromisoformat(created_at), ObjectId(review_id)
+    except (ValueError, TypeError, InvalidId):
+        raise ValueError("Invalid cursor")
+
+
+def review_page(reviews_col, query, cursor=None, limit=None):
+    """
+    Reviews matching `query`, newest first (ties broken by _id).
+
+    Args:
+        cursor (str): `next_cursor` of the previous page.
+        limit (int): Page size, or None for every matching review.
+
+    Returns:
+        tuple: (reviews, next_cursor); next_cursor is None on the last page.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    if cursor:
+        created_at, review_id = decode_review_cursor(cursor)
+        query = {"$and": [query, {"$or": [
+            {"created_at": {"$lt": created_at}},
+            {"created_at": created_at, "_id": {"$lt": review_id}}
+        ]}]}
+
+    pipeline = [{"$match": query}, {"$sort": {"created_at": -1, "_id": -1}}]
+    if limit is not None:
+        pipeline.append({"$limit": limit + 1})
+    docs = list(reviews_col.aggregate(pipeline + listing_stages()))
+
+    next_cursor = None
+    if limit is not None and len(docs) > limit:
+        docs = docs[:limit]
+        next_cursor = encode_review_cursor(docs[-1])
+
+    for review in docs:
+        review["_id"] = str(review["_id"])
+    return docs, next_cursor
+
+
+def page_limit(default):
+    return max(1, min(request.args.get("limit", default, type=int), 100))
+
+
+def current_user_or_none():
+    """The JWT identity if the request carries a valid token"""
+    try:
+        verify_jwt_in_request(optional=True)
+        return get_jwt_identity()
+    except Exception:
+        return None
+
+
+OPPOSITE = {"likes": "dislikes", "dislikes": "likes"}
+
+
+def toggle_reaction(collection, doc_filter, current_user, array):
+    """
+    Toggle the user's like ("likes") or dislike ("dislikes") on a review or
+    comment, clearing the opposite reaction, in a single pipeline update.
+    The counters and score are recomputed from the arrays in the same write,
+    so concurrent clicks can't leave them out of step.
+
+    Returns:
+        tuple: (added, counts document), or None if the document doesn't exist.
+    """
+    other = OPPOSITE[array]
+    user = {"$literal": current_user}
+
+    def current(field):
+        return {"$ifNull": [f"${field}", []]}
+
+    def without_user(field):
+        return {"$filter": {"input": current(field), "cond": {"$ne": ["$$this", user]}}}
+
+    pipeline = [
+        {
+            "$set": {
+                array: {
+                    "$cond": [
+                        {"$in": [user, current(array)]},
+                        without_user(array),
+                        {"$concatArrays": [current(array), [user]]},
+                    ]
+                },
+                other: without_user(other),
+            }
+        },
+        {
+            "$set": {
+                "likes_count": {"$size": "$likes"},
+                "dislikes_count": {"$size": "$dislikes"},
+                "score": {"$subtract": [{"$size": "$likes"}, {"$size": "$dislikes"}]},
+            }
+        },
+    ]
+    counts = collection.find_one_and_update(
+        doc_filter,
+        pipeline,
+        # The user's element of the toggled array tells whether it was added
+        projection={
+            "_id": 0,
+            "likes_count": 1,
+            "dislikes_count": 1,
+            array: {"$elemMatch": {"$eq": current_user}},
+        },
+        return_document=ReturnDocument.AFTER,
+    )
+    if counts is None:
+        return None
+    return bool(counts.pop(array, None)), counts
+
+
 @reviews_bp.route("/api/reviews", methods=["OPTIONS"])
 @cross_origin(origins="http://localhost:3000", methods=["POST", "OPTIONS"], allow_headers=["Content-Type", "Authorization"])
 def reviews_options():
@@ -27,10 +308,12 @@ def create_review():
             print("❌ Invalid request. Required fields missing.\n")
             return jsonify({"error": "Required fields missing"}), 400
         
+        media_id = review_summaries.canonical_media_id(data.get("media_id"))
+        
         # Check if user already reviewed this media
         existing_review = reviews_col.find_one({
             "user_id": current_user,
-            "media_id": data.get("media_id"),
+            "media_id": media_id,
             "media_type": data.get("media_type")
         })
         
@@ -41,7 +324,7 @@ def create_review():
         # Create review object with likes/dislikes arrays
         new_review = {
             "user_id": current_user,
-            "media_id": data.get("media_id"),
+            "media_id": media_id,
             "media_type": data.get("media_type"),
             "media_title": data.get("media_title", "Unknown Title"),
             "title": data.get("title"),
@@ -49,16 +332,23 @@ def create_review():
             "rating": data.get("rating"),
             "created_at": datetime.datetime.utcnow(),
             "updated_at": datetime.datetime.utcnow(),
-            "comments": [],
+            "comment_count": 0,
             "likes": [],
-            "dislikes": []
+            "dislikes": [],
+            "likes_count": 0,
+            "dislikes_count": 0,
+            "score": 0
         }
         
         # Insert into database
         result = reviews_col.insert_one(new_review)
         new_review["_id"] = str(result.inserted_id)
+        new_review["comments"] = []
         
         update_user_section(current_user, "increment", "reviews")
+        review_summaries.apply_review(new_review, 1)
+        recent_reviews_cache.clear()
+        feed.record_review(new_review)
         print(f"✅ Review created by {current_user} for {data.get('media_type')} {data.get('media_id')}.\n")
         return jsonify(new_review), 201
     
@@ -74,129 +364,72 @@ def get_reviews(media_type, media_id):
     sort_by = request.args.get("sort", "recent")
     
     # Get the current user if authenticated
-    current_user = None
-    try:
-        verify_jwt_in_request(optional=True)
-        current_user = get_jwt_identity()
-    except:
-        pass
+    current_user = current_user_or_none()
     
     try:
-        media_id_int = None
-        try:
-            media_id_int = int(media_id)
-        except ValueError:
-            pass
-        
-        # Build query
-        query = {
-            "media_type": media_type,
-        }
-        
-        if media_id_int is not None:
-            query["$or"] = [
-                {"media_id": media_id},
-                {"media_id": media_id_int}
-            ]
-        else:
-            query["media_id"] = media_id
-        
+        query = review_summaries.media_query(media_type, media_id)
         print(f"Executing MongoDB query: {query}")
         
-        if sort_by == "recent":
-            sort_order = [("created_at", -1)]
-        elif sort_by == "highest":
+        if sort_by == "highest":
             sort_order = [("rating", -1), ("created_at", -1)]
         elif sort_by == "lowest":
             sort_order = [("rating", 1), ("created_at", -1)]
         elif sort_by == "popular":
-            # Use aggregation for popular sorting
-            pipeline = [
-                {"$match": query},
-                {"$addFields": {
-                    "likes_count": {"$size": {"$ifNull": ["$likes", []]}},
-                    "dislikes_count": {"$size": {"$ifNull": ["$dislikes", []]}},
-                }},
-                {"$addFields": {
-                    "popularity_score": {"$subtract": ["$likes_count", "$dislikes_count"]}
-                }},
-                {"$sort": {"popularity_score": -1, "created_at": -1}}
-            ]
-            
-            reviews = []
-            for review in reviews_col.aggregate(pipeline):
-                review["_id"] = str(review["_id"])
-                review["likes"] = len(review.get("likes", []))
-                review["dislikes"] = len(review.get("dislikes", []))
-                
-                # Add flags for if current user has liked/disliked
-                if current_user:
-                    review["liked"] = current_user in review.get("likes", [])
-                    review["disliked"] = current_user in review.get("dislikes", [])
-                
-                # Process comments
-                if "comments" in review:
-                    for comment in review["comments"]:
-                        comment["likes"] = len(comment.get("likes", []))
-                        comment["dislikes"] = len(comment.get("dislikes", []))
-                        if current_user:
-                            comment["liked"] = current_user in comment.get("likes", [])
-                            comment["disliked"] = current_user in comment.get("dislikes", [])
-                        
-                        # Process replies
-                        if "replies" in comment:
-                            for reply in comment["replies"]:
-                                reply["likes"] = len(reply.get("likes", []))
-                                reply["dislikes"] = len(reply.get("dislikes", []))
-                                if current_user:
-                                    reply["liked"] = current_user in reply.get("likes", [])
-                                    reply["disliked"] = current_user in reply.get("dislikes", [])
-                
-                reviews.append(review)
-            
-            print(f"✅ Retrieved {len(reviews)} reviews for {media_type} {media_id}.\n")
-            return jsonify(reviews), 200
+            # Uses the maintained score (likes - dislikes)
+            sort_order = [("score", -1), ("created_at", -1)]
         else:
             sort_order = [("created_at", -1)]
         
+        # Without paging parameters the whole list is returned, as before
+        paged = "limit" in request.args or "cursor" in request.args
+        skip, limit = 0, None
+        if paged:
+            try:
+                skip = paged_search.decode_cursor(request.args.get("cursor"))
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+            limit = request.args.get("limit", Config.REVIEWS_PAGE_SIZE, type=int)
+            limit = max(1, min(limit, 100))
+        
         reviews = []
-        for review in reviews_col.find(query).sort(sort_order):
+        pipeline = review_pipeline(
+            query, sort_order, current_user, skip, limit + 1 if paged else None
+        )
+        for review in reviews_col.aggregate(pipeline):
             review["_id"] = str(review["_id"])
-            review["likes"] = len(review.get("likes", []))
-            review["dislikes"] = len(review.get("dislikes", []))
-            
-            # Add flags for if current user has liked/disliked
-            if current_user:
-                review["liked"] = current_user in review.get("likes", [])
-                review["disliked"] = current_user in review.get("dislikes", [])
-            
-            # Process comments
-            if "comments" in review:
-                for comment in review["comments"]:
-                    comment["likes"] = len(comment.get("likes", []))
-                    comment["dislikes"] = len(comment.get("dislikes", []))
-                    if current_user:
-                        comment["liked"] = current_user in comment.get("likes", [])
-                        comment["disliked"] = current_user in comment.get("dislikes", [])
-                    
-                    # Process replies
-                    if "replies" in comment:
-                        for reply in comment["replies"]:
-                            reply["likes"] = len(reply.get("likes", []))
-                            reply["dislikes"] = len(reply.get("dislikes", []))
-                            if current_user:
-                                reply["liked"] = current_user in reply.get("likes", [])
-                                reply["disliked"] = current_user in reply.get("dislikes", [])
-            
             reviews.append(review)
         
         print(f"✅ Retrieved {len(reviews)} reviews for {media_type} {media_id}.\n")
-        return jsonify(reviews), 200
+        if not paged:
+            return jsonify(reviews), 200
+        
+        next_cursor = paged_search.encode_cursor(skip + limit) if len(reviews) > limit else None
+        return jsonify({
+            "reviews": reviews[:limit],
+            "next_cursor": next_cursor,
+            # Every review of the item, rated or not (the summary only counts ratings)
+            "total": reviews_col.count_documents(query)
+        }), 200
     
     except Exception as e:
         print(f"❌ Error getting reviews: {e}\n")
         return jsonify({"error": str(e)}), 500
 
+@reviews_bp.route("/api/reviews/<media_type>/<media_id>/summary", methods=["GET"])
+def get_review_summary(media_type, media_id):
+    """
+    Review count, average rating, rating histogram and top reviews of one
+    media item. Pass `refresh=true` to rebuild it from the reviews.
+    """
+    print(f"\n📤 GET /api/reviews/{media_type}/{media_id}/summary requested")
+    
+    refresh = request.args.get("refresh", "").lower() in ("1", "true")
+    try:
+        return jsonify(review_summaries.get(media_type, media_id, refresh=refresh)), 200
+    except Exception as e:
+        print(f"❌ Error getting review summary: {e}\n")
+        return jsonify({"error": str(e)}), 500
+
 @reviews_bp.route("/api/reviews/<id>/like", methods=["POST"])
 def like_review(id):
     print(f"\n👍 POST /api/reviews/{id}/like requested")
@@ -206,50 +439,16 @@ def like_review(id):
     reviews_col = current_app.config["collections"].get("reviews")
     
     try:
-        review = reviews_col.find_one({"_id": ObjectId(id)})
-        if not review:
+        result = toggle_reaction(reviews_col, {"_id": ObjectId(id)}, current_user, "likes")
+        if result is None:
             return jsonify({"error": "Review not found"}), 404
-        
-        # Initialize likes/dislikes arrays if they don't exist
-        if "likes" not in review:
-            review["likes"] = []
-        if "dislikes" not in review:
-            review["dislikes"] = []
-        
-        # If already liked, unlike
-        if current_user in review["likes"]:
-            reviews_col.update_one(
-                {"_id": ObjectId(id)},
-                {"$pull": {"likes": current_user}}
-            )
-            return jsonify({
-                "status": "unliked",
-                "likes": len(review["likes"]) - 1,
-                "dislikes": len(review["dislikes"]),
-                "liked": False,
-                "disliked": current_user in review["dislikes"]
-            }), 200
-        
-        # If disliked, remove dislike and add like
-        if current_user in review["dislikes"]:
-            reviews_col.update_one(
-                {"_id": ObjectId(id)},
-                {"$pull": {"dislikes": current_user}}
-            )
-        
-        # Add like
-        reviews_col.update_one(
-            {"_id": ObjectId(id)},
-            {"$addToSet": {"likes": current_user}}
-        )
-        
-        # Return updated counts
-        updated_review = reviews_col.find_one({"_id": ObjectId(id)})
+
+        added, counts = result
         return jsonify({
-            "status": "liked",
-            "likes": len(updated_review.get("likes", [])),
-            "dislikes": len(updated_review.get("dislikes", [])),
-            "liked": True,
+            "status": "liked" if added else "unliked",
+            "likes": counts.get("likes_count", 0),
+            "dislikes": counts.get("dislikes_count", 0),
+            "liked": added,
             "disliked": False
         }), 200
         
@@ -266,51 +465,17 @@ def dislike_review(id):
     reviews_col = current_app.config["collections"].get("reviews")
     
     try:
-        review = reviews_col.find_one({"_id": ObjectId(id)})
-        if not review:
+        result = toggle_reaction(reviews_col, {"_id": ObjectId(id)}, current_user, "dislikes")
+        if result is None:
             return jsonify({"error": "Review not found"}), 404
-        
-        # Initialize likes/dislikes arrays if they don't exist
-        if "likes" not in review:
-            review["likes"] = []
-        if "dislikes" not in review:
-            review["dislikes"] = []
-        
-        # If already disliked, undislike
-        if current_user in review["dislikes"]:
-            reviews_col.update_one(
-                {"_id": ObjectId(id)},
-                {"$pull": {"dislikes": current_user}}
-            )
-            return jsonify({
-                "status": "undisliked",
-                "likes": len(review["likes"]),
-                "dislikes": len(review["dislikes"]) - 1,
-                "liked": current_user in review["likes"],
-                "disliked": False
-            }), 200
-        
-        # If liked, remove like and add dislike
-        if current_user in review["likes"]:
-            reviews_col.update_one(
-                {"_id": ObjectId(id)},
-                {"$pull": {"likes": current_user}}
-            )
-        
-        # Add dislike
-        reviews_col.update_one(
-            {"_id": ObjectId(id)},
-            {"$addToSet": {"dislikes": current_user}}
-        )
-        
-        # Return updated counts
-        updated_review = reviews_col.find_one({"_id": ObjectId(id)})
+
+        added, counts = result
         return jsonify({
-            "status": "disliked",
-            "likes": len(updated_review.get("likes", [])),
-            "dislikes": len(updated_review.get("dislikes", [])),
+            "status": "disliked" if added else "undisliked",
+            "likes": counts.get("likes_count", 0),
+            "dislikes": counts.get("dislikes_count", 0),
             "liked": False,
-            "disliked": True
+            "disliked": added
         }), 200
         
     except Exception as e:
@@ -366,22 +531,33 @@ def get_bookmarked_reviews():
     users_col = current_app.config["collections"].get("users")
     reviews_col = current_app.config["collections"].get("reviews")
     
+    cursor = request.args.get("cursor")
+    limit = request.args.get("limit", type=int)
+
     try:
-        user = users_col.find_one({"username": current_user})
-        if not user or "bookmarked_reviews" not in user:
-            return jsonify([]), 200
-        
-        bookmarked_reviews = []
-        for review_id in user["bookmarked_reviews"]:
-            review = reviews_col.find_one({"_id": ObjectId(review_id)})
-            if review:
-                review["_id"] = str(review["_id"])
-                review["likes"] = len(review.get("likes", []))
-                review["dislikes"] = len(review.get("dislikes", []))
-                bookmarked_reviews.append(review)
-        
-        return jsonify(bookmarked_reviews), 200
-        
+        user = users_col.find_one({"username": current_user}, {"bookmarked_reviews": 1})
+        review_ids = (user or {}).get("bookmarked_reviews", [])
+        # $in queries for the page, reaction arrays replaced by their counts
+        bookmarked_reviews, missing, next_cursor = references.fetch_page(
+            reviews_col, review_ids, cursor, limit, pipeline=listing_stages()
+        )
+        references.prune(users_col, current_user, "bookmarked_reviews", missing)
+
+        for review in bookmarked_reviews:
+            review["_id"] = str(review["_id"])
+
+        if limit is None and cursor is None:
+            return jsonify(bookmarked_reviews), 200
+        return jsonify(
+            {
+                "reviews": bookmarked_reviews,
+                "next_cursor": next_cursor,
+                "total": references.count_existing(reviews_col, review_ids),
+            }
+        ), 200
+
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         print(f"❌ Error getting bookmarked reviews: {e}\n")
         return jsonify({"error": str(e)}), 500
@@ -393,6 +569,7 @@ def add_comment(id):
     current_user = get_jwt_identity()
     
     reviews_col = current_app.config["collections"].get("reviews")
+    comments_col = current_app.config["collections"].get("comments")
     
     try:
         data = request.json
@@ -400,43 +577,54 @@ def add_comment(id):
             print("❌ Invalid request. Comment content is required.\n")
             return jsonify({"error": "Comment content is required"}), 400
         
-        comment_id = str(ObjectId())  # Generate a new ObjectId for the comment
+        parent_comment_id = data.get("parent_comment_id", None)
+        parent_id = None
+        
+        # If this is a reply, it must answer a top-level comment of this review
+        if parent_comment_id:
+            parent = None
+            if ObjectId.is_valid(parent_comment_id):
+                parent = comments_col.find_one(
+                    {"_id": ObjectId(parent_comment_id), "review_id": ObjectId(id), "parent_id": None},
+                    {"_id": 1}
+                )
+            if parent is None:
+                print(f"❌ Review or parent comment not found.\n")
+                return jsonify({"error": "Review or parent comment not found"}), 404
+            parent_id = parent["_id"]
+        
+        result = reviews_col.update_one({"_id": ObjectId(id)}, {"$inc": {"comment_count": 1}})
+        if result.matched_count == 0:
+            print(f"❌ Review or parent comment not found.\n")
+            return jsonify({"error": "Review or parent comment not found"}), 404
         
         comment = {
-            "_id": comment_id,  # Add this field
+            "review_id": ObjectId(id),
+            "parent_id": parent_id,
             "user_id": current_user,
             "content": data.get("content"),
             "created_at": datetime.datetime.utcnow(),
             "likes": [],
             "dislikes": [],
-            "replies": [],
-            "parent_comment_id": data.get("parent_comment_id", None)
+            "likes_count": 0,
+            "dislikes_count": 0,
+            "score": 0,
+            "reply_count": 0
         }
-        
-        # If this is a reply to another comment
-        if comment["parent_comment_id"]:
-            # Find the parent comment and add this reply to its replies array
-            result = reviews_col.update_one(
-                {
-                    "_id": ObjectId(id),
-                    "comments._id": comment["parent_comment_id"]
-                },
-                {
-                    "$push": {
-                        "comments.$.replies": comment
-                    }
-                }
-            )
-        else:
-            # This is a top-level comment
-            result = reviews_col.update_one(
-                {"_id": ObjectId(id)},
-                {"$push": {"comments": comment}}
-            )
-        
-        if result.modified_count == 0:
-            print(f"❌ Review or parent comment not found.\n")
-            return jsonify({"error": "Review or parent comment not found"}), 404
+        comments_col.insert_one(comment)
+        if parent_id is not None:
+            comments_col.update_one({"_id": parent_id}, {"$inc": {"reply_count": 1}})
+        
+        comment.update({
+            "_id": str(comment["_id"]),
+            "review_id": id,
+            "parent_comment_id": parent_comment_id,
+            "replies": [],
+            "likes": 0,
+            "dislikes": 0
+        })
+        for field in ("parent_id", "likes_count", "dislikes_count"):
+            comment.pop(field)
         
         print(f"✅ Comment added to review {id} by user {current_user}.\n")
         return jsonify({"success": True, "comment": comment}), 200
@@ -445,81 +633,86 @@ def add_comment(id):
         print(f"❌ Error adding comment: {e}\n")
         return jsonify({"error": str(e)}), 500
 
-@reviews_bp.route("/api/reviews/<review_id>/comment/<comment_id>/like", methods=["POST"])
-def like_comment(review_id, comment_id):
-    print(f"\n👍 POST /api/reviews/{review_id}/comment/{comment_id}/like requested")
+@reviews_bp.route("/api/reviews/<id>/comments", methods=["GET"])
+def get_comments(id):
+    """Top-level comments of a review, oldest first, each with its first replies"""
+    print(f"\n📤 GET /api/reviews/{id}/comments requested")
+    comments_col = current_app.config["collections"].get("comments")
+    limit = request.args.get("limit", Config.COMMENTS_PAGE_SIZE, type=int)
+    
+    try:
+        comments, next_cursor = comment_page(
+            comments_col,
+            {"review_id": ObjectId(id), "parent_id": None},
+            request.args.get("cursor"),
+            max(1, min(limit, 100)),
+            current_user_or_none(),
+            replies=True,
+            replies_limit=Config.REPLIES_PAGE_SIZE
+        )
+        return jsonify({"comments": comments, "next_cursor": next_cursor}), 200
+    
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        print(f"❌ Error getting comments: {e}\n")
+        return jsonify({"error": str(e)}), 500
+
+@reviews_bp.route("/api/reviews/<review_id>/comment/<comment_id>/replies", methods=["GET"])
+def get_replies(review_id, comment_id):
+    """Replies to one comment, oldest first"""
+    print(f"\n📤 GET /api/reviews/{review_id}/comment/{comment_id}/replies requested")
+    comments_col = current_app.config["collections"].get("comments")
+    limit = request.args.get("limit", Config.REPLIES_PAGE_SIZE, type=int)
+    
+    try:
+        replies, next_cursor = comment_page(
+            comments_col,
+            {"review_id": ObjectId(review_id), "parent_id": ObjectId(comment_id)},
+            request.args.get("cursor"),
+            max(1, min(limit, 100)),
+            current_user_or_none()
+        )
+        return jsonify({"replies": replies, "next_cursor": next_cursor}), 200
+    
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        print(f"❌ Error getting replies: {e}\n")
+        return jsonify({"error": str(e)}), 500
+
+def toggle_comment_reaction(review_id, comment_id, array, verb, undo):
+    """Shared body of the comment/reply like and dislike routes"""
     verify_jwt_in_request()
     current_user = get_jwt_identity()
     
-    reviews_col = current_app.config["collections"].get("reviews")
+    comments_col = current_app.config["collections"].get("comments")
+    
+    if not ObjectId.is_valid(review_id) or not ObjectId.is_valid(comment_id):
+        return jsonify({"error": "Comment not found"}), 404
+    
+    # Comments and replies live in the same collection, addressed by _id
+    result = toggle_reaction(
+        comments_col,
+        {"_id": ObjectId(comment_id), "review_id": ObjectId(review_id)},
+        current_user,
+        array
+    )
+    if result is None:
+        return jsonify({"error": "Comment not found"}), 404
     
+    added, counts = result
+    return jsonify({
+        "status": verb if added else undo,
+        "likes": counts.get("likes_count", 0),
+        "dislikes": counts.get("dislikes_count", 0)
+    }), 200
+
+@reviews_bp.route("/api/reviews/<review_id>/comment/<comment_id>/like", methods=["POST"])
+def like_comment(review_id, comment_id):
+    print(f"\n👍 POST /api/reviews/{review_id}/comment/{comment_id}/like requested")
     try:
-        # Find the comment and update its likes
-        review = reviews_col.find_one({"_id": ObjectId(review_id)})
-        if not review:
-            return jsonify({"error": "Review not found"}), 404
-        
-        # First check if it's a direct comment
-        comment_found = False
-        for comment in review.get("comments", []):
-            if comment["_id"] == comment_id:
-                comment_found = True
-                if current_user in comment.get("likes", []):
-                    # Unlike
-                    reviews_col.update_one(
-                        {"_id": ObjectId(review_id), "comments._id": comment_id},
-                        {"$pull": {"comments.$.likes": current_user}}
-                    )
-                    status = "unliked"
-                else:
-                    # Like (and remove dislike if exists)
-                    reviews_col.update_one(
-                        {"_id": ObjectId(review_id), "comments._id": comment_id},
-                        {"$pull": {"comments.$.dislikes": current_user}}
-                    )
-                    reviews_col.update_one(
-                        {"_id": ObjectId(review_id), "comments._id": comment_id},
-                        {"$addToSet": {"comments.$.likes": current_user}}
-                    )
-                    status = "liked"
-                break
-        
-        # If not found, check if it's a reply
-        if not comment_found:
-            for comment in review.get("comments", []):
-                for reply in comment.get("replies", []):
-                    if reply["_id"] == comment_id:
-                        comment_found = True
-                        if current_user in reply.get("likes", []):
-                            # Unlike
-                            reviews_col.update_one(
-                                {"_id": ObjectId(review_id), "comments.replies._id": comment_id},
-                                {"$pull": {"comments.$[].replies.$[reply].likes": current_user}},
-                                array_filters=[{"reply._id": comment_id}]
-                            )
-                            status = "unliked"
-                        else:
-                            # Like (and remove dislike if exists)
-                            reviews_col.update_one(
-                                {"_id": ObjectId(review_id), "comments.replies._id": comment_id},
-                                {"$pull": {"comments.$[].replies.$[reply].dislikes": current_user}},
-                                array_filters=[{"reply._id": comment_id}]
-                            )
-                            reviews_col.update_one(
-                                {"_id": ObjectId(review_id), "comments.replies._id": comment_id},
-                                {"$addToSet": {"comments.$[].replies.$[reply].likes": current_user}},
-                                array_filters=[{"reply._id": comment_id}]
-                            )
-                            status = "liked"
-                        break
-                if comment_found:
-                    break
-        
-        if not comment_found:
-            return jsonify({"error": "Comment not found"}), 404
-        
-        return jsonify({"status": status}), 200
-        
+        return toggle_comment_reaction(review_id, comment_id, "likes", "liked", "unliked")
     except Exception as e:
         print(f"❌ Error liking comment: {e}\n")
         return jsonify({"error": str(e)}), 500
@@ -527,78 +720,8 @@ def like_comment(review_id, comment_id):
 @reviews_bp.route("/api/reviews/<review_id>/comment/<comment_id>/dislike", methods=["POST"])
 def dislike_comment(review_id, comment_id):
     print(f"\n👎 POST /api/reviews/{review_id}/comment/{comment_id}/dislike requested")
-    verify_jwt_in_request()
-    current_user = get_jwt_identity()
-    
-    reviews_col = current_app.config["collections"].get("reviews")
-    
     try:
-        # Similar logic to like_comment but for dislikes
-        review = reviews_col.find_one({"_id": ObjectId(review_id)})
-        if not review:
-            return jsonify({"error": "Review not found"}), 404
-        
-        # First check if it's a direct comment
-        comment_found = False
-        for comment in review.get("comments", []):
-            if comment["_id"] == comment_id:
-                comment_found = True
-                if current_user in comment.get("dislikes", []):
-                    # Undislike
-                    reviews_col.update_one(
-                        {"_id": ObjectId(review_id), "comments._id": comment_id},
-                        {"$pull": {"comments.$.dislikes": current_user}}
-                    )
-                    status = "undisliked"
-                else:
-                    # Dislike (and remove like if exists)
-                    reviews_col.update_one(
-                        {"_id": ObjectId(review_id), "comments._id": comment_id},
-                        {"$pull": {"comments.$.likes": current_user}}
-                    )
-                    reviews_col.update_one(
-                        {"_id": ObjectId(review_id), "comments._id": comment_id},
-                        {"$addToSet": {"comments.$.dislikes": current_user}}
-                    )
-                    status = "disliked"
-                break
-        
-        # If not found, check if it's a reply
-        if not comment_found:
-            for comment in review.get("comments", []):
-                for reply in comment.get("replies", []):
-                    if reply["_id"] == comment_id:
-                        comment_found = True
-                        if current_user in reply.get("dislikes", []):
-                            # Undislike
-                            reviews_col.update_one(
-                                {"_id": ObjectId(review_id), "comments.replies._id": comment_id},
-                                {"$pull": {"comments.$[].replies.$[reply].dislikes": current_user}},
-                                array_filters=[{"reply._id": comment_id}]
-                            )
-                            status = "undisliked"
-                        else:
-                            # Dislike (and remove like if exists)
-                            reviews_col.update_one(
-                                {"_id": ObjectId(review_id), "comments.replies._id": comment_id},
-                                {"$pull": {"comments.$[].replies.$[reply].likes": current_user}},
-                                array_filters=[{"reply._id": comment_id}]
-                            )
-                            reviews_col.update_one(
-                                {"_id": ObjectId(review_id), "comments.replies._id": comment_id},
-                                {"$addToSet": {"comments.$[].replies.$[reply].dislikes": current_user}},
-                                array_filters=[{"reply._id": comment_id}]
-                            )
-                            status = "disliked"
-                        break
-                if comment_found:
-                    break
-        
-        if not comment_found:
-            return jsonify({"error": "Comment not found"}), 404
-        
-        return jsonify({"status": status}), 200
-        
+        return toggle_comment_reaction(review_id, comment_id, "dislikes", "disliked", "undisliked")
     except Exception as e:
         print(f"❌ Error disliking comment: {e}\n")
         return jsonify({"error": str(e)}), 500
@@ -610,16 +733,20 @@ def get_user_reviews(username):
     reviews_col = current_app.config["collections"].get("reviews")
     
     try:
-        reviews = []
-        for review in reviews_col.find({"user_id": username}).sort("created_at", -1):
-            review["_id"] = str(review["_id"])
-            review["likes"] = len(review.get("likes", []))
-            review["dislikes"] = len(review.get("dislikes", []))
-            reviews.append(review)
+        # Without paging parameters every review is returned, as before
+        paged = "limit" in request.args or "cursor" in request.args
+        limit = page_limit(Config.REVIEWS_PAGE_SIZE) if paged else None
+        reviews, next_cursor = review_page(
+            reviews_col, {"user_id": username}, request.args.get("cursor"), limit
+        )
         
         print(f"✅ Retrieved {len(reviews)} reviews by user {username}.\n")
-        return jsonify(reviews), 200
+        if not paged:
+            return jsonify(reviews), 200
+        return jsonify({"reviews": reviews, "next_cursor": next_cursor}), 200
     
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         print(f"❌ Error getting user reviews: {e}\n")
         return jsonify({"error": str(e)}), 500
@@ -631,17 +758,25 @@ def get_recent_reviews():
     reviews_col = current_app.config["collections"].get("reviews")
     
     try:
-        # Get most recent reviews across all media
-        reviews = []
-        for review in reviews_col.find().sort("created_at", -1).limit(20):
-            review["_id"] = str(review["_id"])
-            review["likes"] = len(review.get("likes", []))
-            review["dislikes"] = len(review.get("dislikes", []))
-            reviews.append(review)
-        
-        print(f"✅ Retrieved {len(reviews)} recent reviews.\n")
-        return jsonify(reviews), 200
+        # Without paging parameters the 20 newest reviews are returned, as before
+        paged = "limit" in request.args or "cursor" in request.args
+        limit = page_limit(20)
+        cursor = request.args.get("cursor")
+        
+        page = None if cursor else recent_reviews_cache.get(limit)
+        if page is None:
+            reviews, next_cursor = review_page(reviews_col, {}, cursor, limit)
+            page = {"reviews": reviews, "next_cursor": next_cursor}
+            if not cursor:
+                recent_reviews_cache.set(limit, page, Config.RECENT_REVIEWS_CACHE_TTL)
+        
+        print(f"✅ Retrieved {len(page['reviews'])} recent reviews.\n")
+        if not paged:
+            return jsonify(page["reviews"]), 200
+        return jsonify(page), 200
     
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         print(f"❌ Error getting recent reviews: {e}\n")
         return jsonify({"error": str(e)}), 500
@@ -672,8 +807,14 @@ def delete_review(id):
         if result.deleted_count == 0:
             print(f"❌ Failed to delete review {id}.\n")
             return jsonify({"error": "Failed to delete review"}), 500
+        
+        comments_col = current_app.config["collections"].get("comments")
+        comments_col.delete_many({"review_id": ObjectId(id)})
             
         update_user_section(current_user, "decrement", "reviews")
+        review_summaries.apply_review(review, -1)
+        recent_reviews_cache.clear()
+        feed.retract(id)
         print(f"✅ Review {id} deleted successfully by user {current_user}.\n")
         return jsonify({"message": "Review deleted successfully"}), 200
         
@@ -3,10 +3,10 @@ from pymongo import errors
 from dotenv import load_dotenv
 from flask import Blueprint, current_app, jsonify, make_response, request
 from flask_cors import cross_origin
-from bson.objectid import ObjectId
 import requests
+from services import media_logs, paged_search, trending, upstream
+from services.cache import cached
 import os
-from schemas.tv_logs_schema import TVLogsSchema
 from datetime import datetime
 from controllers.updateUserStat import update_user_section
 
@@ -17,7 +17,6 @@ TMDB_API_KEY = os.getenv("TMDB_API_KEY")
 TV_SEARCH_URL = "https://api.themoviedb.org/3/search/tv"
 TRENDING_SEARCH_URL = "https://api.themoviedb.org/3/search/tv"
 TMDB_IMAGE_BASE_URL = "https://image.tmdb.org/t/p/w500"
-tv_logs_schema = TVLogsSchema()
 
 genre_id_to_name = {
     10759: "Action & Adventure",
@@ -38,6 +37,31 @@ genre_id_to_name = {
     37: "Western"
 }
 
+def show_matches_filters(show, year_start, year_end, rating_min, rating_max, genre):
+    """Check a formatted show against the advanced search filters"""
+    # Apply year range filter
+    if year_start or year_end:
+        show_year = int(show["first_air_date"][:4]) if show["first_air_date"] else None
+        if not show_year:
+            return False
+        if year_start and show_year < year_start:
+            return False  # Skip this show if it doesn't match the year range
+        if year_end and show_year > year_end:
+            return False  # Skip this show if it doesn't match the year range
+
+    # Apply rating filter
+    if rating_min and show["vote_average"] < rating_min:
+        return False  # Skip this show if it doesn't meet the rating threshold
+    if rating_max and show["vote_average"] > rating_max:
+        return False  # Skip this show if it doesn't meet the rating threshold
+
+    # Apply genre filter (Check if all genres in the filter are in the show's genres)
+    if genre and not all(g in show["genres"] for g in genre):
+        return False  # Skip this show if it doesn't match all genres
+
+    return True
+
+
 @tv_bp.route("/api/tv/search", methods=['GET'])
 @cross_origin(origin="http://localhost:3000", headers=["Content-Type"])
 def search_tv():
@@ -48,6 +72,8 @@ def search_tv():
     rating_max = request.args.get("ratingMax", type=float)
     genre = request.args.get("genre", "")
     genre = genre.split(",") if genre else ""
+    cursor = request.args.get("cursor")
+    limit = request.args.get("limit", type=int)
     
     print(request.args)
     
@@ -55,159 +81,143 @@ def search_tv():
         return jsonify({"error": "Query parameter is required"}), 400
     
     try:
-        tv = []
-        for page in range(1,30):
-            headers = {"Authorization": f"Bearer {TMDB_API_KEY}"}
-            params = {
-                "query": query,
-                "include_adult": False,
-                "language": "en-US",
-                "page": page
+        headers = {"Authorization": f"Bearer {TMDB_API_KEY}"}
+        params = {
+            "query": query,
+            "include_adult": False,
+            "language": "en-US",
+        }
+
+        def to_show(item):
+            show = {
+                "id": item.get("id"),  
+                "title": item.get("name"),
+                "poster_path": f"https://image.tmdb.org/t/p/w500{item.get('poster_path')}" if item.get("poster_path") else None, 
+                "first_air_date": item.get("first_air_date"),
+                "vote_average": item.get("vote_average"),
+                "genre_ids": item.get("genre_ids", []),  # Genre IDs from TMDB
+                # Map genre IDs to names
+                "genres": [
+                    genre_id_to_name.get(genre_id, "Unknown")
+                    for genre_id in item.get("genre_ids", [])
+                ],
             }
-            response = requests.get(TV_SEARCH_URL, headers=headers, params=params)
-            response.raise_for_status() 
-            data = response.json()
-        
-            for item in data.get("results", []):
-                tv.append({
-                    "id": item.get("id"),  
-                    "title": item.get("name"),
-                    "poster_path": f"https://image.tmdb.org/t/p/w500{item.get('poster_path')}" if item.get("poster_path") else None, 
-                    "first_air_date": item.get("first_air_date"),
-                    "vote_average": item.get("vote_average"),
-                    "genre_ids": item.get("genre_ids", []),  # Genre IDs from TMDB
-                    # Map genre IDs to names
-                    "genres": [
-                        genre_id_to_name.get(genre_id, "Unknown")
-                        for genre_id in item.get("genre_ids", [])
-                    ],
-                    })
-                
-            filtered_shows = []
-            
-            for show in tv:
-                # Apply year range filter
-                if year_start:
-                    show_year = (
-                        int(show["first_air_date"][:4]) if show["first_air_date"] else None
-                    )
-                    if not show_year: 
-                        continue
-                    if show_year and show_year < year_start:
-                        continue  # Skip this show if it doesn't match the year range
-                if year_end:
-                    show_year = (
-                        int(show["first_air_date"][:4]) if show["first_air_date"] else None
-                    )
-                    if not show_year:
-                        continue
-                    if show_year and show_year > year_end:
-                        continue  # Skip this show if it doesn't match the year range
-
-                # Apply rating filter
-                if rating_min and show["vote_average"] < rating_min:
-                    continue  # Skip this movie if it doesn't meet the rating threshold
-                if rating_max and show["vote_average"] > rating_max:
-                    continue  # Skip this movie if it doesn't meet the rating threshold
-
-                # Apply genre filter (Check if all genres in the filter are in the movie's genres)
-                if genre and not all(g in show["genres"] for g in genre):
-                    continue  # Skip this movie if it doesn't match all genres
-
-                # Add the movie to the filtered list if it passes all filters
-                filtered_shows.append(show)
-            # print(filtered_shows)
-        return jsonify({"tv": filtered_shows})
+            if show_matches_filters(show, year_start, year_end, rating_min, rating_max, genre):
+                return show
+            return None
 
+        shows, next_cursor = paged_search.search(
+            TV_SEARCH_URL, params, headers=headers, transform=to_show, cursor=cursor, limit=limit
+        )
+        return jsonify({"tv": shows, "next_cursor": next_cursor})
+
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except requests.exceptions.RequestException as e:
         return jsonify({"error": str(e)}), 500
     
+def lookup_single_tv(title, year=None):
+    """
+    Find the first TMDB show matching a title (and optionally a first air year).
+
+    Returns:
+        dict: The show summary, or None if nothing matched.
+
+    Raises:
+        requests.RequestException: If the TMDB request fails.
+    """
+    headers = {"Authorization": f"Bearer {TMDB_API_KEY}"}
+    params = {
+        "query": title,
+        "include_adult": False,
+        "language": "en-US",
+        "page": 1,
+        "first_air_date_year": year
+    }
+    response = upstream.get(TV_SEARCH_URL, headers=headers, params=params)
+    response.raise_for_status() 
+    data = response.json()
+    first_show = (data.get("results") or [None])[0]
+    if not first_show:
+        return None
+
+    return {
+        "id": first_show["id"],
+        "title": first_show["name"],
+        "year": year,
+        "vote_average": first_show.get("vote_average"),
+        "poster_path": f"{TMDB_IMAGE_BASE_URL}{first_show['poster_path']}" if first_show.get("poster_path") else None,
+    }
+
+
 def search_single_tv(title, year):
     if not title:
         return jsonify({"error": "Query parameter is required"}), 400
     
     try:
-        headers = {"Authorization": f"Bearer {TMDB_API_KEY}"}
-        params = {
-            "query": title,
-            "include_adult": False,
-            "language": "en-US",
-            "page": 1,
-            "first_air_date_year": year
-        }
-        response = requests.get(TV_SEARCH_URL, headers=headers, params=params)
-        response.raise_for_status() 
-        data = response.json()
-        first_show = data.get("results", [None])[0]
-        if not first_show:
+        show_details = lookup_single_tv(title, year)
+        if not show_details:
             return jsonify({"error": "No shows found"}), 404
-    
-        show_details = {
-            "id": first_show["id"],
-            "title": first_show["name"],
-            "year": year,
-            "vote_average": first_show.get("vote_average"),
-            "poster_path": f"{TMDB_IMAGE_BASE_URL}{first_show['poster_path']}" if first_show.get("poster_path") else None,
-        }
         return jsonify({"tv_show": show_details})
 
     except requests.exceptions.RequestException as e:
         return jsonify({"error": str(e)}), 500
 
 
+def fetch_trending_tv():
+    """Fetch this week's trending shows from TMDB"""
+    tv = []
+    headers = {"Authorization": f"Bearer {TMDB_API_KEY}"}
+    params = {
+        "include_adult": False,
+        "language": "en-US",
+        "page": 1
+    }
+    response = upstream.get("https://api.themoviedb.org/3/trending/tv/week", headers=headers, params=params)
+    response.raise_for_status() 
+    data = response.json()
+    
+    for item in data.get("results", []):
+        tv.append({
+            "id": item.get("id"),  
+            "title": item.get("name"),
+            "overview": item.get("overview"),
+            "release_date": item.get("first_air_date"),
+            "vote_average": item.get("vote_average"),
+            "poster_path": f"https://image.tmdb.org/t/p/w500{item.get('poster_path')}", 
+            "popularity": item.get("popularity"),
+            #"cast": cast,  # Add cast to the response
+        })
+    return tv
+
+
+trending.register("tv", fetch_trending_tv)
+
+
 @tv_bp.route('/api/trendingtv', methods=['GET'])
 @cross_origin(origin="http://localhost:3000", headers=["Content-Type"])
 def trending_tv():
     try:
-        tv = []
-        headers = {"Authorization": f"Bearer {TMDB_API_KEY}"}
-        params = {
-            "include_adult": False,
-            "language": "en-US",
-            "page": 1
-        }
-        response = requests.get("https://api.themoviedb.org/3/trending/tv/week", headers=headers, params=params)
-        response.raise_for_status() 
-        data = response.json()
-        
-        for item in data.get("results", []):
-            tv.append({
-                "id": item.get("id"),  
-                "title": item.get("name"),
-                "overview": item.get("overview"),
-                "release_date": item.get("first_air_date"),
-                "vote_average": item.get("vote_average"),
-                "poster_path": f"https://image.tmdb.org/t/p/w500{item.get('poster_path')}", 
-                "popularity": item.get("popularity"),
-                #"cast": cast,  # Add cast to the response
-            })
-        return jsonify({"tv": tv})
+        return jsonify({"tv": trending.get("tv")})
 
     except requests.exceptions.RequestException as e:
         return jsonify({"error": str(e)}), 500
 
 @tv_bp.route('/api/tv/<tv_id>', methods=['GET'])
+@cached("tv_details", ttl=24 * 60 * 60)
 def get_tv_details(tv_id):
     try:
-        # Fetch movie details from TMDB API
+        # Fetch show details, credits and trailers from TMDB in a single call
         url = f"https://api.themoviedb.org/3/tv/{tv_id}"
-        credits_url = f"https://api.themoviedb.org/3/tv/{tv_id}/credits"
-        trailers_url = f"https://api.themoviedb.org/3/tv/{tv_id}/videos"
         headers = {"Authorization": f"Bearer {TMDB_API_KEY}"}
+        params = {"append_to_response": "credits,videos"}
 
-        # Movie details
-        response = requests.get(url, headers=headers)
+        response = upstream.get(url, headers=headers, params=params)
         response.raise_for_status()
         item = response.json()
 
-        # Movie credits
-        credits_response = requests.get(credits_url, headers=headers)
-        credits_response.raise_for_status()
-        credits = credits_response.json()
-        
-        trailers_response = requests.get(trailers_url, headers=headers)
-        trailers_response.raise_for_status()
-        trailers = trailers_response.json()
+        credits = item.get("credits", {})
+        trailers = item.get("videos", {})
         
         trailer_key = None
         for video in trailers.get("results", []):
@@ -261,7 +271,7 @@ def get_recommendations(tv_id):
         headers = {"Authorization": f"Bearer {TMDB_API_KEY}"}
         
         # Tv details
-        response = requests.get(url, headers=headers)
+        response = upstream.get(url, headers=headers)
         response.raise_for_status()
         data = response.json()
         
@@ -294,44 +304,17 @@ def save_tv(tv_id):
     if users_col is None:
         return jsonify({"error": "Database not connected"}), 500
     
-    user = users_col.find_one({"username": username})
+    user = users_col.find_one({"username": username}, {"_id": 1})
     if user is None:
         return jsonify({"error": "User not logged in!"}), 500
     
-    tv_logs_col = current_app.config["collections"].get("tvLogs")
-    user_tv_log_item = tv_logs_col.find_one({"username": username})
-    
-    if user_tv_log_item is None:
-        info = {
-            "username": username,
-            "tvLog": [],
-            "watchLater": [],
-        }
-        insert = tv_logs_schema.load(info)
-        tv_logs_col.insert_one(insert)
-    
-    
     new_entry = {
-        "_id": ObjectId(),
         "tvId": tv_id,
         "title": title,
         "poster": poster,  # Add poster path to the movie log
     }
     
-    result = tv_logs_col.update_one(
-        {"username": username},  # Find the document by username
-        {
-            "$push": {"watchLater": new_entry},  # Use $push to append to the logs array
-        },
-    )
-
-    
-    if result.matched_count > 0:
-        new_entry["_id"] = str(new_entry["_id"])
-        return new_entry
-        return {"message": "Movie successfully added to your log."}, 200
-    else:
-        return {"error": "User not found or could not be updated."}, 400
+    return media_logs.add_entry(username, "tv", "watchLater", new_entry)
 
 #remove from log/watch later
 @tv_bp.route('/api/tv/remove', methods=['POST'])
@@ -341,32 +324,27 @@ def remove_tv():
     username = data.get('username')  # Get username from query parameters
     entry = data.get('entry')
     section = data.get('section')
-    print(entry)
     
     users_col = current_app.config["collections"].get("users")
     if users_col is None:
         return jsonify({"error": "Database not connected"}), 500
     
-    user = users_col.find_one({"username": username})
+    user = users_col.find_one({"username": username}, {"_id": 1})
     if user is None:
         return jsonify({"error": "User not logged in!"}), 500
     
-    tv_logs_col = current_app.config["collections"].get("tvLogs")
-    user_tv_log_item = tv_logs_col.find_one({"username": username})
-    
-    result = tv_logs_col.update_one(
-            {"username": username},
-            {"$pull": {section: {"_id": ObjectId(entry)}}}  # Pull entry with matching movieId
-        )
-    
-    if result.modified_count == 0:
+    if not media_logs.is_valid_section("tv", section):
+        return jsonify({"error": f"Unknown section '{section}'"}), 400
+
+    if not media_logs.remove_entry(username, "tv", section, entry):
         return jsonify({"error": "TV not found in log or removal failed"}), 404
         
-    update_user_section(username, "decrement", "media")
+    if media_logs.is_log_section("tv", section):
+        update_user_section(username, "decrement", "media")
     return jsonify({"success": True, "message": f"TV removed from {section}."}), 200
 
 
-# get all watch later
+# get watch later
 @tv_bp.route('/api/tv/watch_later', methods=['GET'])
 @cross_origin(origin="http://localhost:3000", headers=["Content-Type"])
 def get_watch_later():
@@ -375,29 +353,11 @@ def get_watch_later():
     if users_col is None:
         return jsonify({"error": "Database not connected"}), 500
     
-    user = users_col.find_one({"username": username})
+    user = users_col.find_one({"username": username}, {"_id": 1})
     if user is None:
         return jsonify({"error": "User not logged in!"}), 500
     
-    tv_logs_col = current_app.config["collections"].get("tvLogs")
-    user_tv_log_item = tv_logs_col.find_one({"username": username})
-    
-    if user_tv_log_item is None:
-        info = {
-            "username": username,
-            "movieLog": [],
-            "watchLater": [],
-        }
-        insert = tv_logs_schema.load(info)
-        tv_logs_col.insert_one(insert)
-        
-        user_tv_log_item = tv_logs_col.find_one({"username": username})
-        
-    watch_log = user_tv_log_item["watchLater"]
-    for entry in watch_log:
-        entry["_id"] = str(entry["_id"])  # Serialize ObjectId to string
-
-    return jsonify(watch_log)
+    return media_logs.section_response(username, "tv", "watchLater", request.args)
 
 #log tv
 @tv_bp.route('/api/tv/log/<tv_id>', methods=['POST'])
@@ -416,22 +376,10 @@ def log_tv(tv_id):
     if users_col is None:
         return jsonify({"error": "Database not connected"}), 500
     
-    user = users_col.find_one({"username": username})
+    user = users_col.find_one({"username": username}, {"_id": 1})
     if user is None:
         return jsonify({"error": "User not logged in!"}), 500
     
-    tv_logs_col = current_app.config["collections"].get("tvLogs")
-    user_tv_log_item = tv_logs_col.find_one({"username": username})
-    
-    if user_tv_log_item is None:
-        info = {
-            "username": username,
-            "tvLog": [],
-            "watchLater": [],
-        }
-        insert = tv_logs_schema.load(info)
-        tv_logs_col.insert_one(insert)
-
     # Validate date format
     if watched_date:
         try:
@@ -439,10 +387,7 @@ def log_tv(tv_id):
         except ValueError:
             return jsonify({"error": "Invalid date format. Use YYYY-MM-DD."}), 400
 
-    user_tv_log_item = tv_logs_col.find_one({"username": username})
-
     new_tv_log = {
-        "_id": ObjectId(),
         "tvId": tv_id,
         "watchDate": watched_date,
         "rating": rating,
@@ -450,22 +395,14 @@ def log_tv(tv_id):
         "title": title,
         "poster": poster,  # Add poster path to the movie log
         "number_of_episodes": number_of_episodes,
+        "genres": media_logs.parse_list(data.get("genres")),
     }
     
-    result = tv_logs_col.update_one(
-        {"username": username},  # Find the document by username
-        {
-            "$push": {"tvLog": new_tv_log},  # Use $push to append to the logs array
-        },
-    )
-
-    if result.matched_count > 0:
-        update_user_section(username, "increment", "media")
-        return {"message": "TV successfully added to your log."}, 200
-    else:
-        return {"error": "User not found or could not be updated."}, 400
-
-# Route to get all logged tv
+    media_logs.add_entry(username, "tv", "tvLog", new_tv_log)
+    update_user_section(username, "increment", "media")
+    return {"message": "TV successfully added to your log."}, 200
+
+# Route to get logged tv
 @tv_bp.route('/api/tv/log', methods=['GET'])
 def get_logged_tv():
     username = request.args.get('username')  # Get username from query parameters
@@ -473,29 +410,11 @@ def get_logged_tv():
     if users_col is None:
         return jsonify({"error": "Database not connected"}), 500
     
-    user = users_col.find_one({"username": username})
+    user = users_col.find_one({"username": username}, {"_id": 1})
     if user is None:
         return jsonify({"error": "User not logged in!"}), 500
     
-    tv_logs_col = current_app.config["collections"].get("tvLogs")
-    user_tv_log_item = tv_logs_col.find_one({"username": username})
-    
-    if user_tv_log_item is None:
-        info = {
-            "username": username,
-            "movieLog": [],
-            "watchLater": [],
-        }
-        insert = tv_logs_schema.load(info)
-        tv_logs_col.insert_one(insert)
-        
-    tv_log = user_tv_log_item["tvLog"]
-    for entry in tv_log:
-        entry["_id"] = str(entry["_id"])  # Serialize ObjectId to string
-
-    return jsonify(tv_log)
-    
-    # return jsonify(user_movie_log_item["movieLog"])
+    return media_logs.section_response(username, "tv", "tvLog", request.args)
 
 @tv_bp.route("/api/tv/suggestions", methods=["GET"])
 def tv_suggestions():    
@@ -513,7 +432,7 @@ def tv_suggestions():
     try:
         url = f"https://api.themoviedb.org/3/search/tv"
         headers = {"Authorization": f"Bearer {TMDB_API_KEY}"}
-        response = requests.get(url, headers=headers, params=params)
+        response = upstream.get(url, headers=headers, params=params)
         response.raise_for_status()
         data = response.json()
 
@@ -537,38 +456,46 @@ def tv_suggestions():
 @cross_origin(origin="http://localhost:3000", headers=["Content-Type"])
 def search_people():
     query = request.args.get("query", "")
+    cursor = request.args.get("cursor")
+    limit = request.args.get("limit", type=int)
     if not query:
         return jsonify({"error": "Query parameter is required"}), 400
     
     try:
-        people = []
-        for page in range(1,30):
-            headers = {"Authorization": f"Bearer {TMDB_API_KEY}"}
-            params = {
-                "query": query,
-                "include_adult": False,
-                "language": "en-US",
-                "page": page
+        headers = {"Authorization": f"Bearer {TMDB_API_KEY}"}
+        params = {
+            "query": query,
+            "include_adult": False,
+            "language": "en-US",
+        }
+
+        def to_person(item):
+            return {
+                "id": item.get("id"),  
+                "name": item.get("name"),
+                "known_for": item.get("known_for_department)"),
+                "profile_path": f"https://image.tmdb.org/t/p/original/{item.get('profile_path')}" if item.get("profile_path") else None,
             }
-            response = requests.get("https://api.themoviedb.org/3/search/person", headers=headers, params=params)
-            response.raise_for_status() 
-            data = response.json()
-        
-            for item in data.get("results", []):
-                people.append({
-                    "id": item.get("id"),  
-                    "name": item.get("name"),
-                    "known_for": item.get("known_for_department)"),
-                    "profile_path": f"https://image.tmdb.org/t/p/original/{item.get('profile_path')}" if item.get("profile_path") else None,
-                })
-        return jsonify({"people": people})
 
+        people, next_cursor = paged_search.search(
+            "https://api.themoviedb.org/3/search/person",
+            params,
+            headers=headers,
+            transform=to_person,
+            cursor=cursor,
+            limit=limit,
+        )
+        return jsonify({"people": people, "next_cursor": next_cursor})
+
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except requests.exceptions.RequestException as e:
         return jsonify({"error": str(e)}), 500
     
 
 @tv_bp.route('/api/people/<person_id>', methods=['GET'])
 @cross_origin(origin="http://localhost:3000", headers=["Content-Type"])
+@cached("person_details", ttl=24 * 60 * 60)
 def person_details(person_id):
     try:
         # Fetch movie details from TMDB API
@@ -577,12 +504,12 @@ def person_details(person_id):
         headers = {"Authorization": f"Bearer {TMDB_API_KEY}"}
 
         # Movie details
-        response = requests.get(url, headers=headers)
+        response = upstream.get(url, headers=headers)
         response.raise_for_status()
         item = response.json()
 
         # Movie credits
-        credits_response = requests.get(credits_url, headers=headers)
+        credits_response = upstream.get(credits_url, headers=headers)
         credits_response.raise_for_status()
         credits = credits_response.json()
 
@@ -7,6 +7,7 @@ from pymongo.errors import DuplicateKeyError
 from schemas.user_schema import UserSchema
 from werkzeug.security import check_password_hash, generate_password_hash
 from werkzeug.utils import secure_filename
+from services import media_logs, user_stats
 from services.config import Config
 from bson import ObjectId
 
@@ -145,6 +146,84 @@ def get_user(username):
     return jsonify(user), 200
 
 
+# Public user fields the profile page shows (no email, password or the
+# legacy embedded logs)
+PROFILE_FIELDS = {
+    "username": 1,
+    "profilePicture": 1,
+    "bio": 1,
+    "genrePreferences": 1,
+    "followers": 1,
+    "following": 1,
+    "blocked": 1,
+    "lists": 1,
+    "reviews": 1,
+    "media": 1,
+}
+
+
+@users_bp.route("/api/users/<username>/profile-bundle", methods=["GET"])
+def get_profile_bundle(username):
+    """
+    Everything the profile page shows in one request: the user's public
+    profile fields and the newest entries of each media log and later list. The
+    `limit` query parameter caps the entries per section; each section also
+    carries its total and a `next_cursor` for the paged log endpoints.
+    """
+    users_col = current_app.config["collections"].get("users")
+    if users_col is None or media_logs.get_collection() is None:
+        return jsonify({"error": "Database not connected"}), 500
+
+    limit = request.args.get("limit", Config.PROFILE_BUNDLE_SECTION_LIMIT, type=int)
+    sections = [
+        (media_type, section)
+        for media_type, layout in media_logs.MEDIA_TYPES.items()
+        for section in layout["sections"]
+    ]
+
+    # A handful of indexed queries, run in turn
+    try:
+        user = users_col.find_one({"username": username}, PROFILE_FIELDS)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+    if not user:
+        return jsonify({"error": "User not found"}), 404
+    user["_id"] = str(user["_id"])
+
+    logs = {media_type: {} for media_type in media_logs.MEDIA_TYPES}
+    for media_type, section in sections:
+        try:
+            page = media_logs.newest_page(username, media_type, section, limit)
+        except Exception as e:
+            print(f"❌ Error loading {media_type} {section} for {username}: {e}")
+            page = {"error": str(e)}
+        logs[media_type][section] = page
+
+    return jsonify({"user": user, "logs": logs}), 200
+
+
+@users_bp.route("/api/users/<username>/stats", methods=["GET"])
+def get_user_stats(username):
+    """
+    Statistics over a user's movie, TV, book and music logs: totals, runtime,
+    rating histograms, per-genre/month/year breakdowns and top tags. Pass
+    `refresh=true` to rebuild them from the logs.
+    """
+    users_col = current_app.config["collections"].get("users")
+    if users_col is None or current_app.config["collections"].get("userStats") is None:
+        return jsonify({"error": "Database not connected"}), 500
+
+    if users_col.find_one({"username": username}, {"_id": 1}) is None:
+        return jsonify({"error": "User not found"}), 404
+
+    refresh = request.args.get("refresh", "").lower() in ("1", "true")
+    try:
+        return jsonify(user_stats.get(username, refresh=refresh)), 200
+    except Exception as e:
+        print(f"❌ Error computing stats for {username}: {e}\n")
+        return jsonify({"error": str(e)}), 500
+
+
 @users_bp.route("/api/users/<username>", methods=["PATCH"])
 @cross_origin(origin="http://localhost:3000", headers=["Content-Type"])
 def patch_user(username):
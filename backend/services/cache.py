@@ -0,0 +1,192 @@
+import datetime
+import functools
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from flask import Response, has_request_context, jsonify, request
+
+from services.config import Config
+
+
+class MemoryCache:
+    """In-process cache with per-entry TTL and size-bounded LRU eviction"""
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class MongoCache:
+    """
+    Cache shared by every worker, stored in a MongoDB collection.
+
+    Expired entries are removed by a TTL index on `expires_at` (declared in
+    services/indexes.py). Once the collection grows past `max_entries`, the
+    oldest stored entries are evicted.
+    """
+
+    TRIM_EVERY = 100
+
+    def __init__(self, collection, max_entries=50000):
+        self.collection = collection
+        self.max_entries = max_entries
+        self._writes = 0
+
+    def get(self, key):
+        doc = self.collection.find_one(
+            {"_id": key, "expires_at": {"$gt": datetime.datetime.utcnow()}},
+            {"value": 1},
+        )
+        return json.loads(doc["value"]) if doc else None
+
+    def set(self, key, value, ttl):
+        now = datetime.datetime.utcnow()
+        self.collection.replace_one(
+            {"_id": key},
+            {
+                "value": json.dumps(value),
+                "stored_at": now,
+                "expires_at": now + datetime.timedelta(seconds=ttl),
+            },
+            upsert=True,
+        )
+        self._writes += 1
+        if self._writes % self.TRIM_EVERY == 0:
+            self._trim()
+
+    def _trim(self):
+        excess = self.collection.estimated_document_count() - self.max_entries
+        if excess <= 0:
+            return
+        oldest = self.collection.find({}, {"_id": 1}).sort("stored_at", 1).limit(excess)
+        self.collection.delete_many({"_id": {"$in": [doc["_id"] for doc in oldest]}})
+
+    def delete(self, key):
+        self.collection.delete_one({"_id": key})
+
+    def clear(self):
+        self.collection.delete_many({})
+
+
+class TieredCache:
+    """In-process LRU in front of a shared backend"""
+
+    def __init__(self, front, shared):
+        self.front = front
+        self.shared = shared
+
+    def get(self, key):
+        value = self.front.get(key)
+        if value is None:
+            value = self.shared.get(key)
+            if value is not None:
+                # Short local lifetime so workers pick up shared refreshes
+                self.front.set(key, value, 60)
+        return value
+
+    def set(self, key, value, ttl):
+        self.front.set(key, value, min(ttl, 60))
+        self.shared.set(key, value, ttl)
+
+    def delete(self, key):
+        self.front.delete(key)
+        self.shared.delete(key)
+
+    def clear(self):
+        self.front.clear()
+        self.shared.clear()
+
+
+_backend = MemoryCache(Config.RESPONSE_CACHE_MAX_ENTRIES)
+
+
+def init_app(app):
+    """Select the response cache backend once the database is connected"""
+    global _backend
+    collection = app.config["collections"].get("responseCache")
+
+    if Config.RESPONSE_CACHE_BACKEND == "mongo" and collection is not None:
+        _backend = TieredCache(
+            MemoryCache(Config.RESPONSE_CACHE_MAX_ENTRIES),
+            MongoCache(collection, Config.RESPONSE_CACHE_SHARED_MAX_ENTRIES),
+        )
+        print("✅ Response cache: MongoDB (shared) with in-process front")
+    else:
+        _backend = MemoryCache(Config.RESPONSE_CACHE_MAX_ENTRIES)
+        print("✅ Response cache: in-process")
+
+
+def get_backend():
+    return _backend
+
+
+def _make_key(namespace, args, kwargs):
+    parts = [namespace, *map(str, args)]
+    parts += [f"{k}={v}" for k, v in sorted(kwargs.items())]
+    if has_request_context():
+        parts += [f"{k}={v}" for k, v in sorted(request.args.items(multi=True))]
+    return ":".join(parts)
+
+
+def cached(namespace, ttl):
+    """
+    Cache successful JSON responses of a view.
+
+    Only 200 responses returned as a `Response` are stored; error tuples
+    always fall through to the upstream call. So do 200 bodies with a
+    top-level "error" key, which some APIs (e.g. Deezer) send for quota and
+    not-found errors.
+
+    Args:
+        namespace (str): Key prefix, one per endpoint.
+        ttl (int): Lifetime of an entry in seconds.
+    """
+
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            key = _make_key(namespace, args, kwargs)
+            hit = _backend.get(key)
+            if hit is not None:
+                return jsonify(hit)
+
+            result = view(*args, **kwargs)
+            if isinstance(result, Response) and result.status_code == 200 and result.is_json:
+                payload = result.get_json()
+                if not (isinstance(payload, dict) and "error" in payload):
+                    _backend.set(key, payload, ttl)
+            return result
+
+        return wrapper
+
+    return decorator
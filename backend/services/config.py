@@ -8,8 +8,84 @@ load_dotenv()
 
 class Config:
     MONGO_URI = os.getenv("MONGO_URI")
+    MONGO_DB_NAME = os.getenv("MONGO_DB_NAME", "encyclomediaDB")
+    # One MongoClient (and pool) is shared by the whole process
+    MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", 100))
+    MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", 0))
+    MONGO_MAX_IDLE_TIME_MS = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", 5 * 60 * 1000))
+    MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", 10000))
+    MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", 5000))
+    MONGO_READ_PREFERENCE = os.getenv("MONGO_READ_PREFERENCE", "primary")
+    MONGO_WRITE_CONCERN = os.getenv("MONGO_WRITE_CONCERN", "1")
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
     EMAIL_PASSWORD = os.getenv("EMAIL_PASSWORD")
+    # Shared secret for /api/admin endpoints; they are disabled when unset
+    ADMIN_KEY = os.getenv("ADMIN_KEY")
+
+    # Upstream media APIs (TMDB, Open Library, Deezer)
+    UPSTREAM_POOL_CONNECTIONS = int(os.getenv("UPSTREAM_POOL_CONNECTIONS", 10))
+    UPSTREAM_POOL_MAXSIZE = int(os.getenv("UPSTREAM_POOL_MAXSIZE", 20))
+    # Hosts the shared session for arbitrary URLs keeps connections to (LRU)
+    UPSTREAM_EXTERNAL_POOL_HOSTS = int(os.getenv("UPSTREAM_EXTERNAL_POOL_HOSTS", 4))
+    UPSTREAM_CONNECT_TIMEOUT = float(os.getenv("UPSTREAM_CONNECT_TIMEOUT", 3.05))
+    UPSTREAM_READ_TIMEOUT = float(os.getenv("UPSTREAM_READ_TIMEOUT", 10))
+    UPSTREAM_RETRIES = int(os.getenv("UPSTREAM_RETRIES", 2))
+    UPSTREAM_BACKOFF_FACTOR = float(os.getenv("UPSTREAM_BACKOFF_FACTOR", 0.3))
+    UPSTREAM_MAX_WORKERS = int(os.getenv("UPSTREAM_MAX_WORKERS", 8))
+
+    # Multi-page TMDB searches
+    SEARCH_MAX_PAGES = int(os.getenv("SEARCH_MAX_PAGES", 29))
+    SEARCH_MAX_WORKERS = int(os.getenv("SEARCH_MAX_WORKERS", 8))
+
+    # Upstream response cache ("memory" or "mongo")
+    RESPONSE_CACHE_BACKEND = os.getenv("RESPONSE_CACHE_BACKEND", "memory")
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", 2048))
+    RESPONSE_CACHE_SHARED_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_SHARED_MAX_ENTRIES", 50000))
+
+    # Seconds to wait for all title lookups of one discover request
+    DISCOVER_RESOLVE_TIMEOUT = float(os.getenv("DISCOVER_RESOLVE_TIMEOUT", 15))
+    # Seconds a streamed discover response may stay open
+    DISCOVER_STREAM_TIMEOUT = float(os.getenv("DISCOVER_STREAM_TIMEOUT", 60))
+
+    # Title -> TMDB/Open Library resolution index
+    RESOLUTION_INDEX_TTL = int(os.getenv("RESOLUTION_INDEX_TTL", 7 * 24 * 60 * 60))
+    RESOLUTION_INDEX_MISS_TTL = int(os.getenv("RESOLUTION_INDEX_MISS_TTL", 24 * 60 * 60))
+    RESOLUTION_INDEX_MAX_ENTRIES = int(os.getenv("RESOLUTION_INDEX_MAX_ENTRIES", 5000))
+
+    # Gemini discover results, shared by all workers
+    PROMPT_CACHE_TTL = int(os.getenv("PROMPT_CACHE_TTL", 24 * 60 * 60))
+    PROMPT_CACHE_MAX_ENTRIES = int(os.getenv("PROMPT_CACHE_MAX_ENTRIES", 20000))
+
+    # Entries per log section returned by /api/users/<username>/profile-bundle
+    PROFILE_BUNDLE_SECTION_LIMIT = int(os.getenv("PROFILE_BUNDLE_SECTION_LIMIT", 20))
+
+    # Seconds between recounts of the users' lists/reviews/media totals (0 = off)
+    COUNTER_RECONCILE_INTERVAL = int(os.getenv("COUNTER_RECONCILE_INTERVAL", 0))
+
+    # Review comments per page, and replies shown under each comment
+    COMMENTS_PAGE_SIZE = int(os.getenv("COMMENTS_PAGE_SIZE", 20))
+    REPLIES_PAGE_SIZE = int(os.getenv("REPLIES_PAGE_SIZE", 10))
+
+    # Reviews kept on each media item's review summary, and seconds before
+    # that list (ordered by reactions) is re-read
+    REVIEW_SUMMARY_TOP_REVIEWS = int(os.getenv("REVIEW_SUMMARY_TOP_REVIEWS", 3))
+    REVIEW_SUMMARY_TOP_TTL = int(os.getenv("REVIEW_SUMMARY_TOP_TTL", 5 * 60))
+    # Reviews per page of a media item's review listing
+    REVIEWS_PAGE_SIZE = int(os.getenv("REVIEWS_PAGE_SIZE", 20))
+    # Seconds the newest page of /api/reviews/recent is served from memory
+    # (other workers only see a new review once their copy expires)
+    RECENT_REVIEWS_CACHE_TTL = int(os.getenv("RECENT_REVIEWS_CACHE_TTL", 30))
+
+    # Following feed: activities kept per timeline, default page size, and the
+    # follower count above which an account's activities are merged in at
+    # read time instead of being written to every follower's timeline
+    FEED_TIMELINE_SIZE = int(os.getenv("FEED_TIMELINE_SIZE", 500))
+    FEED_PAGE_SIZE = int(os.getenv("FEED_PAGE_SIZE", 20))
+    FEED_CELEBRITY_FOLLOWERS = int(os.getenv("FEED_CELEBRITY_FOLLOWERS", 1000))
+
+    # Trending snapshots (seconds)
+    TRENDING_REFRESH_INTERVAL = int(os.getenv("TRENDING_REFRESH_INTERVAL", 60 * 60))
+    TRENDING_MAX_AGE = int(os.getenv("TRENDING_MAX_AGE", 3 * 60 * 60))
 
     cloudinary.config(
         cloud_name=os.getenv("CLOUDINARY_CLOUD_NAME"),
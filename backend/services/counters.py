@@ -0,0 +1,103 @@
+import threading
+import time
+
+from pymongo import ReturnDocument, UpdateOne, errors
+
+from services import media_logs
+from services.config import Config
+
+# Materialized per-user totals kept on the user document
+SECTIONS = ("lists", "reviews", "media")
+
+_collections = {}
+_worker = None
+
+
+def init_app(app):
+    """Share the app's collections once the database is connected"""
+    global _collections
+    _collections = app.config["collections"]
+
+
+def increment(username, section, delta):
+    """
+    $inc one counter on the user document.
+
+    Returns:
+        The counter's new value, or None if the user doesn't exist.
+    """
+    user = _collections["users"].find_one_and_update(
+        {"username": username},
+        {"$inc": {section: delta}},
+        projection={"_id": 0, section: 1},
+        return_document=ReturnDocument.AFTER,
+    )
+    return None if user is None else user.get(section)
+
+
+def _count_by_user(collection, user_field, match=None, username=None):
+    match = dict(match or {})
+    if username is not None:
+        match[user_field] = username
+    pipeline = [{"$match": match}, {"$group": {"_id": f"${user_field}", "count": {"$sum": 1}}}]
+    return {row["_id"]: row["count"] for row in collection.aggregate(pipeline)}
+
+
+def actual_counts(username=None):
+    """Counts recomputed from the logs, reviews and lists themselves"""
+    log_sections = {
+        "$or": [
+            {"media_type": media_type, "section": layout["log_section"]}
+            for media_type, layout in media_logs.MEDIA_TYPES.items()
+        ]
+    }
+    return {
+        "media": _count_by_user(_collections["logEntries"], "username", log_sections, username),
+        "reviews": _count_by_user(_collections["reviews"], "user_id", username=username),
+        "lists": _count_by_user(_collections["lists"], "user_id", username=username),
+    }
+
+
+def reconcile(username=None):
+    """
+    Reset drifted counters to the actual counts, for one user or everyone.
+
+    Returns:
+        dict: How many users were checked and how many needed fixing.
+    """
+    counts = actual_counts(username)
+    query = {} if username is None else {"username": username}
+    projection = {"_id": 0, "username": 1, **{section: 1 for section in SECTIONS}}
+
+    updates = []
+    checked = 0
+    for user in _collections["users"].find(query, projection):
+        checked += 1
+        expected = {s: counts[s].get(user["username"], 0) for s in SECTIONS}
+        if any(user.get(s) != expected[s] for s in SECTIONS):
+            updates.append(UpdateOne({"username": user["username"]}, {"$set": expected}))
+
+    if updates:
+        _collections["users"].bulk_write(updates, ordered=False)
+    return {"checked": checked, "fixed": len(updates)}
+
+
+def _run_worker():
+    while True:
+        time.sleep(Config.COUNTER_RECONCILE_INTERVAL)
+        try:
+            report = reconcile()
+            if report["fixed"]:
+                print(f"✅ Reconciled counters for {report['fixed']} users")
+        except errors.PyMongoError as e:
+            print(f"❌ Error reconciling user counters: {e}")
+
+
+def start():
+    """Start the periodic reconciliation, if COUNTER_RECONCILE_INTERVAL is set"""
+    global _worker
+    if _worker is not None or Config.COUNTER_RECONCILE_INTERVAL <= 0 or not _collections:
+        return
+    _worker = threading.Thread(target=_run_worker, name="counter-reconcile", daemon=True)
+    _worker.start()
+    print(f"✅ User counters reconcile every {Config.COUNTER_RECONCILE_INTERVAL}s")
@@ -1,16 +1,181 @@
-from pymongo import MongoClient, errors
+import threading
+import time
+from collections import defaultdict, deque
+
+from pymongo import MongoClient, errors, monitoring
 from services.config import Config
 
+# Command durations kept per command name for the latency percentiles
+LATENCY_WINDOW = 500
+
+_client = None
+_client_lock = threading.Lock()
+
+
+class PoolMonitor(monitoring.ConnectionPoolListener):
+    """Tracks open and checked-out connections per server"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.pools = defaultdict(
+            lambda: {"open": 0, "checked_out": 0, "checkout_failures": 0, "cleared": 0}
+        )
+
+    def _bump(self, address, field, delta=1):
+        with self._lock:
+            self.pools[f"{address[0]}:{address[1]}"][field] += delta
+
+    def snapshot(self):
+        with self._lock:
+            return {address: dict(stats) for address, stats in self.pools.items()}
+
+    def connection_created(self, event):
+        self._bump(event.address, "open")
+
+    def connection_closed(self, event):
+        self._bump(event.address, "open", -1)
+
+    def connection_checked_out(self, event):
+        self._bump(event.address, "checked_out")
+
+    def connection_checked_in(self, event):
+        self._bump(event.address, "checked_out", -1)
+
+    def connection_check_out_failed(self, event):
+        self._bump(event.address, "checkout_failures")
+
+    def pool_cleared(self, event):
+        self._bump(event.address, "cleared")
+
+    # Remaining events carry nothing we report
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_check_out_started(self, event):
+        pass
+
+
+class CommandMonitor(monitoring.CommandListener):
+    """Counts commands and keeps recent latencies per command name"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.commands = defaultdict(
+            lambda: {"count": 0, "failures": 0, "durations": deque(maxlen=LATENCY_WINDOW)}
+        )
+
+    def _record(self, event, failed):
+        with self._lock:
+            stats = self.commands[event.command_name]
+            stats["count"] += 1
+            stats["failures"] += 1 if failed else 0
+            stats["durations"].append(event.duration_micros / 1000)
+
+    def snapshot(self):
+        report = {}
+        with self._lock:
+            for name, stats in self.commands.items():
+                durations = sorted(stats["durations"])
+                report[name] = {
+                    "count": stats["count"],
+                    "failures": stats["failures"],
+                    "p50_ms": round(durations[len(durations) // 2], 2) if durations else None,
+                    "p95_ms": round(durations[int(len(durations) * 0.95)], 2) if durations else None,
+                    "max_ms": round(durations[-1], 2) if durations else None,
+                }
+        return report
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        self._record(event, failed=False)
+
+    def failed(self, event):
+        self._record(event, failed=True)
+
+
+pool_monitor = PoolMonitor()
+command_monitor = CommandMonitor()
+
+
+def _write_concern():
+    w = Config.MONGO_WRITE_CONCERN
+    return int(w) if w.isdigit() else w
+
+
+def get_client():
+    """The process-wide MongoClient, created on first use"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = MongoClient(
+                Config.MONGO_URI,
+                maxPoolSize=Config.MONGO_MAX_POOL_SIZE,
+                minPoolSize=Config.MONGO_MIN_POOL_SIZE,
+                maxIdleTimeMS=Config.MONGO_MAX_IDLE_TIME_MS,
+                waitQueueTimeoutMS=Config.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+                serverSelectionTimeoutMS=Config.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+                readPreference=Config.MONGO_READ_PREFERENCE,
+                w=_write_concern(),
+                event_listeners=[pool_monitor, command_monitor],
+            )
+        return _client
+
+
+def ping():
+    """Round-trip a ping to the server, returning the latency in ms"""
+    start = time.perf_counter()
+    get_client().admin.command("ping")
+    return (time.perf_counter() - start) * 1000
+
+
 def connect_db():
     """Connect to MongoDB"""
     print("\n🔄 Attempting to connect to MongoDB...")
 
     try:
-        mongo_client = MongoClient(Config.MONGO_URI, serverSelectionTimeoutMS=5000)
-        db = mongo_client.get_database('encyclomediaDB')
-        print("✅ Successfully connected to MongoDB!\n")
+        # MongoClient connects lazily, so ping to find out if the server is there
+        latency = ping()
+        db = get_client().get_database(Config.MONGO_DB_NAME)
+        print(f"✅ Successfully connected to MongoDB! (ping {latency:.1f}ms)\n")
         return db
-    except errors.ServerSelectionTimeoutError as e:
+    except (errors.ConfigurationError, errors.ConnectionFailure) as e:
         print("❌ ERROR: Could not connect to MongoDB")
         print(f"🛑 {e}\n")
-        return None
\ No newline at end of file
+        return None
+
+
+def health():
+    """Connectivity, pool utilization and command latencies"""
+    report = {
+        "settings": {
+            "database": Config.MONGO_DB_NAME,
+            "max_pool_size": Config.MONGO_MAX_POOL_SIZE,
+            "min_pool_size": Config.MONGO_MIN_POOL_SIZE,
+            "max_idle_time_ms": Config.MONGO_MAX_IDLE_TIME_MS,
+            "read_preference": Config.MONGO_READ_PREFERENCE,
+            "write_concern": Config.MONGO_WRITE_CONCERN,
+        },
+        "pools": pool_monitor.snapshot(),
+        "commands": command_monitor.snapshot(),
+    }
+    for stats in report["pools"].values():
+        stats["utilization"] = round(stats["checked_out"] / Config.MONGO_MAX_POOL_SIZE, 3)
+
+    try:
+        report["ping_ms"] = round(ping(), 2)
+        report["ok"] = True
+    except errors.PyMongoError as e:
+        report["ok"] = False
+        report["error"] = str(e)
+    return report
@@ -0,0 +1,216 @@
+import datetime
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import UpdateOne, errors
+
+from services import media_logs, references
+from services.config import Config
+
+MAX_PAGE_SIZE = 100
+
+_activities = None
+_timelines = None
+_users = None
+
+
+def init_app(app):
+    """Attach the feed collections and follow log changes"""
+    global _activities, _timelines, _users
+    collections = app.config["collections"]
+    _activities = collections.get("activities")
+    _timelines = collections.get("timelines")
+    _users = collections.get("users")
+    media_logs.on_change(_on_log_change)
+
+
+def _is_celebrity_query():
+    # followers.<N> only exists on arrays longer than N
+    return {f"followers.{Config.FEED_CELEBRITY_FOLLOWERS}": {"$exists": True}}
+
+
+def _fan_out(activity):
+    """Push the activity id onto each follower's capped timeline"""
+    actor = _users.find_one(
+        {"username": activity["actor"]},
+        {"followers": {"$slice": Config.FEED_CELEBRITY_FOLLOWERS + 1}},
+    )
+    followers = (actor or {}).get("followers") or []
+    if len(followers) > Config.FEED_CELEBRITY_FOLLOWERS:
+        # Too many timelines to write; readers merge this actor's activities in
+        return 0
+
+    push = {
+        "$push": {
+            "items": {
+                "$each": [activity["_id"]],
+                "$position": 0,
+                "$slice": Config.FEED_TIMELINE_SIZE,
+            }
+        }
+    }
+    batch = [UpdateOne({"_id": follower}, push, upsert=True) for follower in set(followers)]
+    if batch:
+        _timelines.bulk_write(batch, ordered=False)
+    return len(batch)
+
+
+def record(actor, verb, subject_id, **details):
+    """
+    Store an activity and fan it out to the actor's followers. An earlier
+    activity about the same subject (e.g. a list edited twice) is replaced,
+    so the subject shows up once, at its latest position.
+
+    Args:
+        actor (str): Username of the user who acted.
+        verb (str): "review", "log", "list_created" or "list_updated".
+        subject_id (str): Id of the review, log entry or list.
+        details: Fields shown with the activity (title, media_type, ...).
+    """
+    if _activities is None:
+        return
+    activity = dict(
+        details,
+        _id=ObjectId(),
+        actor=actor,
+        verb=verb,
+        subject_id=str(subject_id),
+        created_at=datetime.datetime.utcnow(),
+    )
+    try:
+        _activities.delete_many({"subject_id": activity["subject_id"]})
+        _activities.insert_one(activity)
+        _fan_out(activity)
+    except errors.PyMongoError as e:
+        # The feed is best effort; never fail the write that triggered it
+        print(f"❌ Error recording {verb} activity for {actor}: {e}")
+
+
+def retract(subject_id):
+    """
+    Drop the activities about a deleted subject. Timelines keep the dangling
+    ids until they are sliced off; reads skip them.
+    """
+    if _activities is None:
+        return
+    try:
+        _activities.delete_many({"subject_id": str(subject_id)})
+    except errors.PyMongoError as e:
+        print(f"❌ Error retracting activities for {subject_id}: {e}")
+
+
+def record_review(review):
+    record(
+        review["user_id"],
+        "review",
+        review["_id"],
+        media_type=review.get("media_type"),
+        media_id=review.get("media_id"),
+        media_title=review.get("media_title"),
+        title=review.get("title"),
+        rating=review.get("rating"),
+    )
+
+
+def record_list(list_doc, verb):
+    record(
+        list_doc["user_id"],
+        verb,
+        list_doc["_id"],
+        name=list_doc.get("name"),
+        item_count=len(list_doc.get("items") or []),
+    )
+
+
+def _on_log_change(doc, delta):
+    if delta < 0:
+        retract(doc["_id"])
+        return
+    record(
+        doc["username"],
+        "log",
+        doc["_id"],
+        media_type=doc["media_type"],
+        media_id=doc.get("media_id"),
+        section=doc["section"],
+        title=doc.get("title"),
+        image=doc.get("poster") or doc.get("cover"),
+        rating=doc.get("rating"),
+        date=doc.get("date"),
+    )
+
+
+def _timeline_ids(username, before, limit):
+    """Up to `limit` ids from the user's timeline older than `before`"""
+    if before is None:
+        doc = _timelines.find_one({"_id": username}, {"items": {"$slice": limit}})
+        return (doc or {}).get("items", [])
+
+    older = {"$filter": {"input": "$items", "cond": {"$lt": ["$$this", before]}}}
+    pipeline = [
+        {"$match": {"_id": username}},
+        {"$project": {"items": {"$slice": [older, limit]}}},
+    ]
+    docs = list(_timelines.aggregate(pipeline))
+    return docs[0]["items"] if docs else []
+
+
+def _serialize(activity):
+    activity["_id"] = str(activity["_id"])
+    return activity
+
+
+def get_page(username, cursor=None, limit=None):
+    """
+    One page of the user's feed, newest first: their fanned-out timeline
+    merged with the recent activities of the celebrities they follow.
+
+    Returns:
+        tuple: (activities, next_cursor); next_cursor is None on the last page.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    limit = max(1, min(limit or Config.FEED_PAGE_SIZE, MAX_PAGE_SIZE))
+    before = None
+    if cursor:
+        try:
+            before = ObjectId(cursor)
+        except (InvalidId, TypeError):
+            raise ValueError("Invalid cursor")
+
+    user = _users.find_one({"username": username}, {"following": 1}) or {}
+    following = set(user.get("following") or [])
+    if not following:
+        return [], None
+
+    celebrities = [
+        doc["username"]
+        for doc in _users.find(
+            {"username": {"$in": list(following)}, **_is_celebrity_query()}, {"username": 1}
+        )
+    ]
+
+    # Activity ids sort by creation time, so both sources merge on _id
+    query = {"actor": {"$in": celebrities}}
+    if before is not None:
+        query["_id"] = {"$lt": before}
+    merged = {}
+    if celebrities:
+        for doc in _activities.find(query).sort("_id", -1).limit(limit + 1):
+            merged[doc["_id"]] = doc
+
+    ids = sorted(set(_timeline_ids(username, before, limit + 1)) | set(merged), reverse=True)
+    ids = ids[: limit + 1]
+    next_cursor = str(ids[limit - 1]) if len(ids) > limit else None
+    ids = ids[:limit]
+
+    fanned_out = [i for i in ids if i not in merged]
+    docs, _ = references.fetch_by_ids(_activities, [str(i) for i in fanned_out])
+    merged.update((doc["_id"], doc) for doc in docs)
+
+    # Deleted subjects and unfollowed actors drop out of the page
+    activities = [
+        _serialize(merged[i]) for i in ids if i in merged and merged[i]["actor"] in following
+    ]
+    return activities, next_cursor
@@ -0,0 +1,195 @@
+from pymongo import ASCENDING, DESCENDING, IndexModel, errors
+
+# Indexes every collection needs, keyed by the name used in app.config["collections"]
+REQUIRED_INDEXES = {
+    "users": [
+        # Partial, so documents without the field don't collide on null
+        IndexModel(
+            [("username", ASCENDING)],
+            name="username_unique",
+            unique=True,
+            partialFilterExpression={"username": {"$type": "string"}},
+        ),
+        IndexModel(
+            [("email", ASCENDING)],
+            name="email_unique",
+            unique=True,
+            partialFilterExpression={"email": {"$type": "string"}},
+        ),
+    ],
+    "reviews": [
+        IndexModel(
+            [("media_type", ASCENDING), ("media_id", ASCENDING), ("created_at", DESCENDING)],
+            name="media_created_at",
+        ),
+        IndexModel(
+            [
+                ("media_type", ASCENDING),
+                ("media_id", ASCENDING),
+                ("score", DESCENDING),
+                ("created_at", DESCENDING),
+            ],
+            name="media_popular",
+        ),
+        # Keyset pages of /api/reviews/user/<username> and /api/reviews/recent
+        IndexModel(
+            [("user_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+            name="user_recent",
+        ),
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)], name="recent"),
+    ],
+    "comments": [
+        IndexModel(
+            [("review_id", ASCENDING), ("parent_id", ASCENDING), ("_id", ASCENDING)],
+            name="review_thread",
+        ),
+        IndexModel([("parent_id", ASCENDING), ("_id", ASCENDING)], name="replies"),
+    ],
+    "activities": [
+        IndexModel([("actor", ASCENDING), ("_id", DESCENDING)], name="actor_recent"),
+        IndexModel([("subject_id", ASCENDING)], name="subject_id"),
+    ],
+    "movieLogs": [IndexModel([("username", ASCENDING)], name="username")],
+    "tvLogs": [IndexModel([("username", ASCENDING)], name="username")],
+    "bookLogs": [IndexModel([("username", ASCENDING)], name="username")],
+    "musicLogs": [IndexModel([("username", ASCENDING)], name="username")],
+    "logEntries": [
+        IndexModel(
+            [
+                ("username", ASCENDING),
+                ("media_type", ASCENDING),
+                ("section", ASCENDING),
+                ("_id", ASCENDING),
+            ],
+            name="user_section",
+        ),
+        IndexModel(
+            [
+                ("username", ASCENDING),
+                ("media_type", ASCENDING),
+                ("section", ASCENDING),
+                ("date", ASCENDING),
+                ("_id", ASCENDING),
+            ],
+            name="user_section_date",
+        ),
+        IndexModel(
+            [
+                ("username", ASCENDING),
+                ("media_type", ASCENDING),
+                ("section", ASCENDING),
+                ("media_id", ASCENDING),
+            ],
+            name="user_section_media",
+        ),
+    ],
+    "lists": [
+        IndexModel([("user_id", ASCENDING)], name="user_id"),
+        IndexModel([("isPublic", ASCENDING), ("updated_at", DESCENDING)], name="public_updated_at"),
+    ],
+    "collages": [
+        IndexModel([("username", ASCENDING)], name="username"),
+        IndexModel([("updated_at", DESCENDING)], name="updated_at"),
+    ],
+    "responseCache": [
+        IndexModel([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0),
+        IndexModel([("stored_at", ASCENDING)], name="stored_at"),
+    ],
+    "promptCache": [
+        IndexModel([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0),
+        IndexModel([("stored_at", ASCENDING)], name="stored_at"),
+    ],
+    "resolutionIndex": [
+        IndexModel([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0),
+    ],
+}
+
+
+def _key_of(index_model):
+    return list(index_model.document["key"].items())
+
+
+def _unused_indexes(collection):
+    """Names of indexes with no recorded use since the server started"""
+    try:
+        stats = collection.aggregate([{"$indexStats": {}}])
+        return sorted(
+            s["name"] for s in stats if s["name"] != "_id_" and s["accesses"]["ops"] == 0
+        )
+    except errors.OperationFailure:
+        # $indexStats needs the clusterMonitor role on some deployments
+        return []
+
+
+def _mismatches(index_model, info):
+    """Options of an existing index on the same key that differ from the required ones"""
+    required = index_model.document
+    differences = []
+    if bool(required.get("unique")) != bool(info.get("unique")):
+        differences.append(f"unique={bool(info.get('unique'))}")
+    for option in ("expireAfterSeconds", "partialFilterExpression"):
+        if required.get(option) != info.get(option):
+            differences.append(f"{option}={info.get(option)}")
+    return differences
+
+
+def provision(app):
+    """
+    Create any missing required index and report on the current state.
+
+    Returns:
+        dict: Per collection, the indexes that were "created", the ones that
+        "failed" (e.g. a unique index over duplicate data), the required ones
+        an existing index "mismatched" (same key, other unique/TTL/partial
+        options; left for an operator to replace) and the existing ones that
+        are "unused".
+    """
+    collections = app.config["collections"]
+    report = {}
+
+    try:
+        for name, required in REQUIRED_INDEXES.items():
+            collection = collections.get(name)
+            if collection is None:
+                continue
+
+            entry = {"created": [], "failed": [], "mismatched": [], "unused": []}
+            report[name] = entry
+            try:
+                existing = {
+                    tuple(info["key"]): info for info in collection.index_information().values()
+                }
+            except errors.OperationFailure as e:
+                entry["failed"] = [index.document["name"] for index in required]
+                print(f"❌ Could not read indexes of {name}: {e}")
+                continue
+
+            for index in required:
+                index_name = index.document["name"]
+                info = existing.get(tuple(_key_of(index)))
+                if info is not None:
+                    differences = _mismatches(index, info)
+                    if differences:
+                        entry["mismatched"].append(index_name)
+                        print(
+                            f"⚠️ Index {name}.{index_name} exists with other options "
+                            f"({', '.join(differences)})"
+                        )
+                    continue
+                try:
+                    collection.create_indexes([index])
+                    entry["created"].append(index_name)
+                except errors.OperationFailure as e:
+                    entry["failed"].append(index_name)
+                    print(f"❌ Could not create index {name}.{index_name}: {e}")
+            entry["unused"] = _unused_indexes(collection)
+    except (errors.ConnectionFailure, errors.ServerSelectionTimeoutError) as e:
+        print(f"❌ Skipping index provisioning, database unreachable: {e}")
+        return report
+
+    for name, entry in report.items():
+        if entry["created"]:
+            print(f"✅ Created indexes on {name}: {', '.join(entry['created'])}")
+        if entry["unused"]:
+            print(f"⚠️ Unused indexes on {name}: {', '.join(entry['unused'])}")
+    return report
@@ -0,0 +1,75 @@
+import json
+
+
+class JsonItemStream:
+    """
+    Pull complete JSON objects out of a JSON document that arrives in chunks.
+
+    Every object that is an element of an array is emitted as soon as its
+    closing brace arrives, together with the key the array sits under in its
+    parent object (None for a top-level array). Text outside the document,
+    such as markdown code fences, is ignored.
+
+    Example:
+        >>> stream = JsonItemStream()
+        >>> stream.feed('{"movies": [{"title": "Alien", ')
+        []
+        >>> stream.feed('"year": 1979}, ')
+        [('movies', {'title': 'Alien', 'year': 1979})]
+    """
+
+    def __init__(self):
+        self.text = ""
+        self._pos = 0
+        # Open brackets: (char, key of the array in its parent object)
+        self._stack = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = None
+        self._last_string = None
+        self._item_start = None
+        self._item_depth = None
+
+    def feed(self, chunk):
+        """Consume the next chunk and return the (key, object) pairs it completed"""
+        self.text += chunk
+        items = []
+
+        while self._pos < len(self.text):
+            i = self._pos
+            c = self.text[i]
+            self._pos += 1
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    self._last_string = self.text[self._string_start + 1:i]
+                continue
+
+            if c == '"' and self._stack:
+                self._in_string = True
+                self._string_start = i
+            elif c == "{":
+                if self._item_start is None and self._stack and self._stack[-1][0] == "[":
+                    self._item_start = i
+                    self._item_depth = len(self._stack)
+                self._stack.append(("{", None))
+            elif c == "[":
+                key = self._last_string if self._stack and self._stack[-1][0] == "{" else None
+                self._stack.append(("[", key))
+            elif c in "}]" and self._stack:
+                self._stack.pop()
+                if c == "}" and self._item_start is not None and len(self._stack) == self._item_depth:
+                    try:
+                        item = json.loads(self.text[self._item_start:i + 1])
+                        items.append((self._stack[-1][1], item))
+                    except ValueError:
+                        pass
+                    self._item_start = None
+                    self._item_depth = None
+
+        return items
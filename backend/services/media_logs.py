@@ -0,0 +1,334 @@
+import base64
+import datetime
+import json
+
+from flask import jsonify
+from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import ASCENDING, DESCENDING
+
+# Layout of the legacy per-user log documents, by media type
+MEDIA_TYPES = {
+    "movie": {
+        "collection": "movieLogs",
+        "sections": ("movieLog", "watchLater"),
+        "log_section": "movieLog",
+        "id_field": "movieId",
+        "date_field": "watchDate",
+    },
+    "tv": {
+        "collection": "tvLogs",
+        "sections": ("tvLog", "watchLater"),
+        "log_section": "tvLog",
+        "id_field": "tvId",
+        "date_field": "watchDate",
+    },
+    "book": {
+        "collection": "bookLogs",
+        "sections": ("bookLog", "readLater"),
+        "log_section": "bookLog",
+        "id_field": "bookId",
+        "date_field": "readDate",
+    },
+    "music": {
+        "collection": "musicLogs",
+        "sections": ("musicLog", "listenLater"),
+        "log_section": "musicLog",
+        "id_field": "trackId",
+        "date_field": "listenDate",
+    },
+}
+
+# Bookkeeping fields stored next to the original entry fields
+INTERNAL_FIELDS = ("username", "media_type", "section", "media_id", "date", "created_at")
+
+# Bookkeeping fields the endpoints never return (the date is kept for cursors)
+ENTRY_PROJECTION = {f: 0 for f in INTERNAL_FIELDS if f != "date"}
+
+MAX_PAGE_SIZE = 100
+
+_collection = None
+_listeners = []
+
+
+def init_app(app):
+    """Attach the log entry collection once the database is connected"""
+    global _collection
+    _collection = app.config["collections"].get("logEntries")
+
+
+def get_collection():
+    return _collection
+
+
+def on_change(listener):
+    """Call `listener(doc, delta)` after an entry is added (+1) or removed (-1)"""
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def _notify(doc, delta):
+    for listener in _listeners:
+        try:
+            listener(doc, delta)
+        except Exception as e:
+            print(f"❌ Log change listener {listener.__name__} failed: {e}")
+
+
+def parse_list(value):
+    """Accept a list or a comma-separated string (as sent for tags/genres)"""
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(",")
+    return [str(v).strip() for v in value if str(v).strip()]
+
+
+def is_valid_section(media_type, section):
+    return section in MEDIA_TYPES[media_type]["sections"]
+
+
+def is_log_section(media_type, section):
+    """Whether entries in `section` count towards the user's media total"""
+    return section == MEDIA_TYPES[media_type]["log_section"]
+
+
+def to_object_id(value):
+    """Parse an entry id sent by the client, or None if it is malformed"""
+    if isinstance(value, ObjectId):
+        return value
+    try:
+        return ObjectId(str(value))
+    except (InvalidId, TypeError):
+        return None
+
+
+def make_document(username, media_type, section, entry):
+    """Build the stored document for one entry in its original shape"""
+    layout = MEDIA_TYPES[media_type]
+    doc = dict(entry)
+    doc["_id"] = to_object_id(doc.get("_id")) or ObjectId()
+    doc.update(
+        {
+            "username": username,
+            "media_type": media_type,
+            "section": section,
+            "media_id": str(entry.get(layout["id_field"])),
+            "date": entry.get(layout["date_field"]),
+            "created_at": doc["_id"].generation_time.replace(tzinfo=None),
+        }
+    )
+    return doc
+
+
+def serialize(doc):
+    """Strip bookkeeping fields so entries look like the legacy array items"""
+    entry = {k: v for k, v in doc.items() if k not in INTERNAL_FIELDS}
+    entry["_id"] = str(entry["_id"])
+    return entry
+
+
+def add_entry(username, media_type, section, entry):
+    """Store a new entry and return it serialized"""
+    doc = make_document(username, media_type, section, entry)
+    _collection.insert_one(doc)
+    _notify(doc, 1)
+    return serialize(doc)
+
+
+def has_entry(username, media_type, section, media_id):
+    query = {
+        "username": username,
+        "media_type": media_type,
+        "section": section,
+        "media_id": str(media_id),
+    }
+    return _collection.find_one(query, {"_id": 1}) is not None
+
+
+def count_entries(username, media_type, section):
+    return _collection.count_documents(build_query(username, media_type, section))
+
+
+def remove_entry(username, media_type, section, entry_id):
+    """Delete one entry, returning the deleted document or None"""
+    entry_id = to_object_id(entry_id)
+    if entry_id is None:
+        return None
+    doc = _collection.find_one_and_delete(
+        {
+            "_id": entry_id,
+            "username": username,
+            "media_type": media_type,
+            "section": section,
+        }
+    )
+    if doc is not None:
+        _notify(doc, -1)
+    return doc
+
+
+def _encode_cursor(doc):
+    payload = json.dumps([doc.get("date"), str(doc["_id"])])
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def _decode_cursor(cursor):
+    try:
+        date, entry_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return date, ObjectId(entry_id)
+    except (ValueError, TypeError, InvalidId):
+        raise ValueError("Invalid cursor")
+
+
+def _after(sort, descending, date, entry_id):
+    """Query for everything past (date, entry_id) in the requested order"""
+    id_op = "$lt" if descending else "$gt"
+    if sort == "added":
+        return {"_id": {id_op: entry_id}}
+
+    # Undated entries sort before every date, and range operators only
+    # match values of the same type, so they need their own branch
+    same_date = {"date": date, "_id": {id_op: entry_id}}
+    if date is None:
+        if descending:
+            return same_date
+        return {"$or": [same_date, {"date": {"$ne": None}}]}
+    if descending:
+        return {"$or": [{"date": {"$lt": date}}, same_date, {"date": None}]}
+    return {"$or": [{"date": {"$gt": date}}, same_date]}
+
+
+def build_query(username, media_type, section, filters=None):
+    """
+    Query for one section of a user's log.
+
+    Args:
+        filters (dict): Optional "min_rating"/"max_rating" (numbers), "tag",
+            and "date_from"/"date_to" (YYYY-MM-DD, inclusive).
+    """
+    query = {"username": username, "media_type": media_type, "section": section}
+    filters = filters or {}
+
+    rating = {}
+    if filters.get("min_rating") is not None:
+        rating["$gte"] = filters["min_rating"]
+    if filters.get("max_rating") is not None:
+        rating["$lte"] = filters["max_rating"]
+    if rating:
+        query["rating"] = rating
+
+    if filters.get("tag"):
+        query["tags"] = filters["tag"]
+
+    date = {}
+    if filters.get("date_from"):
+        date["$gte"] = filters["date_from"]
+    if filters.get("date_to"):
+        date["$lte"] = filters["date_to"]
+    if date:
+        query["date"] = date
+
+    return query
+
+
+def list_entries(query, limit=None, cursor=None, sort="added", descending=False):
+    """
+    Entries matching `query`, ordered by when they were added ("added") or
+    by their watch/read/listen date ("date", ties broken by _id).
+
+    Args:
+        limit (int): Page size, or None for every matching entry.
+        cursor (str): `next_cursor` of the previous page.
+
+    Returns:
+        tuple: (entries, next_cursor); next_cursor is None on the last page.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    if cursor:
+        query = {"$and": [query, _after(sort, descending, *_decode_cursor(cursor))]}
+
+    direction = DESCENDING if descending else ASCENDING
+    if sort == "added":
+        order = [("_id", direction)]
+    else:
+        order = [("date", direction), ("_id", direction)]
+
+    results = _collection.find(query, ENTRY_PROJECTION).sort(order)
+    if limit is None:
+        return [serialize(doc) for doc in results], None
+
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    docs = list(results.limit(limit + 1))
+    next_cursor = _encode_cursor(docs[limit - 1]) if len(docs) > limit else None
+    return [serialize(doc) for doc in docs[:limit]], next_cursor
+
+
+def newest_page(username, media_type, section, limit):
+    """First page of a section, newest date first, with its total"""
+    query = build_query(username, media_type, section)
+    entries, next_cursor = list_entries(query, limit=limit, sort="date", descending=True)
+    return {
+        "entries": entries,
+        "next_cursor": next_cursor,
+        "total": _collection.count_documents(query),
+    }
+
+
+def _parse_date(value):
+    if value:
+        datetime.datetime.strptime(value, "%Y-%m-%d")
+    return value
+
+
+def section_response(username, media_type, section, args):
+    """
+    Response for the log GET endpoints.
+
+    Without a `limit` query parameter the whole section is returned as a JSON
+    array in the order entries were added, as before. With one, a page
+    `{"entries": [...], "next_cursor": ..., "total": ...}` is returned, newest
+    date first unless `sort` ("date" or "added") and `order` ("asc" or
+    "desc") say otherwise. `min_rating`, `max_rating`, `tag`, `date_from` and
+    `date_to` filter either form; `total` counts every matching entry.
+    """
+    limit = args.get("limit", type=int)
+    sort = args.get("sort", "date" if limit is not None else "added")
+    order = args.get("order", "desc" if limit is not None else "asc")
+    if sort not in ("date", "added") or order not in ("asc", "desc"):
+        return jsonify({"error": "sort must be 'date' or 'added', order 'asc' or 'desc'"}), 400
+
+    try:
+        filters = {
+            "min_rating": args.get("min_rating", type=float),
+            "max_rating": args.get("max_rating", type=float),
+            "tag": args.get("tag"),
+            "date_from": _parse_date(args.get("date_from")),
+            "date_to": _parse_date(args.get("date_to")),
+        }
+    except ValueError:
+        return jsonify({"error": "Invalid date format. Use YYYY-MM-DD."}), 400
+
+    query = build_query(username, media_type, section, filters)
+    try:
+        entries, next_cursor = list_entries(
+            query,
+            limit=limit,
+            cursor=args.get("cursor"),
+            sort=sort,
+            descending=order == "desc",
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    if limit is None:
+        return jsonify(entries)
+    return jsonify(
+        {
+            "entries": entries,
+            "next_cursor": next_cursor,
+            "total": _collection.count_documents(query),
+        }
+    )
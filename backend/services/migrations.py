@@ -0,0 +1,225 @@
+import datetime
+
+from bson import ObjectId
+from pymongo import UpdateOne
+
+from services import media_logs, review_summaries
+
+# Registered data migrations, by name
+MIGRATIONS = {}
+
+
+def migration(name):
+    """Register `fn(collections)` as a named, re-runnable migration"""
+
+    def decorator(fn):
+        MIGRATIONS[name] = fn
+        return fn
+
+    return decorator
+
+
+# Migrations run at startup, with the options that limit each one to the
+# documents not migrated yet (review-media-ids only ever reads those)
+STARTUP_MIGRATIONS = {
+    "log-entries": {"pending_only": True},
+    "review-reaction-counts": {"pending_only": True},
+    "review-media-ids": {},
+}
+
+
+def run(name, collections):
+    """
+    Run one migration by name.
+
+    Returns:
+        dict: The migration's report.
+
+    Raises:
+        KeyError: If no migration has that name.
+    """
+    return MIGRATIONS[name](collections)
+
+
+def run_startup(collections):
+    """Run STARTUP_MIGRATIONS; one that fails is logged and the rest still run"""
+    for name, options in STARTUP_MIGRATIONS.items():
+        try:
+            MIGRATIONS[name](collections, **options)
+        except Exception as e:
+            print(f"❌ Error running migration {name}: {e}")
+
+
+@migration("log-entries")
+def migrate_log_entries(collections, pending_only=False):
+    """
+    Copy entries of the per-user movie/tv/book/music log documents into the
+    logEntries collection, one document per entry. Entries keep their _id, so
+    running it again only fills in what is missing. Copied log documents are
+    stamped with migrated_at; with `pending_only`, only unstamped ones are read.
+    Cached stats of users who got entries are dropped, to be rebuilt.
+    """
+    entries_col = collections["logEntries"]
+    report = {}
+    updated_users = set()
+
+    query = {"migrated_at": {"$exists": False}} if pending_only else {}
+    for media_type, layout in media_logs.MEDIA_TYPES.items():
+        logs_col = collections[layout["collection"]]
+        copied = 0
+        users = 0
+        for log_doc in logs_col.find(query):
+            users += 1
+            for section in layout["sections"]:
+                for entry in log_doc.get(section) or []:
+                    doc = media_logs.make_document(
+                        log_doc["username"], media_type, section, entry
+                    )
+                    result = entries_col.update_one(
+                        {"_id": doc["_id"]}, {"$setOnInsert": doc}, upsert=True
+                    )
+                    if result.upserted_id is not None:
+                        copied += 1
+                        updated_users.add(log_doc["username"])
+            logs_col.update_one(
+                {"_id": log_doc["_id"]}, {"$set": {"migrated_at": datetime.datetime.utcnow()}}
+            )
+        report[media_type] = {"users": users, "copied": copied}
+        print(f"✅ Migrated {copied} {media_type} log entries for {users} users")
+
+    stats_col = collections.get("userStats")
+    if updated_users and stats_col is not None:
+        stats_col.delete_many({"_id": {"$in": list(updated_users)}})
+    return report
+
+
+def _with_counts(doc):
+    doc["likes_count"] = len(doc.get("likes") or [])
+    doc["dislikes_count"] = len(doc.get("dislikes") or [])
+    return doc
+
+
+@migration("review-reaction-counts")
+def backfill_review_reaction_counts(collections, batch_size=500, pending_only=False):
+    """
+    Set likes_count/dislikes_count/score on every review (with `pending_only`,
+    only on reviews that have no score yet), and the counts on its embedded
+    comments and replies, from the reaction arrays.
+    """
+    reviews_col = collections["reviews"]
+    updated = 0
+    batch = []
+
+    query = {"score": {"$exists": False}} if pending_only else {}
+    projection = {"likes": 1, "dislikes": 1, "comments": 1}
+    for review in reviews_col.find(query, projection):
+        _with_counts(review)
+        for comment in review.get("comments") or []:
+            _with_counts(comment)
+            for reply in comment.get("replies") or []:
+                _with_counts(reply)
+
+        fields = {
+            "likes_count": review["likes_count"],
+            "dislikes_count": review["dislikes_count"],
+            "score": review["likes_count"] - review["dislikes_count"],
+        }
+        if review.get("comments"):
+            fields["comments"] = review["comments"]
+        batch.append(UpdateOne({"_id": review["_id"]}, {"$set": fields}))
+
+        if len(batch) >= batch_size:
+            updated += reviews_col.bulk_write(batch, ordered=False).modified_count
+            batch = []
+    if batch:
+        updated += reviews_col.bulk_write(batch, ordered=False).modified_count
+
+    print(f"✅ Backfilled reaction counts on {updated} reviews")
+    return {"updated": updated}
+
+
+def _comment_document(comment, review_id, parent_id):
+    doc = _with_counts(dict(comment))
+    for field in ("replies", "parent_comment_id"):
+        doc.pop(field, None)
+    comment_id = str(comment.get("_id"))
+    doc["_id"] = ObjectId(comment_id) if ObjectId.is_valid(comment_id) else ObjectId()
+    doc.update(
+        {
+            "review_id": review_id,
+            "parent_id": parent_id,
+            "likes": doc.get("likes") or [],
+            "dislikes": doc.get("dislikes") or [],
+            "score": doc["likes_count"] - doc["dislikes_count"],
+            "reply_count": len(comment.get("replies") or []),
+        }
+    )
+    return doc
+
+
+@migration("review-comments")
+def migrate_review_comments(collections):
+    """
+    Move comments and replies embedded in reviews into the comments
+    collection (replies point at their comment through parent_id), then
+    drop the embedded arrays and record each review's comment_count.
+    Comments keep their ids, so running it again is safe.
+    """
+    reviews_col = collections["reviews"]
+    comments_col = collections["comments"]
+    moved = 0
+    reviews = 0
+
+    for review in reviews_col.find({"comments": {"$exists": True}}, {"comments": 1}):
+        docs = []
+        for comment in review.get("comments") or []:
+            parent = _comment_document(comment, review["_id"], None)
+            docs.append(parent)
+            for reply in comment.get("replies") or []:
+                docs.append(_comment_document(reply, review["_id"], parent["_id"]))
+
+        if docs:
+            comments_col.bulk_write(
+                [UpdateOne({"_id": d["_id"]}, {"$setOnInsert": d}, upsert=True) for d in docs],
+                ordered=False,
+            )
+        reviews_col.update_one(
+            {"_id": review["_id"]},
+            {"$unset": {"comments": ""}, "$set": {"comment_count": len(docs)}},
+        )
+        moved += len(docs)
+        reviews += 1
+
+    print(f"✅ Moved {moved} comments out of {reviews} reviews")
+    return {"reviews": reviews, "comments": moved}
+
+
+@migration("review-media-ids")
+def normalize_review_media_ids(collections, batch_size=500):
+    """
+    Store every review's media_id as a string, the form create_review writes,
+    so reviews of one media item are found by a single equality match.
+    Summaries of the items touched are dropped, as they were built without
+    these reviews.
+    """
+    reviews_col = collections["reviews"]
+    updated = 0
+    batch = []
+    affected = set()
+
+    query = {"media_id": {"$exists": True, "$not": {"$type": "string"}}}
+    for review in reviews_col.find(query, {"media_type": 1, "media_id": 1}):
+        media_id = review_summaries.canonical_media_id(review["media_id"])
+        affected.add((review.get("media_type"), media_id))
+        batch.append(UpdateOne({"_id": review["_id"]}, {"$set": {"media_id": media_id}}))
+
+        if len(batch) >= batch_size:
+            updated += reviews_col.bulk_write(batch, ordered=False).modified_count
+            batch = []
+    if batch:
+        updated += reviews_col.bulk_write(batch, ordered=False).modified_count
+
+    summaries_removed = review_summaries.invalidate(affected)
+
+    print(f"✅ Normalized media_id on {updated} reviews, dropped {summaries_removed} summaries")
+    return {"updated": updated, "summaries_removed": summaries_removed}
@@ -0,0 +1,119 @@
+import base64
+from concurrent.futures import ThreadPoolExecutor
+
+from services import upstream
+from services.config import Config
+
+
+def _fetch_page(url, params, headers, page):
+    response = upstream.get(url, headers=headers, params={**params, "page": page})
+    response.raise_for_status()
+    return response.json()
+
+
+def encode_page_cursor(page, offset):
+    return base64.urlsafe_b64encode(f"{page}:{offset}".encode()).decode()
+
+
+def decode_page_cursor(cursor):
+    """Turn a search cursor back into (TMDB page, offset). Raises ValueError if invalid."""
+    if not cursor:
+        return 1, 0
+    try:
+        page, offset = (int(v) for v in base64.urlsafe_b64decode(cursor.encode()).decode().split(":"))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if page < 1 or offset < 0:
+        raise ValueError("Invalid cursor")
+    return page, offset
+
+
+def search(url, params, headers=None, transform=None, cursor=None, limit=None,
+           max_pages=None, max_workers=None):
+    """
+    One cursor page of results from a paged TMDB endpoint, fetching only the
+    TMDB pages needed to fill it.
+
+    The cursor holds the TMDB page to resume from and the offset of the next
+    item within it (after `transform`). The first page fetched tells
+    `total_pages`; further pages are fetched concurrently on a bounded worker
+    pool, about as many as the remaining `limit` needs. Without `limit`,
+    every page is fetched.
+
+    Args:
+        url (str): Paged endpoint, e.g. ".../search/tv".
+        params (dict): Query parameters (without "page").
+        headers (dict): Request headers.
+        transform (callable): Maps each raw result to the returned item, or
+            to None to drop it (e.g. filtered out).
+        cursor (str): `next_cursor` of the previous call.
+        limit (int): Items per call, or None for all of them.
+        max_pages (int): Upper bound on TMDB pages.
+        max_workers (int): Upper bound on concurrent requests.
+
+    Returns:
+        tuple: (items, next_cursor). `next_cursor` is None on the last page.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+        requests.RequestException: If any page fails.
+    """
+    max_pages = max_pages or Config.SEARCH_MAX_PAGES
+    max_workers = max_workers or Config.SEARCH_MAX_WORKERS
+    transform = transform or (lambda item: item)
+    start_page, offset = decode_page_cursor(cursor)
+    if start_page > max_pages:
+        return [], None
+
+    first = _fetch_page(url, params, headers, start_page)
+    total_pages = min(first.get("total_pages") or 1, max_pages)
+
+    items = []
+    fetched, kept = 0, 0
+    batch = [(start_page, first)]
+    next_page = start_page + 1
+    while batch:
+        for number, page in batch:
+            results = [transform(item) for item in page.get("results", [])]
+            results = [item for item in results if item is not None]
+            fetched, kept = fetched + 1, kept + len(results)
+            for index in range(offset if number == start_page else 0, len(results)):
+                if limit and len(items) == limit:
+                    return items, encode_page_cursor(number, index)
+                items.append(results[index])
+
+        if next_page > total_pages:
+            break
+        if limit and len(items) == limit:
+            return items, encode_page_cursor(next_page, 0)
+
+        count = total_pages - next_page + 1
+        if limit:
+            # Guess the pages still needed from how many items pages yield so far
+            needed = limit - len(items)
+            count = min(count, -(-needed * fetched // max(kept, 1)))
+        numbers = list(range(next_page, next_page + min(count, max_workers)))
+        with ThreadPoolExecutor(max_workers=len(numbers)) as pool:
+            pages = pool.map(lambda n: _fetch_page(url, params, headers, n), numbers)
+            batch = list(zip(numbers, pages))
+        next_page = numbers[-1] + 1
+
+    return items, None
+
+
+def encode_cursor(offset):
+    return base64.urlsafe_b64encode(str(offset).encode()).decode()
+
+
+def decode_cursor(cursor):
+    """Turn an opaque cursor back into an offset. Raises ValueError if invalid."""
+    if not cursor:
+        return 0
+    try:
+        offset = int(base64.urlsafe_b64decode(cursor.encode()).decode())
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if offset < 0:
+        raise ValueError("Invalid cursor")
+    return offset
+
@@ -0,0 +1,41 @@
+import hashlib
+import json
+import re
+
+from services.cache import MemoryCache, MongoCache, TieredCache
+from services.config import Config
+
+_cache = MemoryCache(1024)
+
+
+def init_app(app):
+    """Share cached LLM results through MongoDB once the database is connected"""
+    global _cache
+    collection = app.config["collections"].get("promptCache")
+    if collection is not None:
+        _cache = TieredCache(
+            MemoryCache(1024), MongoCache(collection, Config.PROMPT_CACHE_MAX_ENTRIES)
+        )
+
+
+def normalize_prompt(prompt):
+    """Case, whitespace and trailing punctuation don't change the answer"""
+    prompt = " ".join(str(prompt).lower().split())
+    return re.sub(r"[\s.!?]+$", "", prompt)
+
+
+def make_key(model, kind, prompt, *context):
+    """
+    Build a cache key from the model, the kind of request, the normalized
+    prompt and any extra context (e.g. titles to exclude).
+    """
+    payload = json.dumps([model, kind, normalize_prompt(prompt), *context], sort_keys=True)
+    return f"prompt:{hashlib.sha256(payload.encode()).hexdigest()}"
+
+
+def get(key):
+    return _cache.get(key)
+
+
+def set(key, value):
+    _cache.set(key, value, Config.PROMPT_CACHE_TTL)
@@ -0,0 +1,79 @@
+from bson import ObjectId
+
+from services import paged_search
+
+
+def fetch_by_ids(collection, ids, projection=None, pipeline=None):
+    """
+    Load the documents behind a stored list of id strings with one $in query.
+
+    Args:
+        collection: Collection the ids point into.
+        ids (list): Id strings, e.g. a user's bookmarked_reviews.
+        projection (dict): Fields to return (ignored when `pipeline` is given).
+        pipeline (list): Aggregation stages to run after the $in match, for
+            projections that compute fields.
+
+    Returns:
+        tuple: (docs in the order of `ids`, ids that matched no document).
+    """
+    object_ids = [ObjectId(i) for i in ids if ObjectId.is_valid(i)]
+    match = {"_id": {"$in": object_ids}}
+    if pipeline is not None:
+        results = collection.aggregate([{"$match": match}] + pipeline)
+    else:
+        results = collection.find(match, projection)
+
+    by_id = {str(doc["_id"]): doc for doc in results} if object_ids else {}
+    docs = [by_id[str(i)] for i in ids if str(i) in by_id]
+    missing = [i for i in ids if str(i) not in by_id]
+    return docs, missing
+
+
+def fetch_page(collection, ids, cursor=None, limit=None, projection=None, pipeline=None):
+    """
+    One cursor page of the documents behind a stored id list. Ids that no
+    longer resolve are skipped (the page is filled from further ids) and
+    reported, for the caller to prune.
+
+    The cursor is an offset into the list as it is once the missing ids are
+    pruned, so the next page starts at the first id not yet shown.
+
+    Returns:
+        tuple: (docs, missing ids, next_cursor). `next_cursor` is None on the
+        last page.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    offset = paged_search.decode_cursor(cursor)
+    if not limit:
+        docs, missing = fetch_by_ids(collection, ids[offset:], projection, pipeline)
+        return docs, missing, None
+
+    docs, missing = [], []
+    end = offset
+    while len(docs) < limit and end < len(ids):
+        chunk = ids[end:end + limit - len(docs)]
+        found, gone = fetch_by_ids(collection, chunk, projection, pipeline)
+        docs += found
+        missing += gone
+        end += len(chunk)
+
+    next_cursor = paged_search.encode_cursor(end - len(missing)) if end < len(ids) else None
+    return docs, missing, next_cursor
+
+
+def count_existing(collection, ids):
+    """How many of the stored ids still resolve, counted over the whole list"""
+    object_ids = [ObjectId(i) for i in ids if ObjectId.is_valid(i)]
+    if not object_ids:
+        return 0
+    return collection.count_documents({"_id": {"$in": object_ids}})
+
+
+def prune(users_col, username, field, missing):
+    """Drop ids that no longer resolve from a user's id list"""
+    if missing:
+        users_col.update_one({"username": username}, {"$pull": {field: {"$in": missing}}})
+        print(f"🧹 Removed {len(missing)} dangling ids from {username}'s {field}")
@@ -0,0 +1,111 @@
+import datetime
+import re
+import threading
+import unicodedata
+
+from services.cache import MemoryCache
+from services.config import Config
+
+# In-memory front for the MongoDB-backed index
+_front = MemoryCache(Config.RESOLUTION_INDEX_MAX_ENTRIES)
+_collection = None
+
+_counters = {"memory_hits": 0, "db_hits": 0, "misses": 0}
+_counters_lock = threading.Lock()
+
+
+def init_app(app):
+    """Attach the shared MongoDB index once the database is connected"""
+    global _collection
+    _collection = app.config["collections"].get("resolutionIndex")
+
+
+def normalize_title(title):
+    """Lowercase, strip accents/punctuation and collapse whitespace"""
+    title = unicodedata.normalize("NFKD", str(title))
+    title = "".join(c for c in title if not unicodedata.combining(c))
+    title = re.sub(r"[^\w\s]", " ", title.lower())
+    return " ".join(title.split())
+
+
+def make_key(media_type, title, year=None):
+    return f"{media_type}:{normalize_title(title)}:{year or ''}"
+
+
+def _count(counter):
+    with _counters_lock:
+        _counters[counter] += 1
+
+
+def resolve(media_type, title, year, lookup):
+    """
+    Resolve a (title, year) suggestion to a media record, memoized.
+
+    Args:
+        media_type (str): "movie", "tv" or "book".
+        title (str): Suggested title.
+        year (int): Suggested year, or None.
+        lookup (callable): `lookup(title, year)` hitting upstream on a miss.
+
+    Returns:
+        The record returned by `lookup`. "Not found" results are remembered
+        too, for RESOLUTION_INDEX_MISS_TTL seconds.
+
+    Raises:
+        Whatever `lookup` raises; failed lookups are not stored.
+    """
+    key = make_key(media_type, title, year)
+
+    entry = _front.get(key)
+    if entry is not None:
+        _count("memory_hits")
+        return entry["record"]
+
+    if _collection is not None:
+        now = datetime.datetime.utcnow()
+        doc = _collection.find_one({"_id": key, "expires_at": {"$gt": now}})
+        if doc is not None:
+            _count("db_hits")
+            entry = {"record": doc["record"]}
+            # Never keep the copy past the stored record's own expiry
+            remaining = (doc["expires_at"] - now).total_seconds()
+            _front.set(key, entry, min(Config.RESOLUTION_INDEX_MISS_TTL, remaining))
+            return entry["record"]
+
+    _count("misses")
+    record = lookup(title, year)
+    ttl = Config.RESOLUTION_INDEX_TTL if record else Config.RESOLUTION_INDEX_MISS_TTL
+    entry = {"record": record}
+    _front.set(key, entry, ttl)
+
+    if _collection is not None:
+        now = datetime.datetime.utcnow()
+        _collection.replace_one(
+            {"_id": key},
+            {
+                "media_type": media_type,
+                "record": record,
+                "resolved_at": now,
+                "expires_at": now + datetime.timedelta(seconds=ttl),
+            },
+            upsert=True,
+        )
+    return record
+
+
+def invalidate(media_type, title, year=None):
+    """Forget a single resolution so the next lookup goes upstream"""
+    key = make_key(media_type, title, year)
+    _front.delete(key)
+    if _collection is not None:
+        _collection.delete_one({"_id": key})
+
+
+def stats():
+    """Hit/miss counters for this process"""
+    with _counters_lock:
+        counters = dict(_counters)
+    total = sum(counters.values())
+    hits = counters["memory_hits"] + counters["db_hits"]
+    counters["hit_rate"] = round(hits / total, 4) if total else None
+    return counters
@@ -0,0 +1,212 @@
+import datetime
+
+from pymongo import errors
+
+from services.config import Config
+from services.stat_keys import decode_key, number, rating_key
+
+# Bumped when the layout of summary documents changes; documents in another
+# format are rebuilt on read
+SUMMARY_FORMAT = 2
+
+# Fields kept for each of a summary's top reviews
+TOP_REVIEW_FIELDS = {
+    "user_id": 1,
+    "title": 1,
+    "rating": 1,
+    "likes": 1,
+    "dislikes": 1,
+    "created_at": 1,
+}
+
+_collection = None
+_reviews = None
+
+
+def init_app(app):
+    """Attach the summary and review collections once the database is connected"""
+    global _collection, _reviews
+    _collection = app.config["collections"].get("reviewSummaries")
+    _reviews = app.config["collections"].get("reviews")
+
+
+def canonical_media_id(media_id):
+    """Reviews store media ids as strings (clients send TMDB ids as numbers)"""
+    if isinstance(media_id, float) and media_id.is_integer():
+        media_id = int(media_id)
+    return str(media_id)
+
+
+def media_query(media_type, media_id):
+    """Reviews of one media item, an equality match on the review indexes"""
+    return {"media_type": media_type, "media_id": canonical_media_id(media_id)}
+
+
+def reaction_count(array):
+    """
+    Aggregation expression for a review's likes/dislikes count; documents not
+    yet backfilled fall back to counting the array.
+    """
+    return {"$ifNull": [f"${array}_count", {"$size": {"$ifNull": [f"${array}", []]}}]}
+
+
+def _summary_id(media_type, media_id):
+    return f"{media_type}:{media_id}"
+
+
+def _top_reviews(media_type, media_id):
+    """
+    The most liked reviews (score, then newest), in response shape. Sorts on
+    the stored score (the media_popular index), which the startup backfill
+    sets on every review.
+    """
+    pipeline = [
+        {"$match": media_query(media_type, media_id)},
+        {"$sort": {"score": -1, "created_at": -1}},
+        {"$limit": Config.REVIEW_SUMMARY_TOP_REVIEWS},
+        {"$addFields": {"likes": reaction_count("likes"), "dislikes": reaction_count("dislikes")}},
+        {"$project": TOP_REVIEW_FIELDS},
+    ]
+    top = []
+    for review in _reviews.aggregate(pipeline):
+        review["_id"] = str(review["_id"])
+        top.append(review)
+    return top
+
+
+def compute(media_type, media_id):
+    """Build a media item's summary from scratch with one aggregation"""
+    pipeline = [
+        {"$match": media_query(media_type, media_id)},
+        {
+            "$addFields": {
+                "rating_value": {
+                    "$convert": {"input": "$rating", "to": "double", "onError": None, "onNull": None}
+                }
+            }
+        },
+        {"$match": {"rating_value": {"$ne": None}}},
+        {"$group": {"_id": "$rating_value", "count": {"$sum": 1}}},
+    ]
+    summary = {
+        "format": SUMMARY_FORMAT,
+        "media_type": media_type,
+        "media_id": canonical_media_id(media_id),
+        "count": 0,
+        "rating_sum": 0,
+        "histogram": {},
+    }
+    for row in _reviews.aggregate(pipeline):
+        summary["count"] += row["count"]
+        summary["rating_sum"] += row["_id"] * row["count"]
+        bucket = rating_key(row["_id"])
+        summary["histogram"][bucket] = summary["histogram"].get(bucket, 0) + row["count"]
+
+    now = datetime.datetime.utcnow()
+    summary["top_reviews"] = _top_reviews(media_type, media_id)
+    summary["computed_at"] = now
+    summary["top_refreshed_at"] = now
+    return summary
+
+
+def _present(doc):
+    """Response shape: decoded histogram keys and the average rating"""
+    count = doc.get("count", 0)
+    histogram = {decode_key(k): v for k, v in doc.get("histogram", {}).items() if v > 0}
+    return {
+        "media_type": doc["media_type"],
+        "media_id": doc["media_id"],
+        "count": count,
+        "average_rating": round(doc.get("rating_sum", 0) / count, 2) if count else None,
+        "histogram": histogram,
+        "top_reviews": doc.get("top_reviews", []),
+        "computed_at": doc.get("computed_at"),
+    }
+
+
+def _store(summary_id, doc, existing):
+    """
+    Persist a freshly computed summary over `existing` (None if there was no
+    document). The write is skipped if a review was applied in the meantime
+    (the version moved on, or apply_review created the document); the summary
+    is then recomputed on the next read. Media without reviews get no document.
+    """
+    try:
+        if existing is not None:
+            doc["version"] = existing.get("version")
+            _collection.replace_one({"_id": summary_id, "version": doc["version"]}, doc)
+        elif doc["top_reviews"]:
+            _collection.insert_one(dict(doc, _id=summary_id, version=0))
+    except errors.DuplicateKeyError:
+        pass
+
+
+def get(media_type, media_id, refresh=False):
+    """
+    A media item's review summary, from its summary document when there is one.
+    The counts are kept current by apply_review; the top reviews (whose order
+    follows reactions) are re-read once they are REVIEW_SUMMARY_TOP_TTL old.
+    Documents in an older format, or created by apply_review, are rebuilt.
+    """
+    summary_id = _summary_id(media_type, media_id)
+    doc = _collection.find_one({"_id": summary_id})
+    if refresh or doc is None or doc.get("format") != SUMMARY_FORMAT:
+        summary = compute(media_type, media_id)
+        _store(summary_id, summary, doc)
+        return _present(summary)
+
+    age = datetime.datetime.utcnow() - doc.get("top_refreshed_at", datetime.datetime.min)
+    if age.total_seconds() > Config.REVIEW_SUMMARY_TOP_TTL:
+        doc["top_reviews"] = _top_reviews(media_type, media_id)
+        doc["top_refreshed_at"] = datetime.datetime.utcnow()
+        _collection.update_one(
+            {"_id": summary_id},
+            {"$set": {"top_reviews": doc["top_reviews"], "top_refreshed_at": doc["top_refreshed_at"]}},
+        )
+    return _present(doc)
+
+
+def invalidate(items):
+    """Drop the summaries of (media_type, media_id) pairs, rebuilt on their next read"""
+    if _collection is None or not items:
+        return 0
+    summary_ids = [_summary_id(media_type, media_id) for media_type, media_id in items]
+    return _collection.delete_many({"_id": {"$in": summary_ids}}).deleted_count
+
+
+def apply_review(review, delta):
+    """
+    $inc the summary of the review's media item by one review (delta=±1).
+    The version is bumped even when there is no document yet (one is created
+    without a format, to be rebuilt on read), so a summary computed while the
+    review was being written is not stored over it.
+    """
+    if _collection is None:
+        return
+    media_type, media_id = review["media_type"], canonical_media_id(review["media_id"])
+    summary_id = _summary_id(media_type, media_id)
+
+    inc = {"version": 1}
+    rating = number(review.get("rating"))
+    if rating is not None:
+        inc.update(
+            {"count": delta, "rating_sum": delta * rating, f"histogram.{rating_key(rating)}": delta}
+        )
+
+    try:
+        update = {
+            "$inc": inc,
+            "$set": {
+                "top_reviews": _top_reviews(media_type, media_id),
+                "top_refreshed_at": datetime.datetime.utcnow(),
+            },
+            "$setOnInsert": {"media_type": media_type, "media_id": media_id},
+        }
+        _collection.update_one({"_id": summary_id}, update, upsert=True)
+    except errors.PyMongoError as e:
+        # Drop the summary rather than leave it wrong
+        print(f"❌ Error updating review summary {summary_id}: {e}")
+        try:
+            _collection.delete_one({"_id": summary_id})
+        except errors.PyMongoError:
+            pass
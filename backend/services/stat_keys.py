@@ -0,0 +1,23 @@
+# Numbers and map keys shared by the user stats and review summary documents
+
+
+def number(value):
+    """A rating/runtime as a float, or None if it isn't a number"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def encode_key(value):
+    # Map keys can't contain "." or "$" (e.g. a 4.5 rating)
+    return str(value).replace(".", "．").replace("$", "＄")
+
+
+def decode_key(value):
+    return value.replace("．", ".").replace("＄", "$")
+
+
+def rating_key(rating):
+    """Histogram key of a numeric rating (4.5 is stored as "4．5")"""
+    return encode_key(f"{rating:g}")
@@ -0,0 +1,84 @@
+import threading
+import time
+
+from services.config import Config
+
+# name -> loader; each loader fetches one trending list from upstream
+_loaders = {}
+# name -> (data, refreshed_at)
+_snapshots = {}
+_refreshing = set()
+_lock = threading.Lock()
+_worker = None
+
+
+def register(name, loader):
+    """Register a zero-argument loader that returns a trending list"""
+    _loaders[name] = loader
+
+
+def refresh(name):
+    """Run the loader for `name` and store its result. Raises on failure."""
+    data = _loaders[name]()
+    with _lock:
+        _snapshots[name] = (data, time.monotonic())
+    return data
+
+
+def _refresh_in_background(name):
+    with _lock:
+        if name in _refreshing:
+            return
+        _refreshing.add(name)
+
+    def run():
+        try:
+            refresh(name)
+        except Exception as e:
+            print(f"❌ Error refreshing trending snapshot '{name}': {e}")
+        finally:
+            with _lock:
+                _refreshing.discard(name)
+
+    threading.Thread(target=run, daemon=True).start()
+
+
+def get(name):
+    """
+    Return the snapshot for `name`.
+
+    A stale snapshot is served as-is while a refresh runs in the background
+    (stale-while-revalidate). Only the very first request for a list waits
+    on the upstream call.
+
+    Raises:
+        Exception: Whatever the loader raises when no snapshot exists yet.
+    """
+    snapshot = _snapshots.get(name)
+    if snapshot is None:
+        return refresh(name)
+
+    data, refreshed_at = snapshot
+    if time.monotonic() - refreshed_at > Config.TRENDING_MAX_AGE:
+        _refresh_in_background(name)
+    return data
+
+
+def _run_worker():
+    while True:
+        for name in list(_loaders):
+            try:
+                refresh(name)
+            except Exception as e:
+                print(f"❌ Error refreshing trending snapshot '{name}': {e}")
+        time.sleep(Config.TRENDING_REFRESH_INTERVAL)
+
+
+def start():
+    """Start the background worker that refreshes every registered snapshot"""
+    global _worker
+    if _worker is not None:
+        return
+    _worker = threading.Thread(target=_run_worker, name="trending-refresh", daemon=True)
+    _worker.start()
+    print(f"✅ Trending snapshots refresh every {Config.TRENDING_REFRESH_INTERVAL}s")
@@ -0,0 +1,130 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from services.config import Config
+
+# Upstream API hosts that get their own keep-alive session
+POOLED_HOSTS = frozenset(
+    [
+        "api.themoviedb.org",
+        "image.tmdb.org",
+        "openlibrary.org",
+        "covers.openlibrary.org",
+        "api.deezer.com",
+    ]
+)
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+# Any other host (e.g. images fetched by /api/proxy/image) shares this one;
+# its adapter keeps connections for only a few hosts at a time
+_external_session = None
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def _build_session(pool_connections=None, pool_maxsize=None):
+    """Create a session with a pooled, retrying adapter"""
+    retry = Retry(
+        total=Config.UPSTREAM_RETRIES,
+        backoff_factor=Config.UPSTREAM_BACKOFF_FACTOR,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset(["GET", "HEAD"]),
+        respect_retry_after_header=True,
+        # Hand the last response back so callers keep their own status handling
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections or Config.UPSTREAM_POOL_CONNECTIONS,
+        pool_maxsize=pool_maxsize or Config.UPSTREAM_POOL_MAXSIZE,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def external_session():
+    """The session shared by every host outside POOLED_HOSTS"""
+    global _external_session
+    if _external_session is None:
+        with _sessions_lock:
+            if _external_session is None:
+                _external_session = _build_session(
+                    pool_connections=Config.UPSTREAM_EXTERNAL_POOL_HOSTS, pool_maxsize=1
+                )
+    return _external_session
+
+
+def get_session(url):
+    """Return the shared session for the host of `url`"""
+    host = urlsplit(url).netloc
+    if host not in POOLED_HOSTS:
+        return external_session()
+    session = _sessions.get(host)
+    if session is None:
+        with _sessions_lock:
+            session = _sessions.get(host)
+            if session is None:
+                session = _build_session()
+                _sessions[host] = session
+    return session
+
+
+def get(url, **kwargs):
+    """
+    Drop-in replacement for `requests.get` that reuses pooled connections.
+
+    Args:
+        url (str): Upstream URL.
+        **kwargs: Passed through to `requests.Session.get`.
+
+    Returns:
+        requests.Response: The upstream response.
+    """
+    kwargs.setdefault(
+        "timeout", (Config.UPSTREAM_CONNECT_TIMEOUT, Config.UPSTREAM_READ_TIMEOUT)
+    )
+    return get_session(url).get(url, **kwargs)
+
+
+def gather(calls, max_workers=None, timeout=None):
+    """
+    Run zero-argument callables concurrently on a bounded thread pool.
+
+    Args:
+        calls (list): Callables to run.
+        max_workers (int): Upper bound on concurrent calls.
+        timeout (float): Seconds to wait for all calls, measured from the start.
+
+    Returns:
+        list: One entry per call, in order. A call that raised (or did not
+        finish within `timeout`) is represented by its exception.
+    """
+    if not calls:
+        return []
+
+    max_workers = min(max_workers or Config.UPSTREAM_MAX_WORKERS, len(calls))
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+    futures = [pool.submit(call) for call in calls]
+    deadline = time.monotonic() + timeout if timeout else None
+
+    results = []
+    try:
+        for future in futures:
+            remaining = None if deadline is None else max(0, deadline - time.monotonic())
+            try:
+                results.append(future.result(timeout=remaining))
+            except Exception as e:
+                results.append(e)
+    finally:
+        # Don't hold the request on calls that already timed out
+        pool.shutdown(wait=False, cancel_futures=True)
+    return results
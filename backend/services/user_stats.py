@@ -0,0 +1,252 @@
+import datetime
+import re
+
+from pymongo import errors
+
+from services import media_logs
+from services.stat_keys import decode_key, encode_key, number, rating_key
+
+# Tags listed per media type in the stats response
+TOP_TAGS = 10
+
+# Entry fields the stats are built from
+STAT_FIELDS = {
+    "_id": 0,
+    "media_type": 1,
+    "rating": 1,
+    "runtime": 1,
+    "number_of_episodes": 1,
+    "date": 1,
+    "genres": 1,
+    "tags": 1,
+}
+
+# Dates that fall in a month bucket (YYYY-MM...)
+MONTH = re.compile(r"^\d{4}-\d{2}")
+
+_collection = None
+
+
+def init_app(app):
+    """Attach the stats collection and follow log changes"""
+    global _collection
+    _collection = app.config["collections"].get("userStats")
+    media_logs.on_change(_apply_change)
+
+
+def _empty():
+    return {
+        "count": 0,
+        "rated": 0,
+        "rating_sum": 0,
+        "runtime_minutes": 0,
+        "episodes": 0,
+        "ratings": {},
+        "months": {},
+        "years": {},
+        "genres": {},
+        "tags": {},
+    }
+
+
+def _clean_values(values):
+    """Distinct, trimmed, non-empty genres/tags of an entry (a list or one string)"""
+    if isinstance(values, str):
+        values = [values]
+    values = [str(v).strip() for v in values or [] if v is not None]
+    return {v for v in values if v}
+
+
+def _contributions(doc):
+    """
+    What one log entry adds to its owner's stats, as {dotted path: amount}.
+    _apply_change $incs these; compute's aggregation groups by the same
+    normalized values, so both build the same stats document.
+    """
+    media_type = doc["media_type"]
+    paths = {f"{media_type}.count": 1}
+
+    rating = number(doc.get("rating"))
+    if rating is not None:
+        paths[f"{media_type}.rated"] = 1
+        paths[f"{media_type}.rating_sum"] = rating
+        paths[f"{media_type}.ratings.{rating_key(rating)}"] = 1
+    for field, total in (("runtime", "runtime_minutes"), ("number_of_episodes", "episodes")):
+        value = number(doc.get(field))
+        if value:
+            paths[f"{media_type}.{total}"] = value
+
+    date = doc.get("date")
+    if isinstance(date, str) and MONTH.match(date):
+        paths[f"{media_type}.months.{encode_key(date[:7])}"] = 1
+        paths[f"{media_type}.years.{encode_key(date[:4])}"] = 1
+
+    for breakdown in ("genres", "tags"):
+        for value in _clean_values(doc.get(breakdown)):
+            paths[f"{media_type}.{breakdown}.{encode_key(value)}"] = 1
+    return paths
+
+
+def _log_query(username):
+    return {
+        "username": username,
+        "$or": [
+            {"media_type": media_type, "section": layout["log_section"]}
+            for media_type, layout in media_logs.MEDIA_TYPES.items()
+        ],
+    }
+
+
+def _to_number(field):
+    return {"$convert": {"input": field, "to": "double", "onError": None, "onNull": None}}
+
+
+def _clean_values_expr(field):
+    """Aggregation counterpart of _clean_values"""
+    values = {"$ifNull": [field, []]}
+    values = {"$cond": [{"$isArray": values}, values, [values]]}
+    as_text = {"$convert": {"input": "$$this", "to": "string", "onError": None, "onNull": None}}
+    trimmed = {"$map": {"input": values, "in": {"$trim": {"input": as_text}}}}
+    # Strings sort after null, so this drops both null and ""
+    return {"$setUnion": [{"$filter": {"input": trimmed, "cond": {"$gt": ["$$this", ""]}}}, []]}
+
+
+def _add(stats, path, amount):
+    *parents, leaf = path.split(".")
+    node = stats
+    for key in parents:
+        node = node[key]
+    node[leaf] = node.get(leaf, 0) + amount
+
+
+def compute(username):
+    """
+    Build a user's stats from scratch with one aggregation over their logs.
+
+    Returns:
+        dict: Stats per media type, keyed for storage (see encode_key).
+    """
+
+    def count_by(key, pre=()):
+        return list(pre) + [
+            {"$group": {"_id": {"media_type": "$media_type", "key": key}, "count": {"$sum": 1}}}
+        ]
+
+    def count_values(breakdown):
+        return count_by(f"${breakdown}", [
+            {"$project": {"media_type": 1, breakdown: _clean_values_expr(f"${breakdown}")}},
+            {"$unwind": f"${breakdown}"},
+        ])
+
+    pipeline = [
+        {"$match": _log_query(username)},
+        {"$project": dict(STAT_FIELDS, rating_value=_to_number("$rating"))},
+        {
+            "$facet": {
+                "totals": [
+                    {
+                        "$group": {
+                            "_id": "$media_type",
+                            "count": {"$sum": 1},
+                            "rated": {"$sum": {"$cond": [{"$ne": ["$rating_value", None]}, 1, 0]}},
+                            "rating_sum": {"$sum": {"$ifNull": ["$rating_value", 0]}},
+                            "runtime_minutes": {"$sum": {"$ifNull": [_to_number("$runtime"), 0]}},
+                            "episodes": {
+                                "$sum": {"$ifNull": [_to_number("$number_of_episodes"), 0]}
+                            },
+                        }
+                    }
+                ],
+                "ratings": count_by(
+                    "$rating_value", [{"$match": {"rating_value": {"$ne": None}}}]
+                ),
+                "months": count_by(
+                    {"$substrCP": ["$date", 0, 7]},
+                    [{"$match": {"date": {"$regex": MONTH.pattern}}}],
+                ),
+                "genres": count_values("genres"),
+                "tags": count_values("tags"),
+            }
+        },
+    ]
+    result = next(media_logs.get_collection().aggregate(pipeline))
+
+    stats = {media_type: _empty() for media_type in media_logs.MEDIA_TYPES}
+    for row in result["totals"]:
+        for total, amount in row.items():
+            if total != "_id":
+                _add(stats, f"{row['_id']}.{total}", amount)
+
+    for row in result["ratings"]:
+        media_type, rating = row["_id"]["media_type"], row["_id"]["key"]
+        _add(stats, f"{media_type}.ratings.{rating_key(rating)}", row["count"])
+    for row in result["months"]:
+        media_type, month = row["_id"]["media_type"], row["_id"]["key"]
+        _add(stats, f"{media_type}.months.{encode_key(month)}", row["count"])
+        _add(stats, f"{media_type}.years.{encode_key(month[:4])}", row["count"])
+    for breakdown in ("genres", "tags"):
+        for row in result[breakdown]:
+            media_type, value = row["_id"]["media_type"], row["_id"]["key"]
+            _add(stats, f"{media_type}.{breakdown}.{encode_key(value)}", row["count"])
+    return stats
+
+
+def _present(username, doc):
+    """Response shape: decoded keys, averages and top tags"""
+    response = {"username": username, "computed_at": doc.get("computed_at"), "totals": {}}
+    for media_type in media_logs.MEDIA_TYPES:
+        media_stats = dict(_empty(), **doc.get(media_type, {}))
+        for breakdown in ("ratings", "months", "years", "genres", "tags"):
+            media_stats[breakdown] = {
+                decode_key(k): v for k, v in media_stats[breakdown].items() if v > 0
+            }
+        media_stats["average_rating"] = (
+            round(media_stats["rating_sum"] / media_stats["rated"], 2)
+            if media_stats["rated"]
+            else None
+        )
+        top = sorted(media_stats.pop("tags").items(), key=lambda t: (-t[1], t[0]))
+        media_stats["top_tags"] = [{"tag": t, "count": c} for t, c in top[:TOP_TAGS]]
+        response[media_type] = media_stats
+
+    for total in ("count", "runtime_minutes", "episodes"):
+        response["totals"][total] = sum(
+            response[media_type][total] for media_type in media_logs.MEDIA_TYPES
+        )
+    return response
+
+
+def get(username, refresh=False):
+    """
+    A user's stats, from the cached stats document when there is one.
+    The document is built once and then kept current by _apply_change.
+    """
+    doc = None if refresh else _collection.find_one({"_id": username})
+    if doc is None:
+        doc = compute(username)
+        doc["computed_at"] = datetime.datetime.utcnow()
+        _collection.replace_one({"_id": username}, doc, upsert=True)
+    return _present(username, doc)
+
+
+def invalidate(username):
+    _collection.delete_one({"_id": username})
+
+
+def _apply_change(doc, delta):
+    """$inc the cached stats of the entry's owner by one entry (delta=±1)"""
+    if _collection is None or not media_logs.is_log_section(doc["media_type"], doc["section"]):
+        return
+
+    inc = {path: delta * amount for path, amount in _contributions(doc).items()}
+
+    try:
+        # Users without a stats document get one built on their next read
+        _collection.update_one({"_id": doc["username"]}, {"$inc": inc})
+    except errors.PyMongoError as e:
+        # Drop the cached stats rather than leave them wrong
+        print(f"❌ Error updating stats for {doc['username']}: {e}")
+        try:
+            invalidate(doc["username"])
+        except errors.PyMongoError:
+            pass
@@ -396,6 +396,7 @@ const BookDetails = () => {
         title: book.title,
         cover: book.cover_url,
         author: book.author,
+        genres: (book.genres || []).filter((genre) => genre !== "Unknown Genre"),
       };
 
       const response = await axios.post(
@@ -174,7 +174,7 @@ const BookmarkedReviewsPage = () => {
                                             <Box sx={{ display: 'flex', alignItems: 'center', gap: 1 }}>
                                                 <CommentIcon fontSize="small" />
                                                 <Typography variant="caption">
-                                                    {review.comments?.length || 0}
+                                                    {review.comment_count || 0}
                                                 </Typography>
                                             </Box>
                                         </Box>
@@ -285,7 +285,7 @@ const LatestReviewsPage = () => {
                       </Box>
                       <Box sx={{ display: 'flex', alignItems: 'center', gap: 1 }}>
                         <CommentIcon fontSize="small" />
-                        <Typography variant="caption">{review.comments?.length || 0}</Typography>
+                        <Typography variant="caption">{review.comment_count || 0}</Typography>
                       </Box>
                     </Box>
                   </CardContent>
@@ -375,6 +375,7 @@ const MovieDetails = () => {
         title: movie.title,
         poster: movie.poster_path,
         runtime: movie.runtime,
+        genres: movie.genres || [],
       };
 
       // Make the POST request to log the movie
@@ -364,7 +364,7 @@ const MyReviewsPage = () => {
                                             </Box>
                                             <Box sx={{ display: 'flex', alignItems: 'center', gap: 1 }}>
                                                 <CommentIcon fontSize="small" />
-                                                <Typography variant="caption">{review.comments?.length || 0}</Typography>
+                                                <Typography variant="caption">{review.comment_count || 0}</Typography>
                                             </Box>
                                         </Box>
                                     </CardContent>
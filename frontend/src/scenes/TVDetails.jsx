@@ -384,6 +384,7 @@ const TVDetails = () => {
         title: tv.title,
         poster: tv.poster_path,
         number_of_episodes: tv.number_of_episodes,
+        genres: tv.genres || [],
       };
 
       // Make the POST request to log the movie
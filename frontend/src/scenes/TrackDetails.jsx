@@ -81,6 +81,7 @@ const TrackDetails = () => {
       cover: track.album?.cover_medium || null,
       listen_date: listenDate,
       rating: rating,
+      genres: track.genres || [],
     };
 
     try {